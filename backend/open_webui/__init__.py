@@ -30,12 +30,7 @@ def main(
     pass
 
 
-@app.command()
-def serve(
-    host: str = "0.0.0.0",
-    port: int = 8080,
-):
-    os.environ["FROM_INIT_PY"] = "true"
+def load_secret_key():
     if os.getenv("WEBUI_SECRET_KEY") is None:
         typer.echo(
             "Loading WEBUI_SECRET_KEY from file, not provided as an environment variable."
@@ -46,6 +41,15 @@ def serve(
         typer.echo(f"Loading WEBUI_SECRET_KEY from {KEY_FILE}")
         os.environ["WEBUI_SECRET_KEY"] = KEY_FILE.read_text()
 
+
+@app.command()
+def serve(
+    host: str = "0.0.0.0",
+    port: int = 8080,
+):
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
     if os.getenv("USE_CUDA_DOCKER", "false") == "true":
         typer.echo(
             "CUDA is enabled, appending LD_LIBRARY_PATH to include torch/cudnn & cublas libraries."
@@ -84,6 +88,25 @@ def serve(
     )
 
 
+@app.command()
+def worker(
+    concurrency: Optional[int] = None,
+):
+    """Run file ingestion jobs from the Redis queue (INGESTION_QUEUE=redis)."""
+    os.environ["FROM_INIT_PY"] = "true"
+    load_secret_key()
+
+    import asyncio
+
+    from open_webui.main import app as webui_app
+    from open_webui.ingestion import run_ingestion_worker
+    from open_webui.config import INGESTION_WORKER_CONCURRENCY
+
+    asyncio.run(
+        run_ingestion_worker(webui_app, concurrency or INGESTION_WORKER_CONCURRENCY)
+    )
+
+
 @app.command()
 def dev(
     host: str = "0.0.0.0",
@@ -3,6 +3,7 @@ import logging
 import os
 import shutil
 import base64
+import time
 import redis
 
 from datetime import datetime
@@ -24,6 +25,7 @@ from open_webui.env import (
     REDIS_KEY_PREFIX,
     REDIS_SENTINEL_HOSTS,
     REDIS_SENTINEL_PORT,
+    REDIS_CONFIG_SYNC_INTERVAL,
     FRONTEND_BUILD_DIR,
     OFFLINE_MODE,
     OPEN_WEBUI_DIR,
@@ -222,10 +224,22 @@ class PersistentConfig(Generic[T]):
 
 
 class AppConfig:
+    """
+    Registry of PersistentConfig values exposed as attributes.
+
+    Reads are plain lookups on an in-process snapshot. When Redis is configured,
+    every write bumps a global config version and is published to the other
+    replicas, which refresh the changed key. The version is also checked every
+    REDIS_CONFIG_SYNC_INTERVAL seconds to catch missed notifications.
+    """
+
     _redis: Union[redis.Redis, redis.cluster.RedisCluster] = None
     _redis_key_prefix: str
 
     _state: dict[str, PersistentConfig]
+    _version: Optional[int]
+    _version_checked_at: float
+    _pubsub_thread = None
 
     def __init__(
         self,
@@ -247,6 +261,98 @@ class AppConfig:
             )
 
         super().__setattr__("_state", {})
+        super().__setattr__("_version", None)
+        super().__setattr__("_version_checked_at", 0.0)
+
+        if self._redis:
+            self._subscribe()
+
+    def _redis_config_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:config:{key}"
+
+    def _redis_version_key(self) -> str:
+        return f"{self._redis_key_prefix}:config_version"
+
+    def _redis_channel(self) -> str:
+        return f"{self._redis_key_prefix}:config_updates"
+
+    def _subscribe(self):
+        def handle_exception(e, pubsub, thread):
+            log.error(f"Config update subscription failed: {e}")
+            thread.stop()
+            super(AppConfig, self).__setattr__("_pubsub_thread", None)
+
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self._redis_channel(): self._handle_update})
+            super().__setattr__(
+                "_pubsub_thread",
+                pubsub.run_in_thread(
+                    sleep_time=1.0, daemon=True, exception_handler=handle_exception
+                ),
+            )
+        except Exception as e:
+            log.error(f"Failed to subscribe to config updates: {e}")
+
+    def _handle_update(self, message):
+        try:
+            data = json.loads(message["data"])
+            key, version = data["key"], data["version"]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            log.error(f"Invalid config update message: {message}")
+            return
+
+        if self._version is not None and version <= self._version:
+            # Already applied, e.g. our own write
+            return
+
+        if key in self._state:
+            self._load_values([key])
+
+        # Only advance when no update was missed, otherwise the next version
+        # check resyncs every key
+        if self._version is not None and version == self._version + 1:
+            super().__setattr__("_version", version)
+
+    def _load_values(self, keys: list[str]):
+        pipe = self._redis.pipeline()
+        for key in keys:
+            pipe.get(self._redis_config_key(key))
+
+        for key, redis_value in zip(keys, pipe.execute()):
+            if redis_value is None:
+                continue
+
+            try:
+                decoded_value = json.loads(redis_value)
+
+                # Update the in-memory value if different
+                if self._state[key].value != decoded_value:
+                    self._state[key].value = decoded_value
+                    log.info(f"Updated {key} from Redis: {decoded_value}")
+
+            except json.JSONDecodeError:
+                log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+
+    def _check_version(self):
+        now = time.monotonic()
+        if (
+            self._version is not None
+            and now - self._version_checked_at < REDIS_CONFIG_SYNC_INTERVAL
+        ):
+            return
+        super().__setattr__("_version_checked_at", now)
+
+        try:
+            version = int(self._redis.get(self._redis_version_key()) or 0)
+            if version != self._version:
+                self._load_values(list(self._state.keys()))
+                super().__setattr__("_version", version)
+
+            if self._pubsub_thread is None:
+                self._subscribe()
+        except Exception as e:
+            log.error(f"Failed to sync config from Redis: {e}")
 
     def __setattr__(self, key, value):
         if isinstance(value, PersistentConfig):
@@ -256,29 +362,24 @@ class AppConfig:
             self._state[key].save()
 
             if self._redis:
-                redis_key = f"{self._redis_key_prefix}:config:{key}"
+                redis_key = self._redis_config_key(key)
                 self._redis.set(redis_key, json.dumps(self._state[key].value))
 
+                version = int(self._redis.incr(self._redis_version_key()))
+                if self._version is not None and version == self._version + 1:
+                    super().__setattr__("_version", version)
+
+                self._redis.publish(
+                    self._redis_channel(),
+                    json.dumps({"key": key, "version": version}),
+                )
+
     def __getattr__(self, key):
         if key not in self._state:
             raise AttributeError(f"Config key '{key}' not found")
 
-        # If Redis is available, check for an updated value
         if self._redis:
-            redis_key = f"{self._redis_key_prefix}:config:{key}"
-            redis_value = self._redis.get(redis_key)
-
-            if redis_value is not None:
-                try:
-                    decoded_value = json.loads(redis_value)
-
-                    # Update the in-memory value if different
-                    if self._state[key].value != decoded_value:
-                        self._state[key].value = decoded_value
-                        log.info(f"Updated {key} from Redis: {decoded_value}")
-
-                except json.JSONDecodeError:
-                    log.error(f"Invalid JSON format in Redis for {key}: {redis_value}")
+            self._check_version()
 
         return self._state[key].value
 
@@ -2374,6 +2475,35 @@ log.info(f"VECTOR_DB: {VECTOR_DB}")
 S3_VECTOR_BUCKET_NAME = os.environ.get("S3_VECTOR_BUCKET_NAME", None)
 S3_VECTOR_REGION = os.environ.get("S3_VECTOR_REGION", None)
 
+# Embedded memory-mapped vector store
+MMAP_VECTOR_DATA_PATH = os.environ.get(
+    "MMAP_VECTOR_DATA_PATH", f"{DATA_DIR}/vector_db_mmap"
+)
+MMAP_VECTOR_DTYPE = os.environ.get("MMAP_VECTOR_DTYPE", "float16")  # or "float32"
+
+try:
+    # Collections with at least this many items are searched with an HNSW
+    # graph when hnswlib is installed, 0 always uses brute force
+    MMAP_VECTOR_HNSW_THRESHOLD = int(
+        os.environ.get("MMAP_VECTOR_HNSW_THRESHOLD", "50000")
+    )
+except ValueError:
+    MMAP_VECTOR_HNSW_THRESHOLD = 50000
+
+# Quantized first-pass vector search with full precision rescoring
+# ("int8" or "binary", supported by the mmap and pgvector backends)
+VECTOR_QUANTIZATION = os.environ.get("VECTOR_QUANTIZATION", "").lower() or None
+if VECTOR_QUANTIZATION not in (None, "int8", "binary"):
+    log.warning(f"Unsupported VECTOR_QUANTIZATION '{VECTOR_QUANTIZATION}', ignoring")
+    VECTOR_QUANTIZATION = None
+
+try:
+    VECTOR_QUANTIZATION_RESCORE_MULTIPLIER = int(
+        os.environ.get("VECTOR_QUANTIZATION_RESCORE_MULTIPLIER", "4")
+    )
+except ValueError:
+    VECTOR_QUANTIZATION_RESCORE_MULTIPLIER = 4
+
 ####################################
 # Information Retrieval (RAG)
 ####################################
@@ -2647,6 +2777,188 @@ ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS = PersistentConfig(
     == "true",
 )
 
+# Persistent BM25 index per collection used by hybrid search
+ENABLE_RAG_BM25_INDEX_CACHE = (
+    os.environ.get("ENABLE_RAG_BM25_INDEX_CACHE", "True").lower() == "true"
+)
+RAG_BM25_INDEX_DIR = os.environ.get("RAG_BM25_INDEX_DIR", f"{CACHE_DIR}/bm25")
+
+try:
+    RAG_BM25_INDEX_CACHE_SIZE = int(os.environ.get("RAG_BM25_INDEX_CACHE_SIZE", "64"))
+except ValueError:
+    RAG_BM25_INDEX_CACHE_SIZE = 64
+
+# Push hybrid search down to vector databases that support it natively
+# (pgvector, Elasticsearch, OpenSearch, Weaviate) instead of the BM25 index
+ENABLE_RAG_HYBRID_SEARCH_NATIVE = (
+    os.environ.get("ENABLE_RAG_HYBRID_SEARCH_NATIVE", "True").lower() == "true"
+)
+
+# Collections searched in parallel per RAG query (shared across requests)
+try:
+    RAG_QUERY_CONCURRENCY = int(os.environ.get("RAG_QUERY_CONCURRENCY", "8"))
+except ValueError:
+    RAG_QUERY_CONCURRENCY = 8
+
+# Attached items (knowledge bases, files, URLs, ...) resolved in parallel per request
+try:
+    RAG_ITEM_CONCURRENCY = int(os.environ.get("RAG_ITEM_CONCURRENCY", "4"))
+except ValueError:
+    RAG_ITEM_CONCURRENCY = 4
+
+# Embedding engine requests in flight per endpoint (halved while throttled)
+try:
+    RAG_EMBEDDING_CONCURRENCY = int(os.environ.get("RAG_EMBEDDING_CONCURRENCY", "8"))
+except ValueError:
+    RAG_EMBEDDING_CONCURRENCY = 8
+
+try:
+    RAG_EMBEDDING_MAX_RETRIES = int(os.environ.get("RAG_EMBEDDING_MAX_RETRIES", "5"))
+except ValueError:
+    RAG_EMBEDDING_MAX_RETRIES = 5
+
+# Chunks embedded and inserted together when ingesting a document, and the
+# number of embedded batches allowed to wait for the vector DB
+try:
+    RAG_INGESTION_BATCH_SIZE = int(os.environ.get("RAG_INGESTION_BATCH_SIZE", "128"))
+except ValueError:
+    RAG_INGESTION_BATCH_SIZE = 128
+
+try:
+    RAG_INGESTION_QUEUE_SIZE = int(os.environ.get("RAG_INGESTION_QUEUE_SIZE", "2"))
+except ValueError:
+    RAG_INGESTION_QUEUE_SIZE = 2
+
+# Background file ingestion: "local" runs the jobs on each web replica, "redis"
+# shares a durable queue with the workers started by `open-webui worker`
+INGESTION_QUEUE = os.environ.get("INGESTION_QUEUE", "local").lower()
+
+try:
+    INGESTION_WORKER_CONCURRENCY = int(
+        os.environ.get("INGESTION_WORKER_CONCURRENCY", "2")
+    )
+except ValueError:
+    INGESTION_WORKER_CONCURRENCY = 2
+
+try:
+    INGESTION_JOB_MAX_ATTEMPTS = int(os.environ.get("INGESTION_JOB_MAX_ATTEMPTS", "3"))
+except ValueError:
+    INGESTION_JOB_MAX_ATTEMPTS = 3
+
+# Seconds a worker may go without renewing a job before it is handed to another
+try:
+    INGESTION_JOB_LEASE_TIMEOUT = int(
+        os.environ.get("INGESTION_JOB_LEASE_TIMEOUT", "300")
+    )
+except ValueError:
+    INGESTION_JOB_LEASE_TIMEOUT = 300
+
+# Uploads from this size (in MB) are queued behind the smaller ones
+try:
+    INGESTION_LOW_PRIORITY_FILE_SIZE = int(
+        os.environ.get("INGESTION_LOW_PRIORITY_FILE_SIZE", "10")
+    )
+except ValueError:
+    INGESTION_LOW_PRIORITY_FILE_SIZE = 10
+
+# Knowledge reindexing: files embedded at once across all knowledge bases, and
+# knowledge bases rebuilt at once
+try:
+    KNOWLEDGE_REINDEX_FILE_CONCURRENCY = int(
+        os.environ.get("KNOWLEDGE_REINDEX_FILE_CONCURRENCY", "4")
+    )
+except ValueError:
+    KNOWLEDGE_REINDEX_FILE_CONCURRENCY = 4
+
+try:
+    KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY = int(
+        os.environ.get("KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY", "2")
+    )
+except ValueError:
+    KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY = 2
+
+# With Redis, the job holds a lock it renews while running, the lock of a
+# replica that went away runs out after this many seconds
+try:
+    KNOWLEDGE_REINDEX_LEASE_TIMEOUT = int(
+        os.environ.get("KNOWLEDGE_REINDEX_LEASE_TIMEOUT", "300")
+    )
+except ValueError:
+    KNOWLEDGE_REINDEX_LEASE_TIMEOUT = 300
+
+# In-memory cache of query embeddings shared across requests and users
+try:
+    RAG_QUERY_EMBEDDING_CACHE_SIZE = int(
+        os.environ.get("RAG_QUERY_EMBEDDING_CACHE_SIZE", "1024")
+    )
+except ValueError:
+    RAG_QUERY_EMBEDDING_CACHE_SIZE = 1024
+
+try:
+    RAG_QUERY_EMBEDDING_CACHE_TTL = int(
+        os.environ.get("RAG_QUERY_EMBEDDING_CACHE_TTL", "3600")
+    )
+except ValueError:
+    RAG_QUERY_EMBEDDING_CACHE_TTL = 3600
+
+# Reranker scores cached per (model, query, chunk)
+try:
+    RAG_RERANKING_SCORE_CACHE_SIZE = int(
+        os.environ.get("RAG_RERANKING_SCORE_CACHE_SIZE", "10000")
+    )
+except ValueError:
+    RAG_RERANKING_SCORE_CACHE_SIZE = 10000
+
+# Content-addressed cache of chunk embeddings reused across (re)ingestion
+ENABLE_RAG_EMBEDDING_CACHE = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE", "True").lower() == "true"
+)
+RAG_EMBEDDING_CACHE_DIR = os.environ.get(
+    "RAG_EMBEDDING_CACHE_DIR", f"{CACHE_DIR}/embeddings"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_MAX_SIZE = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_MAX_SIZE", str(1024 * 1024 * 1024))
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+ENABLE_RAG_EMBEDDING_CACHE_REDIS = (
+    os.environ.get("ENABLE_RAG_EMBEDDING_CACHE_REDIS", "False").lower() == "true"
+)
+
+try:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = int(
+        os.environ.get("RAG_EMBEDDING_CACHE_REDIS_TTL", str(7 * 24 * 60 * 60))
+    )
+except ValueError:
+    RAG_EMBEDDING_CACHE_REDIS_TTL = 7 * 24 * 60 * 60
+
+# Extracted documents keyed by file content and loader settings, so the same
+# file is only sent through OCR / extraction engines once
+ENABLE_RAG_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_RAG_EXTRACTION_CACHE", "True").lower() == "true"
+)
+RAG_EXTRACTION_CACHE_DIR = os.environ.get(
+    "RAG_EXTRACTION_CACHE_DIR", f"{CACHE_DIR}/extraction"
+)
+
+try:
+    RAG_EXTRACTION_CACHE_MAX_SIZE = int(
+        os.environ.get("RAG_EXTRACTION_CACHE_MAX_SIZE", str(1024 * 1024 * 1024))
+    )
+except ValueError:
+    RAG_EXTRACTION_CACHE_MAX_SIZE = 1024 * 1024 * 1024
+
+# Seconds since the last use after which an entry is dropped, 0 keeps entries
+try:
+    RAG_EXTRACTION_CACHE_MAX_AGE = int(
+        os.environ.get("RAG_EXTRACTION_CACHE_MAX_AGE", str(90 * 24 * 60 * 60))
+    )
+except ValueError:
+    RAG_EXTRACTION_CACHE_MAX_AGE = 90 * 24 * 60 * 60
+
 RAG_FULL_CONTEXT = PersistentConfig(
     "RAG_FULL_CONTEXT",
     "rag.full_context",
@@ -2716,6 +3028,13 @@ PDF_EXTRACT_IMAGES = PersistentConfig(
     os.environ.get("PDF_EXTRACT_IMAGES", "False").lower() == "true",
 )
 
+# Processes extracting the pages of a PDF in parallel (default loader only),
+# 0 extracts them serially
+try:
+    PDF_EXTRACT_WORKERS = int(os.environ.get("PDF_EXTRACT_WORKERS", "0"))
+except ValueError:
+    PDF_EXTRACT_WORKERS = 0
+
 RAG_EMBEDDING_MODEL = PersistentConfig(
     "RAG_EMBEDDING_MODEL",
     "rag.embedding_model",
@@ -2741,6 +3060,13 @@ RAG_EMBEDDING_BATCH_SIZE = PersistentConfig(
     ),
 )
 
+# Matryoshka output dimensions, 0 keeps the model's full vectors
+RAG_EMBEDDING_DIMENSIONS = PersistentConfig(
+    "RAG_EMBEDDING_DIMENSIONS",
+    "rag.embedding_dimensions",
+    int(os.environ.get("RAG_EMBEDDING_DIMENSIONS", "0") or 0),
+)
+
 ENABLE_ASYNC_EMBEDDING = PersistentConfig(
     "ENABLE_ASYNC_EMBEDDING",
     "rag.enable_async_embedding",
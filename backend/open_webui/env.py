@@ -373,6 +373,20 @@ ENABLE_REALTIME_CHAT_SAVE = (
     os.environ.get("ENABLE_REALTIME_CHAT_SAVE", "False").lower() == "true"
 )
 
+# Buffered message updates are written at most this many seconds late
+CHAT_SAVE_FLUSH_INTERVAL = os.environ.get("CHAT_SAVE_FLUSH_INTERVAL", "1")
+try:
+    CHAT_SAVE_FLUSH_INTERVAL = float(CHAT_SAVE_FLUSH_INTERVAL)
+except Exception:
+    CHAT_SAVE_FLUSH_INTERVAL = 1.0
+
+# ...or as soon as this many updates have been coalesced
+CHAT_SAVE_FLUSH_SIZE = os.environ.get("CHAT_SAVE_FLUSH_SIZE", "64")
+try:
+    CHAT_SAVE_FLUSH_SIZE = int(CHAT_SAVE_FLUSH_SIZE)
+except Exception:
+    CHAT_SAVE_FLUSH_SIZE = 64
+
 ENABLE_QUERIES_CACHE = os.environ.get("ENABLE_QUERIES_CACHE", "False").lower() == "true"
 
 ####################################
@@ -396,6 +410,14 @@ try:
 except ValueError:
     REDIS_SENTINEL_MAX_RETRY_COUNT = 2
 
+# How often (in seconds) the in-process config snapshot is checked against the
+# Redis config version, as a fallback for missed pub/sub notifications
+REDIS_CONFIG_SYNC_INTERVAL = os.environ.get("REDIS_CONFIG_SYNC_INTERVAL", "5")
+try:
+    REDIS_CONFIG_SYNC_INTERVAL = float(REDIS_CONFIG_SYNC_INTERVAL)
+except ValueError:
+    REDIS_CONFIG_SYNC_INTERVAL = 5.0
+
 ####################################
 # UVICORN WORKERS
 ####################################
@@ -0,0 +1,395 @@
+# ingestion.py
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, Field
+from redis.asyncio import Redis
+from starlette.datastructures import Headers
+
+from open_webui.config import (
+    INGESTION_QUEUE,
+    INGESTION_JOB_LEASE_TIMEOUT,
+    INGESTION_JOB_MAX_ATTEMPTS,
+    INGESTION_LOW_PRIORITY_FILE_SIZE,
+    INGESTION_WORKER_CONCURRENCY,
+)
+from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX
+from open_webui.models.files import Files
+from open_webui.models.users import Users
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+
+INGESTION_PRIORITY_HIGH = 0
+INGESTION_PRIORITY_LOW = 1
+INGESTION_PRIORITIES = [INGESTION_PRIORITY_HIGH, INGESTION_PRIORITY_LOW]
+
+# The hash tag keeps every key of the queue in one Redis Cluster slot
+REDIS_INGESTION_KEY = f"{{{REDIS_KEY_PREFIX}:ingestion}}:"
+
+
+class IngestionJob(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid4()))
+    file_id: str
+    user_id: str
+    metadata: dict = {}
+    priority: int = INGESTION_PRIORITY_HIGH
+    attempts: int = 0
+
+    @property
+    def member(self) -> str:
+        return f"{self.priority}|{self.user_id}|{self.id}"
+
+
+def get_job_priority(size: int) -> int:
+    if size >= INGESTION_LOW_PRIORITY_FILE_SIZE * 1024 * 1024:
+        return INGESTION_PRIORITY_LOW
+    return INGESTION_PRIORITY_HIGH
+
+
+def is_rejected(e: BaseException) -> bool:
+    """
+    Whether processing failed because of the file itself (unsupported type,
+    no content, duplicate), which a retry would run into again. aprocess_file
+    reports every failure as a 400 chained to its cause, embedding timeouts,
+    rate limits and vector DB outages included.
+    """
+    if isinstance(e, HTTPException):
+        return e.__cause__ is None or is_rejected(e.__cause__)
+    return isinstance(e, ValueError)
+
+
+def get_error_message(e: Exception) -> str:
+    return str(e.detail) if isinstance(e, HTTPException) else str(e)
+
+
+async def emit_file_status(file_id: str, user_id: str, data: dict):
+    """Push a file's processing status to the sessions of its owner."""
+    from open_webui.socket.main import emit_to_users
+
+    await emit_to_users("events:file", {"file_id": file_id, "data": data}, [user_id])
+
+
+### ------------------------------
+### QUEUES
+### ------------------------------
+
+
+class LocalIngestionQueue:
+    """
+    In-process queue for single-node deployments. Jobs are taken by priority
+    and, within a priority, round-robin across users, so one user's bulk
+    upload doesn't hold back everybody else's files.
+    """
+
+    def __init__(self):
+        self._queues: dict[int, OrderedDict[str, deque]] = {
+            priority: OrderedDict() for priority in INGESTION_PRIORITIES
+        }
+        self._condition = asyncio.Condition()
+
+    def _pop(self) -> Optional[IngestionJob]:
+        for users in self._queues.values():
+            if users:
+                user_id, jobs = users.popitem(last=False)
+                job = jobs.popleft()
+                if jobs:
+                    # Back of the line until the other users had their turn
+                    users[user_id] = jobs
+                job.attempts += 1
+                return job
+        return None
+
+    async def enqueue(self, job: IngestionJob):
+        async with self._condition:
+            users = self._queues[job.priority]
+            users.setdefault(job.user_id, deque()).append(job)
+            self._condition.notify()
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[IngestionJob]:
+        async with self._condition:
+            job = self._pop()
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._condition.wait(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return None
+                job = self._pop()
+            return job
+
+    async def extend(self, job: IngestionJob):
+        pass
+
+    async def ack(self, job: IngestionJob):
+        pass
+
+    async def retry(self, job: IngestionJob, delay: float):
+        async def requeue():
+            await asyncio.sleep(delay)
+            await self.enqueue(job)
+
+        asyncio.create_task(requeue())
+
+
+# KEYS: jobs hash, user queue, priority users list
+# ARGV: job id, job JSON, queue member, user id
+REDIS_ENQUEUE_SCRIPT = """
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+if redis.call('RPUSH', KEYS[2], ARGV[3]) == 1 then
+    redis.call('RPUSH', KEYS[3], ARGV[4])
+end
+"""
+
+# KEYS: jobs hash, only there to route the script in Redis Cluster
+# ARGV: key prefix, now, lease timeout, priorities in order
+REDIS_DEQUEUE_SCRIPT = """
+local prefix = ARGV[1]
+local now = tonumber(ARGV[2])
+
+local function push(member)
+    local priority, user = string.match(member, '^([^|]*)|([^|]*)|')
+    local queue = prefix .. 'queue:' .. priority .. ':' .. user
+    if redis.call('RPUSH', queue, member) == 1 then
+        redis.call('RPUSH', prefix .. 'users:' .. priority, user)
+    end
+end
+
+-- Jobs due for a retry, and jobs of workers that stopped renewing their lease
+for _, key in ipairs({prefix .. 'delayed', prefix .. 'processing'}) do
+    for _, member in ipairs(redis.call('ZRANGEBYSCORE', key, '-inf', now)) do
+        redis.call('ZREM', key, member)
+        push(member)
+    end
+end
+
+for i = 4, #ARGV do
+    local users = prefix .. 'users:' .. ARGV[i]
+    -- Round-robin across the users with queued jobs
+    local user = redis.call('LPOP', users)
+    if user then
+        local queue = prefix .. 'queue:' .. ARGV[i] .. ':' .. user
+        local member = redis.call('LPOP', queue)
+        if redis.call('LLEN', queue) > 0 then
+            redis.call('RPUSH', users, user)
+        end
+
+        local id = string.match(member, '([^|]*)$')
+        redis.call('ZADD', prefix .. 'processing', now + tonumber(ARGV[3]), member)
+        local attempts = redis.call('HINCRBY', prefix .. 'attempts', id, 1)
+        return {redis.call('HGET', prefix .. 'jobs', id), attempts}
+    end
+end
+return nil
+"""
+
+
+class RedisIngestionQueue:
+    """
+    Durable queue shared by the web replicas and the ingestion workers.
+
+    A taken job stays in a processing set under a lease the worker keeps
+    renewing, so the jobs of a worker that died are handed to another one once
+    the lease runs out. Dequeues count the attempts, which also bounds the
+    jobs that keep taking their worker down.
+    """
+
+    def __init__(self, redis: Redis, lease_timeout: int = 300):
+        self.redis = redis
+        self.lease_timeout = lease_timeout
+        self.prefix = REDIS_INGESTION_KEY
+
+    async def enqueue(self, job: IngestionJob):
+        await self.redis.eval(
+            REDIS_ENQUEUE_SCRIPT,
+            3,
+            f"{self.prefix}jobs",
+            f"{self.prefix}queue:{job.priority}:{job.user_id}",
+            f"{self.prefix}users:{job.priority}",
+            job.id,
+            job.model_dump_json(),
+            job.member,
+            job.user_id,
+        )
+
+    async def dequeue(self, timeout: float = 1.0) -> Optional[IngestionJob]:
+        result = await self.redis.eval(
+            REDIS_DEQUEUE_SCRIPT,
+            1,
+            f"{self.prefix}jobs",
+            self.prefix,
+            time.time(),
+            self.lease_timeout,
+            *INGESTION_PRIORITIES,
+        )
+        if not result:
+            await asyncio.sleep(timeout)
+            return None
+
+        data, attempts = result
+        if data is None:
+            return None
+
+        job = IngestionJob.model_validate_json(data)
+        job.attempts = int(attempts)
+        return job
+
+    async def extend(self, job: IngestionJob):
+        await self.redis.zadd(
+            f"{self.prefix}processing",
+            {job.member: time.time() + self.lease_timeout},
+            xx=True,
+        )
+
+    async def ack(self, job: IngestionJob):
+        pipe = self.redis.pipeline()
+        pipe.zrem(f"{self.prefix}processing", job.member)
+        pipe.hdel(f"{self.prefix}jobs", job.id)
+        pipe.hdel(f"{self.prefix}attempts", job.id)
+        await pipe.execute()
+
+    async def retry(self, job: IngestionJob, delay: float):
+        # Skipped when the lease already ran out and the job was requeued
+        if await self.redis.zrem(f"{self.prefix}processing", job.member):
+            await self.redis.zadd(
+                f"{self.prefix}delayed", {job.member: time.time() + delay}
+            )
+
+
+def get_ingestion_queue(redis: Optional[Redis]):
+    if INGESTION_QUEUE == "redis":
+        if redis is not None:
+            return RedisIngestionQueue(redis, lease_timeout=INGESTION_JOB_LEASE_TIMEOUT)
+        log.warning("INGESTION_QUEUE is redis but REDIS_URL is not set, using local")
+    return LocalIngestionQueue()
+
+
+### ------------------------------
+### WORKER
+### ------------------------------
+
+
+def get_worker_request(app) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "asgi.version": "3.0",
+            "asgi.spec_version": "2.0",
+            "method": "POST",
+            "path": "/internal",
+            "query_string": b"",
+            "headers": Headers({}).raw,
+            "client": ("127.0.0.1", 12345),
+            "server": ("127.0.0.1", 80),
+            "scheme": "http",
+            "app": app,
+        }
+    )
+
+
+async def run_ingestion_job(app, job: IngestionJob):
+    # Imported here, the routers import this module to queue their jobs
+    from open_webui.routers.files import aprocess_uploaded_file
+
+    file = Files.get_file_by_id(job.file_id)
+    user = Users.get_user_by_id(job.user_id)
+    if not file or not user:
+        log.info(f"Skipping ingestion job {job.id}, the file or its user is gone")
+        return
+
+    await aprocess_uploaded_file(get_worker_request(app), file, job.metadata, user)
+
+
+class IngestionWorker:
+    def __init__(self, app, queue, concurrency: int = INGESTION_WORKER_CONCURRENCY):
+        self.app = app
+        self.queue = queue
+        self.concurrency = max(concurrency, 1)
+        self.tasks: set[asyncio.Task] = set()
+
+    async def _keep_lease(self, job: IngestionJob):
+        interval = max(INGESTION_JOB_LEASE_TIMEOUT / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.queue.extend(job)
+            except Exception as e:
+                log.warning(f"Failed to renew ingestion job {job.id}: {e}")
+
+    async def _fail(self, job: IngestionJob, error: str):
+        Files.update_file_data_by_id(job.file_id, {"status": "failed", "error": error})
+        await self.queue.ack(job)
+        await emit_file_status(
+            job.file_id, job.user_id, {"status": "failed", "error": error}
+        )
+
+    async def _run(self, job: IngestionJob):
+        if job.attempts > INGESTION_JOB_MAX_ATTEMPTS:
+            # The job was running on workers that went away
+            log.error(f"Ingestion job {job.id} exceeded its attempts")
+            await self._fail(job, "Processing was interrupted too many times")
+            return
+
+        lease = asyncio.create_task(self._keep_lease(job))
+        try:
+            await emit_file_status(job.file_id, job.user_id, {"status": "processing"})
+            await run_ingestion_job(self.app, job)
+            await self.queue.ack(job)
+            await emit_file_status(job.file_id, job.user_id, {"status": "completed"})
+        except Exception as e:
+            if is_rejected(e):
+                # A retry would fail the same way
+                await self._fail(job, get_error_message(e))
+            elif job.attempts >= INGESTION_JOB_MAX_ATTEMPTS:
+                log.exception(f"Ingestion job {job.id} failed: {e}")
+                await self._fail(job, get_error_message(e))
+            else:
+                delay = min(5 * 2 ** (job.attempts - 1), 300)
+                log.warning(
+                    f"Ingestion job {job.id} failed ({get_error_message(e)}), "
+                    f"retrying in {delay}s"
+                )
+                # aprocess_file marked the file as failed, it is only waiting
+                await asyncio.to_thread(
+                    Files.update_file_data_by_id, job.file_id, {"status": "pending"}
+                )
+                await self.queue.retry(job, delay)
+        finally:
+            lease.cancel()
+
+    async def run(self):
+        log.info(f"Ingestion worker started with {self.concurrency} slots")
+        slots = asyncio.Semaphore(self.concurrency)
+        while True:
+            await slots.acquire()
+            try:
+                job = await self.queue.dequeue()
+            except Exception as e:
+                log.error(f"Failed to take an ingestion job: {e}")
+                job = None
+                await asyncio.sleep(1)
+
+            if job is None:
+                slots.release()
+                continue
+
+            task = asyncio.create_task(self._run(job))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+            task.add_done_callback(lambda _: slots.release())
+
+
+async def run_ingestion_worker(app, concurrency: int = INGESTION_WORKER_CONCURRENCY):
+    """Entry point of `open-webui worker`, runs jobs from the Redis queue."""
+    async with app.router.lifespan_context(app):
+        queue = app.state.ingestion_queue
+        if not isinstance(queue, RedisIngestionQueue):
+            raise RuntimeError(
+                "The ingestion worker needs INGESTION_QUEUE=redis and REDIS_URL"
+            )
+        await IngestionWorker(app, queue, concurrency).run()
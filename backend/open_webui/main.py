@@ -61,6 +61,7 @@ from open_webui.utils import logger
 from open_webui.utils.audit import AuditLevel, AuditLoggingMiddleware
 from open_webui.utils.logger import start_logger
 from open_webui.socket.main import (
+    CHAT_MESSAGE_BUFFER,
     MODELS,
     app as socket_app,
     periodic_usage_pool_cleanup,
@@ -230,6 +231,7 @@ from open_webui.config import (
     RAG_RERANKING_MODEL_TRUST_REMOTE_CODE,
     RAG_EMBEDDING_ENGINE,
     RAG_EMBEDDING_BATCH_SIZE,
+    RAG_EMBEDDING_DIMENSIONS,
     ENABLE_ASYNC_EMBEDDING,
     RAG_TOP_K,
     RAG_TOP_K_RERANKER,
@@ -515,6 +517,11 @@ from open_webui.tasks import (
     stop_task,
     list_tasks,
 )  # Import from tasks.py
+from open_webui.ingestion import (
+    IngestionWorker,
+    LocalIngestionQueue,
+    get_ingestion_queue,
+)
 
 from open_webui.utils.redis import get_sentinels_from_env
 
@@ -612,11 +619,19 @@ async def lifespan(app: FastAPI):
             redis_task_command_listener(app)
         )
 
+    app.state.ingestion_queue = get_ingestion_queue(app.state.redis)
+    if isinstance(app.state.ingestion_queue, LocalIngestionQueue):
+        # Without a shared queue the web replica runs its own uploads
+        app.state.ingestion_worker = asyncio.create_task(
+            IngestionWorker(app, app.state.ingestion_queue).run()
+        )
+
     if THREAD_POOL_SIZE and THREAD_POOL_SIZE > 0:
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
     asyncio.create_task(periodic_usage_pool_cleanup())
+    CHAT_MESSAGE_BUFFER.start()
 
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         asyncio.create_task(
@@ -646,6 +661,12 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "ingestion_worker"):
+        app.state.ingestion_worker.cancel()
+
+    # Write out any chat message updates that are still buffered
+    await CHAT_MESSAGE_BUFFER.stop()
+
 
 app = FastAPI(
     title="smartDoc",
@@ -671,6 +692,8 @@ app.state.config = AppConfig(
     redis_key_prefix=REDIS_KEY_PREFIX,
 )
 app.state.redis = None
+app.state.ingestion_queue = None
+app.state.knowledge_reindex_job = None
 
 app.state.WEBUI_NAME = WEBUI_NAME
 app.state.LICENSE_METADATA = None
@@ -910,6 +933,7 @@ app.state.config.CHUNK_OVERLAP = CHUNK_OVERLAP
 app.state.config.RAG_EMBEDDING_ENGINE = RAG_EMBEDDING_ENGINE
 app.state.config.RAG_EMBEDDING_MODEL = RAG_EMBEDDING_MODEL
 app.state.config.RAG_EMBEDDING_BATCH_SIZE = RAG_EMBEDDING_BATCH_SIZE
+app.state.config.RAG_EMBEDDING_DIMENSIONS = RAG_EMBEDDING_DIMENSIONS
 app.state.config.ENABLE_ASYNC_EMBEDDING = ENABLE_ASYNC_EMBEDDING
 
 app.state.config.RAG_RERANKING_ENGINE = RAG_RERANKING_ENGINE
@@ -1043,6 +1067,7 @@ app.state.EMBEDDING_FUNCTION = get_embedding_function(
         if app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
         else None
     ),
+    embedding_dimensions=app.state.config.RAG_EMBEDDING_DIMENSIONS,
 )
 
 app.state.RERANKING_FUNCTION = get_reranking_function(
@@ -1641,7 +1666,7 @@ async def chat_completion(
             if metadata.get("chat_id") and metadata.get("message_id"):
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        await CHAT_MESSAGE_BUFFER.update(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1674,7 +1699,7 @@ async def chat_completion(
                 # Update the chat message with the error
                 try:
                     if not metadata["chat_id"].startswith("local:"):
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        await CHAT_MESSAGE_BUFFER.update(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1682,6 +1707,9 @@ async def chat_completion(
                                 "error": {"content": str(e)},
                             },
                         )
+                        await CHAT_MESSAGE_BUFFER.flush(
+                            metadata["chat_id"], metadata["message_id"]
+                        )
 
                     event_emitter = get_event_emitter(metadata)
                     await event_emitter(
@@ -0,0 +1,180 @@
+"""Add chat_message table
+
+Revision ID: 9ec96d09b476
+Revises: 3e0e00844bb0
+Create Date: 2026-01-12 10:41:27.318522
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+import json
+import time
+
+# revision identifiers, used by Alembic.
+revision: str = "9ec96d09b476"
+down_revision: Union[str, None] = "3e0e00844bb0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+
+def _chat_table():
+    return sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.String()),
+        sa.Column("chat", sa.JSON()),
+        sa.Column("current_message_id", sa.Text()),
+    )
+
+
+def _chat_message_table():
+    return sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+        sa.Column("created_at", sa.BigInteger()),
+        sa.Column("updated_at", sa.BigInteger()),
+    )
+
+
+def _iter_chats(connection, chat_table):
+    # Page through the chats by id so large instances are never held in memory
+    last_id = None
+    while True:
+        query = sa.select(chat_table.c.id, chat_table.c.chat).order_by(chat_table.c.id)
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+
+        rows = connection.execute(query.limit(BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+
+        for row in rows:
+            yield row
+        last_id = rows[-1][0]
+
+
+def upgrade() -> None:
+    op.add_column("chat", sa.Column("current_message_id", sa.Text(), nullable=True))
+
+    op.create_table(
+        "chat_message",
+        sa.Column(
+            "chat_id",
+            sa.Text(),
+            sa.ForeignKey("chat.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Text(), nullable=False),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint("chat_id", "id", name="pk_chat_message"),
+    )
+
+    # Move every chat's history.messages into chat_message rows
+    connection = op.get_bind()
+    chat_table = _chat_table()
+    chat_message_table = _chat_message_table()
+
+    now = int(time.time())
+    for chat_id, chat in _iter_chats(connection, chat_table):
+        if isinstance(chat, str):
+            try:
+                chat = json.loads(chat)
+            except Exception:
+                continue  # skip invalid JSON
+
+        if not isinstance(chat, dict):
+            continue
+
+        history = chat.get("history")
+        if not isinstance(history, dict) or not isinstance(
+            history.get("messages"), dict
+        ):
+            continue
+
+        history = {**history}
+        messages = history.pop("messages")
+
+        rows = [
+            {
+                "chat_id": chat_id,
+                "id": message_id,
+                "data": message if isinstance(message, dict) else {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for message_id, message in messages.items()
+        ]
+        if rows:
+            connection.execute(chat_message_table.insert(), rows)
+
+        connection.execute(
+            chat_table.update()
+            .where(chat_table.c.id == chat_id)
+            .values(
+                chat={**chat, "history": history},
+                current_message_id=history.get("currentId"),
+            )
+        )
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    chat_table = _chat_table()
+    chat_message_table = _chat_message_table()
+
+    # Fold the message rows back into chat.history.messages
+    chat_ids = [
+        chat_id
+        for (chat_id,) in connection.execute(
+            sa.select(chat_message_table.c.chat_id).distinct()
+        ).fetchall()
+    ]
+
+    for chat_id in chat_ids:
+        row = connection.execute(
+            sa.select(chat_table.c.chat, chat_table.c.current_message_id).where(
+                chat_table.c.id == chat_id
+            )
+        ).fetchone()
+        if row is None:
+            continue
+
+        chat, current_message_id = row
+        if isinstance(chat, str):
+            chat = json.loads(chat)
+        chat = chat if isinstance(chat, dict) else {}
+
+        messages = {
+            message_id: data
+            for message_id, data in connection.execute(
+                sa.select(chat_message_table.c.id, chat_message_table.c.data).where(
+                    chat_message_table.c.chat_id == chat_id
+                )
+            ).fetchall()
+        }
+
+        history = {**(chat.get("history") or {}), "messages": messages}
+        if current_message_id:
+            history["currentId"] = current_message_id
+
+        connection.execute(
+            chat_table.update()
+            .where(chat_table.c.id == chat_id)
+            .values(chat={**chat, "history": history})
+        )
+
+    op.drop_table("chat_message")
+
+    with op.batch_alter_table("chat") as batch_op:
+        batch_op.drop_column("current_message_id")
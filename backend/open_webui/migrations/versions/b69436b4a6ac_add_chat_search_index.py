@@ -0,0 +1,210 @@
+"""Add chat full-text search index
+
+Revision ID: b69436b4a6ac
+Revises: 9ec96d09b476
+Create Date: 2026-01-19 15:22:08.604117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+import json
+
+# revision identifiers, used by Alembic.
+revision: str = "b69436b4a6ac"
+down_revision: Union[str, None] = "9ec96d09b476"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+# Keep in sync with open_webui.models.chats.SEARCH_CONTENT_MAX_LENGTH
+SEARCH_CONTENT_MAX_LENGTH = 256 * 1024
+
+SQLITE_UPGRADE = [
+    """
+    CREATE TABLE chat_search (
+        id INTEGER PRIMARY KEY,
+        chat_id TEXT NOT NULL UNIQUE,
+        user_id TEXT,
+        title TEXT,
+        content TEXT
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE chat_fts USING fts5(
+        title,
+        content,
+        content='chat_search',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER chat_search_ai AFTER INSERT ON chat_search BEGIN
+        INSERT INTO chat_fts (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_ad AFTER DELETE ON chat_search BEGIN
+        INSERT INTO chat_fts (chat_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER chat_search_au AFTER UPDATE ON chat_search BEGIN
+        INSERT INTO chat_fts (chat_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO chat_fts (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "CREATE INDEX chat_search_user_id_idx ON chat_search (user_id)",
+]
+
+POSTGRES_UPGRADE = [
+    """
+    CREATE TABLE chat_search (
+        chat_id TEXT PRIMARY KEY,
+        user_id TEXT,
+        search_vector TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX chat_search_vector_idx ON chat_search USING GIN (search_vector)",
+    "CREATE INDEX chat_search_user_id_idx ON chat_search (user_id)",
+]
+
+SQLITE_INSERT = """
+    INSERT INTO chat_search (chat_id, user_id, title, content)
+    VALUES (:chat_id, :user_id, :title, :content)
+"""
+
+POSTGRES_INSERT = """
+    INSERT INTO chat_search (chat_id, user_id, search_vector)
+    VALUES (
+        :chat_id,
+        :user_id,
+        setweight(to_tsvector('simple', :title), 'A') ||
+        setweight(to_tsvector('simple', :content), 'B')
+    )
+"""
+
+
+def _get_content(connection, chat_message_table, chat_id, chat):
+    messages = chat.get("messages")
+    if not isinstance(messages, list) or not messages:
+        messages = [
+            data
+            for (data,) in connection.execute(
+                sa.select(chat_message_table.c.data).where(
+                    chat_message_table.c.chat_id == chat_id
+                )
+            ).fetchall()
+        ]
+
+    content = "\n".join(
+        message["content"]
+        for message in messages
+        if isinstance(message, dict) and isinstance(message.get("content"), str)
+    )
+    return content.replace("\x00", "")[:SEARCH_CONTENT_MAX_LENGTH]
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    dialect_name = connection.dialect.name
+
+    if dialect_name == "sqlite":
+        statements, insert = SQLITE_UPGRADE, SQLITE_INSERT
+    elif dialect_name == "postgresql":
+        statements, insert = POSTGRES_UPGRADE, POSTGRES_INSERT
+    else:
+        # Search keeps scanning the chat JSON on other databases
+        return
+
+    try:
+        for statement in statements:
+            connection.execute(sa.text(statement))
+    except Exception as e:
+        # e.g. SQLite builds without FTS5; search falls back to scanning
+        print(f"Skipping chat search index: {e}")
+        if dialect_name == "sqlite":
+            connection.execute(sa.text("DROP TABLE IF EXISTS chat_search"))
+            return
+        raise
+
+    chat_table = sa.Table(
+        "chat",
+        sa.MetaData(),
+        sa.Column("id", sa.String()),
+        sa.Column("user_id", sa.String()),
+        sa.Column("title", sa.Text()),
+        sa.Column("chat", sa.JSON()),
+    )
+    chat_message_table = sa.Table(
+        "chat_message",
+        sa.MetaData(),
+        sa.Column("chat_id", sa.Text()),
+        sa.Column("data", sa.JSON()),
+    )
+
+    # Index the existing chats, a page at a time
+    last_id = None
+    while True:
+        query = sa.select(
+            chat_table.c.id,
+            chat_table.c.user_id,
+            chat_table.c.title,
+            chat_table.c.chat,
+        ).order_by(chat_table.c.id)
+        if last_id is not None:
+            query = query.where(chat_table.c.id > last_id)
+
+        rows = connection.execute(query.limit(BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        entries = []
+        for chat_id, user_id, title, chat in rows:
+            if (user_id or "").startswith("shared-"):
+                continue
+
+            if isinstance(chat, str):
+                try:
+                    chat = json.loads(chat)
+                except Exception:
+                    chat = {}
+
+            entries.append(
+                {
+                    "chat_id": chat_id,
+                    "user_id": user_id,
+                    "title": (title or "").replace("\x00", ""),
+                    "content": _get_content(
+                        connection,
+                        chat_message_table,
+                        chat_id,
+                        chat if isinstance(chat, dict) else {},
+                    ),
+                }
+            )
+
+        if entries:
+            connection.execute(sa.text(insert), entries)
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    dialect_name = connection.dialect.name
+
+    if dialect_name == "sqlite":
+        for trigger in ["chat_search_ai", "chat_search_ad", "chat_search_au"]:
+            connection.execute(sa.text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        connection.execute(sa.text("DROP TABLE IF EXISTS chat_fts"))
+
+    connection.execute(sa.text("DROP TABLE IF EXISTS chat_search"))
@@ -0,0 +1,27 @@
+"""Add file hash index
+
+Revision ID: e7a2c4f19b3d
+Revises: b69436b4a6ac
+Create Date: 2026-10-17 10:12:44.518203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a2c4f19b3d"
+down_revision: Union[str, None] = "b69436b4a6ac"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Uploads are matched by content hash across users
+    op.create_index("file_hash_idx", "file", ["hash"])
+
+
+def downgrade() -> None:
+    op.drop_index("file_hash_idx", table_name="file")
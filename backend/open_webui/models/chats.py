@@ -1,5 +1,6 @@
 import logging
 import json
+import re
 import time
 import uuid
 from typing import Optional
@@ -10,8 +11,18 @@ from open_webui.models.folders import Folders
 from open_webui.env import SRC_LOG_LEVELS
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, Index
-from sqlalchemy import or_, func, select, and_, text
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    Float,
+    ForeignKey,
+    String,
+    Text,
+    JSON,
+    Index,
+)
+from sqlalchemy import or_, func, select, and_, text, inspect, table, column
 from sqlalchemy.sql import exists
 from sqlalchemy.sql.expression import bindparam
 
@@ -41,6 +52,10 @@ class Chat(Base):
     meta = Column(JSON, server_default="{}")
     folder_id = Column(Text, nullable=True)
 
+    # history.currentId, kept outside of the chat JSON so that single-message
+    # writes don't have to rewrite it
+    current_message_id = Column(Text, nullable=True)
+
     __table_args__ = (
         # Performance indexes for common queries
         # WHERE folder_id = ...
@@ -75,6 +90,42 @@ class ChatModel(BaseModel):
     folder_id: Optional[str] = None
 
 
+class ChatMessage(Base):
+    """
+    A single entry of a chat's `history.messages`, stored as its own row so
+    that streaming updates only touch the message being written.
+    """
+
+    __tablename__ = "chat_message"
+
+    chat_id = Column(Text, ForeignKey("chat.id", ondelete="CASCADE"), primary_key=True)
+    id = Column(Text, primary_key=True)
+    data = Column(JSON, nullable=False)
+
+    created_at = Column(BigInteger, nullable=False)
+    updated_at = Column(BigInteger, nullable=False)
+
+
+# Full-text search entries, one per chat. The table is dialect specific (an
+# FTS5 external content table on SQLite, a tsvector with a GIN index on
+# PostgreSQL) and is therefore managed with plain SQL rather than the ORM.
+chat_search = table("chat_search", column("chat_id"), column("user_id"))
+
+# PostgreSQL caps a tsvector at 1MB; very long chats are indexed partially
+SEARCH_CONTENT_MAX_LENGTH = 256 * 1024
+
+
+class ChatMessageModel(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    chat_id: str
+    id: str
+    data: dict
+
+    created_at: int  # timestamp in epoch
+    updated_at: int  # timestamp in epoch
+
+
 ####################
 # Forms
 ####################
@@ -164,6 +215,239 @@ class ChatTable:
 
         return changed
 
+    ####################
+    # Message rows
+    ####################
+
+    def _split_chat_messages(self, chat: dict) -> tuple[dict, Optional[dict]]:
+        """
+        Split a chat payload into the JSON stored on the chat row and the
+        `history.messages` map stored in `chat_message`. The map is None when
+        the payload carries no history messages at all.
+        """
+        history = chat.get("history")
+        if not isinstance(history, dict) or "messages" not in history:
+            return chat, None
+        if not isinstance(history["messages"], dict):
+            # Not a message map (e.g. the empty list of a new chat), kept on the
+            # chat row as it was sent
+            return chat, None if history["messages"] else {}
+
+        history = {**history}
+        messages = history.pop("messages") or {}
+        return {**chat, "history": history}, messages
+
+    def _sync_chat_messages(
+        self, db, chat_id: str, messages: dict, replace: bool = True
+    ) -> None:
+        """
+        Bring the message rows of a chat in line with `messages`, only writing
+        rows whose content actually changed.
+        """
+        now = int(time.time())
+        existing = {
+            message.id: message
+            for message in db.query(ChatMessage).filter_by(chat_id=chat_id).all()
+        }
+
+        for message_id, message in messages.items():
+            message = message if isinstance(message, dict) else {}
+            row = existing.pop(message_id, None)
+            if row is None:
+                db.add(
+                    ChatMessage(
+                        chat_id=chat_id,
+                        id=message_id,
+                        data=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                )
+            elif row.data != message:
+                row.data = message
+                row.updated_at = now
+
+        if replace:
+            for row in existing.values():
+                db.delete(row)
+
+    def _get_chat_messages(self, db, chat_ids: list[str]) -> dict[str, dict]:
+        messages = {}
+        # Chunk the IN clause to stay below the bound parameter limits
+        for i in range(0, len(chat_ids), 500):
+            rows = (
+                db.query(ChatMessage)
+                .filter(ChatMessage.chat_id.in_(chat_ids[i : i + 500]))
+                .all()
+            )
+            for row in rows:
+                messages.setdefault(row.chat_id, {})[row.id] = row.data
+        return messages
+
+    def _assemble_chat(self, chat_item, messages: Optional[dict]) -> ChatModel:
+        """
+        Rebuild the legacy `chat.history` shape from the chat row and its
+        message rows.
+        """
+        chat = ChatModel.model_validate(chat_item)
+        payload = {**(chat.chat or {})}
+
+        if messages or isinstance(payload.get("history"), dict):
+            history = {**(payload.get("history") or {})}
+            stored = history.get("messages")
+            if messages or not isinstance(stored, list):
+                history["messages"] = {
+                    **(stored if isinstance(stored, dict) else {}),
+                    **(messages or {}),
+                }
+            if chat_item.current_message_id:
+                history["currentId"] = chat_item.current_message_id
+            payload["history"] = history
+
+        chat.chat = payload
+        return chat
+
+    def _assemble_chats(self, db, chat_items: list) -> list[ChatModel]:
+        messages = self._get_chat_messages(db, [chat.id for chat in chat_items])
+        return [self._assemble_chat(chat, messages.get(chat.id)) for chat in chat_items]
+
+    def _touch_chat(self, db, id: str, current_message_id: Optional[str] = None):
+        """
+        Bump `updated_at` (and `current_message_id`) without rewriting the chat
+        JSON. Returns False if the chat does not exist.
+        """
+        now = int(time.time())
+        values = {"updated_at": now}
+        condition = Chat.updated_at < now
+        if current_message_id is not None:
+            values["current_message_id"] = current_message_id
+            condition = or_(
+                condition,
+                Chat.current_message_id.is_(None),
+                Chat.current_message_id != current_message_id,
+            )
+
+        # Streaming writes land many times per second; skip the chat row
+        # entirely when there is nothing new to record on it
+        updated = (
+            db.query(Chat)
+            .filter(Chat.id == id, condition)
+            .update(values, synchronize_session=False)
+        )
+        if updated:
+            return True
+        return db.query(Chat.id).filter_by(id=id).first() is not None
+
+    def _delete_chat_data(self, db, chat_ids) -> None:
+        """Remove the message rows and search entries of the given chats."""
+        db.query(ChatMessage).filter(ChatMessage.chat_id.in_(chat_ids)).delete(
+            synchronize_session=False
+        )
+        if self._has_search_index(db):
+            db.execute(chat_search.delete().where(chat_search.c.chat_id.in_(chat_ids)))
+
+    ####################
+    # Search index
+    ####################
+
+    _search_index: Optional[bool] = None
+
+    def _has_search_index(self, db) -> bool:
+        if self._search_index is None:
+            self._search_index = inspect(db.bind).has_table("chat_search")
+        return self._search_index
+
+    def _get_search_content(self, chat: dict, messages: dict) -> str:
+        # Prefer the linear message list of the selected branch, which is
+        # what the search has always matched against
+        message_list = chat.get("messages")
+        if not isinstance(message_list, list) or not message_list:
+            message_list = list(messages.values())
+
+        content = "\n".join(
+            message["content"]
+            for message in message_list
+            if isinstance(message, dict) and isinstance(message.get("content"), str)
+        )
+        return self._clean_null_bytes(content)[:SEARCH_CONTENT_MAX_LENGTH]
+
+    def _index_chat(self, db, chat_item, messages: Optional[dict] = None) -> None:
+        """
+        Refresh the full-text search entry of a chat. The entry follows full
+        chat writes; streamed single-message updates are picked up by the
+        final save of the chat.
+        """
+        if not self._has_search_index(db):
+            return
+
+        if messages is None:
+            messages = self._get_chat_messages(db, [chat_item.id]).get(chat_item.id, {})
+
+        params = {
+            "chat_id": chat_item.id,
+            "user_id": chat_item.user_id,
+            "title": self._clean_null_bytes(chat_item.title or ""),
+            "content": self._get_search_content(chat_item.chat or {}, messages),
+        }
+
+        if db.bind.dialect.name == "sqlite":
+            # chat_fts is kept in sync with chat_search through triggers
+            db.execute(
+                text(
+                    "INSERT INTO chat_search (chat_id, user_id, title, content) "
+                    "VALUES (:chat_id, :user_id, :title, :content) "
+                    "ON CONFLICT (chat_id) DO UPDATE SET "
+                    "user_id = excluded.user_id, "
+                    "title = excluded.title, "
+                    "content = excluded.content"
+                ),
+                params,
+            )
+        elif db.bind.dialect.name == "postgresql":
+            db.execute(
+                text(
+                    "INSERT INTO chat_search (chat_id, user_id, search_vector) "
+                    "VALUES (:chat_id, :user_id, "
+                    "setweight(to_tsvector('simple', :title), 'A') || "
+                    "setweight(to_tsvector('simple', :content), 'B')) "
+                    "ON CONFLICT (chat_id) DO UPDATE SET "
+                    "user_id = excluded.user_id, "
+                    "search_vector = excluded.search_vector"
+                ),
+                params,
+            )
+
+    def _get_search_terms(self, search_text: str) -> list[str]:
+        return re.findall(r"\w+", search_text.lower())
+
+    def _filter_by_search_index(self, db, query, user_id: str, terms: list[str]):
+        """
+        Restrict `query` to the chats of `user_id` matching every term (as a
+        prefix), ordered by relevance.
+        """
+        if db.bind.dialect.name == "sqlite":
+            # Title matches weigh ten times more than content matches; bm25()
+            # returns lower values for better matches
+            rank = text(
+                "SELECT chat_search.chat_id AS chat_id, "
+                "-bm25(chat_fts, 10.0, 1.0) AS rank "
+                "FROM chat_fts JOIN chat_search ON chat_search.id = chat_fts.rowid "
+                "WHERE chat_fts MATCH :match AND chat_search.user_id = :user_id"
+            ).bindparams(
+                match=" ".join(f'"{term}"*' for term in terms), user_id=user_id
+            )
+        else:
+            rank = text(
+                "SELECT chat_id, ts_rank(search_vector, query) AS rank "
+                "FROM chat_search, to_tsquery('simple', :match) AS query "
+                "WHERE user_id = :user_id AND search_vector @@ query"
+            ).bindparams(
+                match=" & ".join(f"{term}:*" for term in terms), user_id=user_id
+            )
+
+        rank = rank.columns(column("chat_id", String), column("rank", Float)).subquery()
+        return query.join(rank, rank.c.chat_id == Chat.id).order_by(rank.c.rank.desc())
+
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
             id = str(uuid.uuid4())
@@ -183,11 +467,31 @@ class ChatTable:
                 }
             )
 
-            chat_item = Chat(**chat.model_dump())
-            db.add(chat_item)
+            chat_item, messages = self._new_chat_item(db, chat)
             db.commit()
             db.refresh(chat_item)
-            return ChatModel.model_validate(chat_item) if chat_item else None
+            return self._assemble_chat(chat_item, messages) if chat_item else None
+
+    def _new_chat_item(self, db, chat: ChatModel) -> tuple[Chat, Optional[dict]]:
+        payload, messages = self._split_chat_messages(chat.chat)
+        chat_item = Chat(
+            **chat.model_dump(exclude={"chat"}),
+            chat=payload,
+            current_message_id=(
+                payload["history"].get("currentId") if messages is not None else None
+            ),
+        )
+        db.add(chat_item)
+
+        if messages:
+            # The chat row has to exist before its messages reference it
+            db.flush()
+            self._sync_chat_messages(db, chat.id, messages, replace=False)
+
+        # Shared snapshots are never searched
+        if not chat.user_id.startswith("shared-"):
+            self._index_chat(db, chat_item, messages or {})
+        return chat_item, messages
 
     def _chat_import_form_to_chat_model(
         self, user_id: str, form_data: ChatImportForm
@@ -222,41 +526,57 @@ class ChatTable:
 
             for form_data in chat_import_forms:
                 chat = self._chat_import_form_to_chat_model(user_id, form_data)
-                chats.append(Chat(**chat.model_dump()))
+                self._new_chat_item(db, chat)
+                chats.append(chat)
 
-            db.add_all(chats)
             db.commit()
-            return [ChatModel.model_validate(chat) for chat in chats]
+            return chats
 
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
         try:
             with get_db() as db:
                 chat_item = db.get(Chat, id)
-                chat_item.chat = self._clean_null_bytes(chat)
-                chat_item.title = (
-                    self._clean_null_bytes(chat["title"])
-                    if "title" in chat
-                    else "New Chat"
-                )
+
+                chat = self._clean_null_bytes(chat)
+                payload, messages = self._split_chat_messages(chat)
+
+                chat_item.chat = payload
+                chat_item.title = chat["title"] if "title" in chat else "New Chat"
+
+                if messages is not None:
+                    self._sync_chat_messages(db, id, messages)
+                    chat_item.current_message_id = payload["history"].get("currentId")
 
                 chat_item.updated_at = int(time.time())
+                self._index_chat(db, chat_item, messages)
 
                 db.commit()
                 db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                if messages is not None:
+                    return self._assemble_chat(chat_item, messages)
+                return self._assemble_chats(db, [chat_item])[0]
         except Exception:
             return None
 
     def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        try:
+            with get_db() as db:
+                chat_item = db.get(Chat, id)
+                if chat_item is None:
+                    return None
 
-        chat = chat.chat
-        chat["title"] = title
+                # The title lives on the chat row; messages are left untouched
+                chat_item.chat = {**(chat_item.chat or {}), "title": title}
+                chat_item.title = self._clean_null_bytes(title)
+                chat_item.updated_at = int(time.time())
+                self._index_chat(db, chat_item)
 
-        return self.update_chat_by_id(id, chat)
+                db.commit()
+                db.refresh(chat_item)
+                return self._assemble_chats(db, [chat_item])[0]
+        except Exception:
+            return None
 
     def update_chat_tags_by_id(
         self, id: str, tags: list[str], user
@@ -279,11 +599,12 @@ class ChatTable:
         return self.get_chat_by_id(id)
 
     def get_chat_title_by_id(self, id: str) -> Optional[str]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            chat = db.query(Chat.chat).filter_by(id=id).first()
+            if chat is None:
+                return None
 
-        return chat.chat.get("title", "New Chat")
+            return (chat[0] or {}).get("title", "New Chat")
 
     def get_messages_map_by_chat_id(self, id: str) -> Optional[dict]:
         chat = self.get_chat_by_id(id)
@@ -295,77 +616,91 @@ class ChatTable:
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
+        with get_db() as db:
+            message = db.get(ChatMessage, (id, message_id))
+            if message is not None:
+                return message.data
 
-        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+            if db.query(Chat.id).filter_by(id=id).first() is None:
+                return None
+            return {}
 
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
-            return None
-
+    ) -> Optional[ChatMessageModel]:
         # Sanitize message content for null characters before upserting
-        if isinstance(message.get("content"), str):
-            message["content"] = message["content"].replace("\x00", "")
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+        message = self._clean_null_bytes(message)
 
-        history["currentId"] = message_id
+        try:
+            with get_db() as db:
+                if not self._touch_chat(db, id, current_message_id=message_id):
+                    return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+                now = int(time.time())
+                message_item = db.get(ChatMessage, (id, message_id))
+                if message_item is None:
+                    message_item = ChatMessage(
+                        chat_id=id,
+                        id=message_id,
+                        data=message,
+                        created_at=now,
+                        updated_at=now,
+                    )
+                    db.add(message_item)
+                else:
+                    message_item.data = {**message_item.data, **message}
+                    message_item.updated_at = now
 
-    def add_message_status_to_chat_by_id_and_message_id(
-        self, id: str, message_id: str, status: dict
-    ) -> Optional[ChatModel]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+                db.commit()
+                db.refresh(message_item)
+                return ChatMessageModel.model_validate(message_item)
+        except Exception as e:
+            log.exception(f"Error upserting message {message_id} of chat {id}: {e}")
             return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+    def _update_message_data(self, id: str, message_id: str, update):
+        """
+        Apply `update(data) -> data` to a single stored message. Returns the
+        new message data, {} if the message does not exist and None if the
+        chat does not exist.
+        """
+        with get_db() as db:
+            if not self._touch_chat(db, id):
+                return None
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+            message_item = db.get(ChatMessage, (id, message_id))
+            if message_item is None:
+                db.commit()
+                return {}
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+            message_item.data = update({**message_item.data})
+            message_item.updated_at = int(time.time())
+            db.commit()
+            return message_item.data
+
+    def add_message_status_to_chat_by_id_and_message_id(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[dict]:
+        return self._update_message_data(
+            id,
+            message_id,
+            lambda message: {
+                **message,
+                "statusHistory": message.get("statusHistory", []) + [status],
+            },
+        )
 
     def add_message_files_by_id_and_message_id(
         self, id: str, message_id: str, files: list[dict]
     ) -> list[dict]:
-        chat = self.get_chat_by_id(id)
-        if chat is None:
+        message = self._update_message_data(
+            id,
+            message_id,
+            lambda message: {**message, "files": message.get("files", []) + files},
+        )
+        if message is None:
             return None
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        message_files = []
-
-        if message_id in history.get("messages", {}):
-            message_files = history["messages"][message_id].get("files", [])
-            message_files = message_files + files
-            history["messages"][message_id]["files"] = message_files
-
-        chat["history"] = history
-        self.update_chat_by_id(id, chat)
-        return message_files
+        return message.get("files", [])
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -380,7 +715,7 @@ class ChatTable:
                     "id": str(uuid.uuid4()),
                     "user_id": f"shared-{chat_id}",
                     "title": chat.title,
-                    "chat": chat.chat,
+                    "chat": self._assemble_chats(db, [chat])[0].chat,
                     "meta": chat.meta,
                     "pinned": chat.pinned,
                     "folder_id": chat.folder_id,
@@ -388,8 +723,7 @@ class ChatTable:
                     "updated_at": int(time.time()),
                 }
             )
-            shared_result = Chat(**shared_chat.model_dump())
-            db.add(shared_result)
+            shared_result, _ = self._new_chat_item(db, shared_chat)
             db.commit()
             db.refresh(shared_result)
 
@@ -413,22 +747,32 @@ class ChatTable:
                 if shared_chat is None:
                     return self.insert_shared_chat_by_chat_id(chat_id)
 
+                payload, messages = self._split_chat_messages(
+                    self._assemble_chats(db, [chat])[0].chat
+                )
+
                 shared_chat.title = chat.title
-                shared_chat.chat = chat.chat
+                shared_chat.chat = payload
+                shared_chat.current_message_id = chat.current_message_id
                 shared_chat.meta = chat.meta
                 shared_chat.pinned = chat.pinned
                 shared_chat.folder_id = chat.folder_id
                 shared_chat.updated_at = int(time.time())
+                self._sync_chat_messages(db, shared_chat.id, messages or {})
                 db.commit()
                 db.refresh(shared_chat)
 
-                return ChatModel.model_validate(shared_chat)
+                return self._assemble_chat(shared_chat, messages)
         except Exception:
             return None
 
     def delete_shared_chat_by_chat_id(self, chat_id: str) -> bool:
         try:
             with get_db() as db:
+                shared_chats = select(Chat.id).where(
+                    Chat.user_id == f"shared-{chat_id}"
+                )
+                self._delete_chat_data(db, shared_chats)
                 db.query(Chat).filter_by(user_id=f"shared-{chat_id}").delete()
                 db.commit()
 
@@ -454,7 +798,7 @@ class ChatTable:
                 chat.share_id = share_id
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -466,7 +810,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -479,7 +823,7 @@ class ChatTable:
                 chat.updated_at = int(time.time())
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -640,7 +984,7 @@ class ChatTable:
                     db.commit()
                     db.refresh(chat_item)
 
-                return ChatModel.model_validate(chat_item)
+                return self._assemble_chats(db, [chat_item])[0]
         except Exception:
             return None
 
@@ -662,7 +1006,9 @@ class ChatTable:
         try:
             with get_db() as db:
                 chat = db.query(Chat).filter_by(id=id, user_id=user_id).first()
-                return ChatModel.model_validate(chat)
+                if chat is None:
+                    return None
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -671,9 +1017,9 @@ class ChatTable:
             all_chats = (
                 db.query(Chat)
                 # .limit(limit).offset(skip)
-                .order_by(Chat.updated_at.desc())
+                .order_by(Chat.updated_at.desc()).all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._assemble_chats(db, all_chats)
 
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -681,8 +1027,9 @@ class ChatTable:
                 db.query(Chat)
                 .filter_by(user_id=user_id)
                 .order_by(Chat.updated_at.desc())
+                .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._assemble_chats(db, all_chats)
 
     def get_pinned_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
@@ -699,8 +1046,9 @@ class ChatTable:
                 db.query(Chat)
                 .filter_by(user_id=user_id, archived=True)
                 .order_by(Chat.updated_at.desc())
+                .all()
             )
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._assemble_chats(db, all_chats)
 
     def get_chats_by_user_id_and_search_text(
         self,
@@ -792,25 +1140,32 @@ class ChatTable:
             if folder_ids:
                 query = query.filter(Chat.folder_id.in_(folder_ids))
 
-            query = query.order_by(Chat.updated_at.desc())
+            # Match against the full-text index when it is available, and fall
+            # back to scanning the chat JSON otherwise
+            search_terms = self._get_search_terms(search_text)
+            use_search_index = bool(search_terms) and self._has_search_index(db)
+            if use_search_index:
+                query = self._filter_by_search_index(db, query, user_id, search_terms)
 
             # Check if the database dialect is either 'sqlite' or 'postgresql'
             dialect_name = db.bind.dialect.name
             if dialect_name == "sqlite":
-                # SQLite case: using JSON1 extension for JSON searching
-                sqlite_content_sql = (
-                    "EXISTS ("
-                    "    SELECT 1 "
-                    "    FROM json_each(Chat.chat, '$.messages') AS message "
-                    "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
-                    ")"
-                )
-                sqlite_content_clause = text(sqlite_content_sql)
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")), sqlite_content_clause
-                    ).params(title_key=f"%{search_text}%", content_key=search_text)
-                )
+                if search_text and not use_search_index:
+                    # SQLite case: using JSON1 extension for JSON searching
+                    sqlite_content_sql = (
+                        "EXISTS ("
+                        "    SELECT 1 "
+                        "    FROM json_each(Chat.chat, '$.messages') AS message "
+                        "    WHERE LOWER(message.value->>'content') LIKE '%' || :content_key || '%'"
+                        ")"
+                    )
+                    sqlite_content_clause = text(sqlite_content_sql)
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            sqlite_content_clause,
+                        ).params(title_key=f"%{search_text}%", content_key=search_text)
+                    )
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -843,32 +1198,35 @@ class ChatTable:
                     )
 
             elif dialect_name == "postgresql":
-                # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
-                # the JSON representation for \u0000 before attempting text extraction
-
-                # Safety filter: JSON field must not contain \u0000
-                query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
-
-                # Safety filter: title must not contain actual null bytes
-                query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
-
-                postgres_content_sql = """
-                EXISTS (
-                    SELECT 1
-                    FROM json_array_elements(Chat.chat->'messages') AS message
-                    WHERE json_typeof(message->'content') = 'string'
-                    AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
-                )
-                """
+                if search_text and not use_search_index:
+                    # PostgreSQL doesn't allow null bytes in text. We filter those out by checking
+                    # the JSON representation for \u0000 before attempting text extraction
+
+                    # Safety filter: JSON field must not contain \u0000
+                    query = query.filter(text("Chat.chat::text NOT LIKE '%\\\\u0000%'"))
+
+                    # Safety filter: title must not contain actual null bytes
+                    query = query.filter(text("Chat.title::text NOT LIKE '%\\x00%'"))
+
+                    postgres_content_sql = """
+                    EXISTS (
+                        SELECT 1
+                        FROM json_array_elements(Chat.chat->'messages') AS message
+                        WHERE json_typeof(message->'content') = 'string'
+                        AND LOWER(message->>'content') LIKE '%' || :content_key || '%'
+                    )
+                    """
 
-                postgres_content_clause = text(postgres_content_sql)
+                    postgres_content_clause = text(postgres_content_sql)
 
-                query = query.filter(
-                    or_(
-                        Chat.title.ilike(bindparam("title_key")),
-                        postgres_content_clause,
+                    query = query.filter(
+                        or_(
+                            Chat.title.ilike(bindparam("title_key")),
+                            postgres_content_clause,
+                        )
+                    ).params(
+                        title_key=f"%{search_text}%", content_key=search_text.lower()
                     )
-                ).params(title_key=f"%{search_text}%", content_key=search_text.lower())
 
                 # Check if there are any tags to filter, it should have all the tags
                 if "none" in tag_ids:
@@ -904,6 +1262,9 @@ class ChatTable:
                     f"Unsupported dialect: {db.bind.dialect.name}"
                 )
 
+            # Ties in relevance (or no search text at all) go most recent first
+            query = query.order_by(Chat.updated_at.desc())
+
             # Perform pagination at the SQL level
             all_chats = query.offset(skip).limit(limit).all()
 
@@ -943,7 +1304,7 @@ class ChatTable:
             query = query.order_by(Chat.updated_at.desc())
 
             all_chats = query.all()
-            return [ChatModel.model_validate(chat) for chat in all_chats]
+            return self._assemble_chats(db, all_chats)
 
     def update_chat_folder_id_by_id_and_user_id(
         self, id: str, user_id: str, folder_id: str
@@ -956,7 +1317,7 @@ class ChatTable:
                 chat.pinned = False
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -1016,7 +1377,7 @@ class ChatTable:
 
                 db.commit()
                 db.refresh(chat)
-                return ChatModel.model_validate(chat)
+                return self._assemble_chats(db, [chat])[0]
         except Exception:
             return None
 
@@ -1102,6 +1463,7 @@ class ChatTable:
     def delete_chat_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_data(db, [id])
                 db.query(Chat).filter_by(id=id).delete()
                 db.commit()
 
@@ -1112,6 +1474,9 @@ class ChatTable:
     def delete_chat_by_id_and_user_id(self, id: str, user_id: str) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_data(
+                    db, select(Chat.id).where(Chat.id == id, Chat.user_id == user_id)
+                )
                 db.query(Chat).filter_by(id=id, user_id=user_id).delete()
                 db.commit()
 
@@ -1124,6 +1489,9 @@ class ChatTable:
             with get_db() as db:
                 self.delete_shared_chats_by_user_id(user_id)
 
+                self._delete_chat_data(
+                    db, select(Chat.id).where(Chat.user_id == user_id)
+                )
                 db.query(Chat).filter_by(user_id=user_id).delete()
                 db.commit()
 
@@ -1136,6 +1504,12 @@ class ChatTable:
     ) -> bool:
         try:
             with get_db() as db:
+                self._delete_chat_data(
+                    db,
+                    select(Chat.id).where(
+                        Chat.user_id == user_id, Chat.folder_id == folder_id
+                    ),
+                )
                 db.query(Chat).filter_by(user_id=user_id, folder_id=folder_id).delete()
                 db.commit()
 
@@ -1160,9 +1534,12 @@ class ChatTable:
     def delete_shared_chats_by_user_id(self, user_id: str) -> bool:
         try:
             with get_db() as db:
-                chats_by_user = db.query(Chat).filter_by(user_id=user_id).all()
+                chats_by_user = db.query(Chat.id).filter_by(user_id=user_id).all()
                 shared_chat_ids = [f"shared-{chat.id}" for chat in chats_by_user]
 
+                self._delete_chat_data(
+                    db, select(Chat.id).where(Chat.user_id.in_(shared_chat_ids))
+                )
                 db.query(Chat).filter(Chat.user_id.in_(shared_chat_ids)).delete()
                 db.commit()
 
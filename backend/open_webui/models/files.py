@@ -5,7 +5,7 @@ from typing import Optional
 from open_webui.internal.db import Base, JSONField, get_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, Index, String, Text, JSON
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,6 +32,8 @@ class File(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (Index("file_hash_idx", "hash"),)
+
 
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -223,6 +225,30 @@ class FilesTable:
             except Exception:
                 return None
 
+    def get_processed_file_by_hash(
+        self, hash: str, exclude_id: Optional[str] = None
+    ) -> Optional[FileModel]:
+        """
+        Return a file of any user with the same content hash whose chunks are
+        stored in its own collection, so they can be reused.
+        """
+        with get_db() as db:
+            try:
+                files = (
+                    db.query(File)
+                    .filter(File.hash == hash, File.id != exclude_id)
+                    .order_by(File.created_at)
+                    .all()
+                )
+                for file in files:
+                    if (file.data or {}).get("status") == "completed" and (
+                        file.meta or {}
+                    ).get("collection_name") == f"file-{file.id}":
+                        return FileModel.model_validate(file)
+                return None
+            except Exception:
+                return None
+
     def update_file_by_id(
         self, id: str, form_data: FileUpdateForm
     ) -> Optional[FileModel]:
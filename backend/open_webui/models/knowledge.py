@@ -329,6 +329,19 @@ class KnowledgeTable:
             log.exception(e)
             return None
 
+    def update_knowledge_meta_by_id(
+        self, id: str, meta: dict
+    ) -> Optional[KnowledgeModel]:
+        try:
+            with get_db() as db:
+                knowledge = db.query(Knowledge).filter_by(id=id).first()
+                knowledge.meta = {**(knowledge.meta if knowledge.meta else {}), **meta}
+                db.commit()
+                return KnowledgeModel.model_validate(knowledge)
+        except Exception as e:
+            log.exception(e)
+            return None
+
     def update_knowledge_data_by_id(
         self, id: str, data: dict
     ) -> Optional[KnowledgeModel]:
@@ -0,0 +1,423 @@
+# reindex.py
+import asyncio
+import json
+import logging
+import time
+from typing import Optional
+from uuid import uuid4
+
+from fastapi import Request
+
+from open_webui.config import (
+    KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY,
+    KNOWLEDGE_REINDEX_FILE_CONCURRENCY,
+    KNOWLEDGE_REINDEX_LEASE_TIMEOUT,
+)
+from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX
+from open_webui.models.files import FileModel
+from open_webui.models.knowledge import KnowledgeModel, Knowledges
+from open_webui.retrieval.bm25 import BM25_INDEXES
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.routers.retrieval import aindex_file
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+REDIS_REINDEX_KEY = f"{REDIS_KEY_PREFIX}:knowledge:reindex"
+
+# Only the replica holding the lock may release it
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def get_shadow_collection_name(knowledge_id: str) -> str:
+    return f"{knowledge_id}-reindex"
+
+
+def supports_shadow_collections() -> bool:
+    # The rebuilt chunks are moved into place with their vectors, backends
+    # that can't read vectors back are reindexed in place instead
+    backend = type(VECTOR_DB_CLIENT)
+    return (
+        backend.get_with_vectors is not VectorDBBase.get_with_vectors
+        or backend.copy_items is not VectorDBBase.copy_items
+    )
+
+
+class KnowledgeReindexJob:
+    """
+    Rebuilds every knowledge collection from the chunks of its files.
+
+    Each knowledge base is rebuilt into a shadow collection while queries keep
+    being served from the current one. Once all of its files are done, the
+    rebuilt chunks of each file are copied into the live collection and the
+    file's previous chunks are only deleted after the copy is verified. On
+    backends that can't copy vectors between collections, files are reindexed
+    in place, one at a time. Files are embedded in parallel across knowledge
+    bases, bounded by KNOWLEDGE_REINDEX_FILE_CONCURRENCY, and at most
+    KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY knowledge bases are in progress.
+
+    The files done so far are checkpointed in knowledge.meta["reindex"], so a
+    job interrupted by a restart resumes where it stopped when reindexing is
+    requested again. With Redis, the job holds a lock shared by all replicas
+    and publishes its status there.
+    """
+
+    def __init__(self, request: Request, user, id: Optional[str] = None):
+        self.request = request
+        self.user = user
+        self.id = id or str(uuid4())
+        self.redis = request.app.state.redis
+
+        self.status = {
+            "id": self.id,
+            "status": "pending",
+            "knowledge_bases": 0,
+            "completed_knowledge_bases": 0,
+            "files": 0,
+            "completed_files": 0,
+            "failed_files": [],
+            "started_at": None,
+            "completed_at": None,
+        }
+
+        self._failed = False
+        self._file_semaphore = asyncio.Semaphore(
+            max(KNOWLEDGE_REINDEX_FILE_CONCURRENCY, 1)
+        )
+        self._collection_semaphore = asyncio.Semaphore(
+            max(KNOWLEDGE_REINDEX_COLLECTION_CONCURRENCY, 1)
+        )
+
+    @classmethod
+    def resume_or_create(cls, request: Request, user) -> "KnowledgeReindexJob":
+        """Pick up the job an earlier run left checkpoints for, if any."""
+        for knowledge_base in Knowledges.get_knowledge_bases():
+            checkpoint = (knowledge_base.meta or {}).get("reindex")
+            if checkpoint and checkpoint.get("job_id"):
+                log.info(f"Resuming knowledge reindex job {checkpoint['job_id']}")
+                return cls(request, user, id=checkpoint["job_id"])
+        return cls(request, user)
+
+    async def acquire(self) -> bool:
+        """Take the lock that keeps a second job from running, False if held."""
+        if self.redis is None:
+            return True
+        return bool(
+            await self.redis.set(
+                f"{REDIS_REINDEX_KEY}:lock",
+                self.id,
+                nx=True,
+                ex=KNOWLEDGE_REINDEX_LEASE_TIMEOUT,
+            )
+        )
+
+    async def _release(self):
+        if self.redis is not None:
+            await self.redis.eval(
+                RELEASE_LOCK_SCRIPT, 1, f"{REDIS_REINDEX_KEY}:lock", self.id
+            )
+
+    async def _keep_lease(self):
+        interval = max(KNOWLEDGE_REINDEX_LEASE_TIMEOUT / 3, 1)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.redis.expire(
+                    f"{REDIS_REINDEX_KEY}:lock", KNOWLEDGE_REINDEX_LEASE_TIMEOUT
+                )
+            except Exception as e:
+                log.warning(f"Failed to renew knowledge reindex job {self.id}: {e}")
+
+    async def _save_status(self):
+        if self.redis is not None:
+            try:
+                await self.redis.set(
+                    f"{REDIS_REINDEX_KEY}:status", json.dumps(self.status)
+                )
+            except Exception as e:
+                log.warning(f"Failed to save knowledge reindex status: {e}")
+
+    async def _save_checkpoint(self, knowledge_id: str, checkpoint: Optional[dict]):
+        await asyncio.to_thread(
+            Knowledges.update_knowledge_meta_by_id,
+            knowledge_id,
+            {"reindex": checkpoint},
+        )
+
+    async def _index_file(
+        self, collection_name: str, file: FileModel, replace: bool = False
+    ) -> bool:
+        async with self._file_semaphore:
+            try:
+                if replace:
+                    # Updated in place, the file's chunks are replaced together
+                    result = await aindex_file(
+                        self.request,
+                        file,
+                        collection_name,
+                        user=self.user,
+                        replace=True,
+                    )
+                else:
+                    # Drop what an interrupted attempt left of the file
+                    if await asyncio.to_thread(
+                        VECTOR_DB_CLIENT.has_collection, collection_name=collection_name
+                    ):
+                        await asyncio.to_thread(
+                            VECTOR_DB_CLIENT.delete,
+                            collection_name=collection_name,
+                            filter={"file_id": file.id},
+                        )
+                    result = await aindex_file(
+                        self.request, file, collection_name, user=self.user
+                    )
+
+                if not result:
+                    raise Exception("Error saving document to vector database")
+                self.status["completed_files"] += 1
+                return True
+            except Exception as e:
+                log.error(
+                    f"Error processing file {file.filename} (ID: {file.id}): {str(e)}"
+                )
+                self.status["failed_files"].append(
+                    {"file_id": file.id, "error": str(e)}
+                )
+                return False
+            finally:
+                await self._save_status()
+
+    async def _delete_collection(self, collection_name: str):
+        if await asyncio.to_thread(
+            VECTOR_DB_CLIENT.has_collection, collection_name=collection_name
+        ):
+            await asyncio.to_thread(
+                VECTOR_DB_CLIENT.delete_collection, collection_name=collection_name
+            )
+        BM25_INDEXES.invalidate(collection_name)
+
+    async def _get_ids(self, collection_name: str, file_id: str) -> list[str]:
+        result = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.query,
+            collection_name=collection_name,
+            filter={"file_id": file_id},
+        )
+        return result.ids[0] if result else []
+
+    async def _swap(self, knowledge_id: str, shadow: str, file_ids: list[str]):
+        """
+        Move the rebuilt chunks of each file into the live collection, vectors
+        included. A file's previous chunks are deleted once its copy is
+        verified, so queries find one or the other at all times. Files that
+        failed to reindex keep their previous chunks.
+        """
+        try:
+            # File by file, so the whole collection is never held in memory
+            for file_id in file_ids:
+                previous_ids = await self._get_ids(knowledge_id, file_id)
+                expected = len(await self._get_ids(shadow, file_id))
+
+                copied = await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.copy_items,
+                    shadow,
+                    knowledge_id,
+                    filter={"file_id": file_id},
+                )
+                if not copied or len(copied) != expected:
+                    raise Exception(
+                        f"Copied {len(copied or [])} of {expected} chunks of file "
+                        f"{file_id} into {knowledge_id}"
+                    )
+
+                if previous_ids:
+                    await asyncio.to_thread(
+                        VECTOR_DB_CLIENT.delete,
+                        collection_name=knowledge_id,
+                        ids=previous_ids,
+                    )
+        finally:
+            BM25_INDEXES.invalidate(knowledge_id)
+
+    async def reindex_knowledge_base(self, knowledge_base: KnowledgeModel):
+        async with self._collection_semaphore:
+            in_place = not supports_shadow_collections()
+            collection_name = (
+                knowledge_base.id
+                if in_place
+                else get_shadow_collection_name(knowledge_base.id)
+            )
+            files = await asyncio.to_thread(
+                Knowledges.get_files_by_id, knowledge_base.id
+            )
+
+            checkpoint = (knowledge_base.meta or {}).get("reindex")
+            if (
+                checkpoint
+                and checkpoint.get("job_id") == self.id
+                and checkpoint.get("collection_name") == collection_name
+            ):
+                done = set(checkpoint.get("files", []))
+                if checkpoint.get("completed"):
+                    if not in_place:
+                        await self._delete_collection(collection_name)
+                    self.status["completed_knowledge_bases"] += 1
+                    self.status["completed_files"] += len(
+                        [file for file in files if file.id in done]
+                    )
+                    await self._save_status()
+                    return
+            else:
+                if not in_place:
+                    # Start over from an empty shadow collection
+                    await self._delete_collection(collection_name)
+                done = set()
+
+            def get_checkpoint(completed: bool = False) -> dict:
+                return {
+                    "job_id": self.id,
+                    "collection_name": collection_name,
+                    "files": sorted(done),
+                    "completed": completed,
+                }
+
+            await self._save_checkpoint(knowledge_base.id, get_checkpoint())
+            self.status["completed_files"] += len(
+                [file for file in files if file.id in done]
+            )
+
+            lock = asyncio.Lock()
+
+            async def index_file(file: FileModel):
+                if await self._index_file(collection_name, file, replace=in_place):
+                    async with lock:
+                        done.add(file.id)
+                        await self._save_checkpoint(knowledge_base.id, get_checkpoint())
+
+            await asyncio.gather(
+                *[index_file(file) for file in files if file.id not in done]
+            )
+
+            if not in_place:
+                await self._swap(
+                    knowledge_base.id,
+                    collection_name,
+                    [file.id for file in files if file.id in done],
+                )
+            await self._save_checkpoint(
+                knowledge_base.id, get_checkpoint(completed=True)
+            )
+            if not in_place:
+                await self._delete_collection(collection_name)
+
+            self.status["completed_knowledge_bases"] += 1
+            await self._save_status()
+            log.info(
+                f"Reindexed knowledge base {knowledge_base.id} "
+                f"({len(done)}/{len(files)} files)"
+            )
+
+    async def run(self):
+        """Run the job, holding the lock taken by acquire() until it ends."""
+        self.status["status"] = "running"
+        self.status["started_at"] = int(time.time())
+        await self._save_status()
+
+        lease = (
+            asyncio.create_task(self._keep_lease()) if self.redis is not None else None
+        )
+        try:
+            knowledge_bases = await asyncio.to_thread(Knowledges.get_knowledge_bases)
+            self.status["knowledge_bases"] = len(knowledge_bases)
+            self.status["files"] = sum(
+                [
+                    len(
+                        await asyncio.to_thread(
+                            Knowledges.get_files_by_id, knowledge_base.id
+                        )
+                    )
+                    for knowledge_base in knowledge_bases
+                ]
+            )
+            await self._save_status()
+
+            log.info(
+                f"Starting reindexing for {len(knowledge_bases)} knowledge bases "
+                f"(job {self.id})"
+            )
+
+            async def reindex(knowledge_base: KnowledgeModel):
+                try:
+                    await self.reindex_knowledge_base(knowledge_base)
+                except Exception as e:
+                    # The checkpoint is kept so a later run resumes the rest
+                    log.error(
+                        f"Error processing knowledge base {knowledge_base.id}: {str(e)}"
+                    )
+                    self._failed = True
+
+            await asyncio.gather(
+                *[reindex(knowledge_base) for knowledge_base in knowledge_bases]
+            )
+
+            if self._failed:
+                self.status["status"] = "failed"
+                return
+
+            for knowledge_base in knowledge_bases:
+                await self._save_checkpoint(knowledge_base.id, None)
+
+            if self.status["failed_files"]:
+                log.warning(
+                    f"Failed to process {len(self.status['failed_files'])} files"
+                )
+                for failed in self.status["failed_files"]:
+                    log.warning(
+                        f"File ID: {failed['file_id']}, Error: {failed['error']}"
+                    )
+
+            self.status["status"] = "completed"
+            log.info(f"Reindexing completed.")
+        except Exception as e:
+            log.exception(e)
+            self.status["status"] = "failed"
+        finally:
+            self.status["completed_at"] = int(time.time())
+            if lease is not None:
+                lease.cancel()
+            await self._save_status()
+            await self._release()
+
+
+async def start_reindex_job(request: Request, user) -> bool:
+    """
+    Start reindexing in the background, or resume an interrupted job. Returns
+    False when a job is already running, on any replica when Redis is set up.
+    """
+    job = request.app.state.knowledge_reindex_job
+    if job is not None and job.status["status"] in ["pending", "running"]:
+        return False
+
+    job = KnowledgeReindexJob.resume_or_create(request, user)
+    if not await job.acquire():
+        return False
+
+    request.app.state.knowledge_reindex_job = job
+    request.app.state.knowledge_reindex_task = asyncio.create_task(job.run())
+    return True
+
+
+async def get_reindex_job_status(request: Request) -> Optional[dict]:
+    """The status of the last job, as published by whichever replica ran it."""
+    if request.app.state.redis is not None:
+        status = await request.app.state.redis.get(f"{REDIS_REINDEX_KEY}:status")
+        return json.loads(status) if status else None
+
+    job = request.app.state.knowledge_reindex_job
+    return job.status if job else None
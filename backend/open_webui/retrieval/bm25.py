@@ -0,0 +1,496 @@
+import hashlib
+import heapq
+import logging
+import math
+import os
+import pickle
+import threading
+from collections import Counter, OrderedDict
+from operator import itemgetter
+from typing import Optional
+
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.main import GetResult, VectorItem
+from open_webui.utils.redis import get_redis_client
+
+from open_webui.config import (
+    ENABLE_RAG_BM25_INDEX_CACHE,
+    RAG_BM25_INDEX_CACHE_SIZE,
+    RAG_BM25_INDEX_DIR,
+)
+from open_webui.env import SRC_LOG_LEVELS, REDIS_KEY_PREFIX
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def tokenize(text: str) -> list[str]:
+    # Same whitespace tokenization as langchain's BM25Retriever default
+    return text.split()
+
+
+def get_enriched_text(text: str, metadata: dict) -> str:
+    metadata_parts = [text]
+
+    # Add filename (repeat twice for extra weight in BM25 scoring)
+    if metadata.get("name"):
+        filename = metadata["name"]
+        filename_tokens = filename.replace("_", " ").replace("-", " ").replace(".", " ")
+        metadata_parts.append(
+            f"Filename: {filename} {filename_tokens} {filename_tokens}"
+        )
+
+    # Add title if available
+    if metadata.get("title"):
+        metadata_parts.append(f"Title: {metadata['title']}")
+
+    # Add document section headings if available (from markdown splitter)
+    if metadata.get("headings") and isinstance(metadata["headings"], list):
+        headings = " > ".join(str(h) for h in metadata["headings"])
+        metadata_parts.append(f"Section: {headings}")
+
+    # Add source URL/path if available
+    if metadata.get("source"):
+        metadata_parts.append(f"Source: {metadata['source']}")
+
+    # Add snippet for web search results
+    if metadata.get("snippet"):
+        metadata_parts.append(f"Snippet: {metadata['snippet']}")
+
+    return " ".join(metadata_parts)
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index that can be updated in place.
+
+    Scoring follows rank_bm25.BM25Okapi (used by langchain's BM25Retriever), so
+    results rank the same as rebuilding the retriever from the full collection.
+    """
+
+    def __init__(
+        self,
+        enriched: bool = False,
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+    ):
+        self.enriched = enriched
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+        self.version = 0
+
+        # id -> (indexed text, metadata)
+        self.documents: dict[str, tuple[str, dict]] = {}
+        self.doc_lengths: dict[str, int] = {}
+        # term -> {id: term frequency}
+        self.postings: dict[str, dict[str, int]] = {}
+        self.total_length = 0
+
+        self._idf: Optional[dict[str, float]] = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_result(cls, result: GetResult, enriched: bool = False) -> "BM25Index":
+        index = cls(enriched=enriched)
+        if result and result.ids:
+            index.add(
+                result.ids[0],
+                result.documents[0] if result.documents else [],
+                result.metadatas[0] if result.metadatas else [],
+            )
+        return index
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_idf"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def add(self, ids: list[str], texts: list[str], metadatas: list[dict]):
+        with self._lock:
+            for id, text, metadata in zip(ids, texts, metadatas):
+                if text is None:
+                    continue
+                if id in self.documents:
+                    self._remove(id)
+
+                metadata = metadata or {}
+                text = get_enriched_text(text, metadata) if self.enriched else text
+                tokens = tokenize(text)
+
+                self.documents[id] = (text, metadata)
+                self.doc_lengths[id] = len(tokens)
+                self.total_length += len(tokens)
+                for term, tf in Counter(tokens).items():
+                    self.postings.setdefault(term, {})[id] = tf
+
+            self._idf = None
+
+    def remove(
+        self, ids: Optional[list[str]] = None, filter: Optional[dict] = None
+    ) -> int:
+        with self._lock:
+            if ids:
+                targets = [id for id in ids if id in self.documents]
+            elif filter:
+                targets = [
+                    id
+                    for id, (_, metadata) in self.documents.items()
+                    if all(metadata.get(key) == value for key, value in filter.items())
+                ]
+            else:
+                return 0
+
+            for id in targets:
+                self._remove(id)
+            if targets:
+                self._idf = None
+            return len(targets)
+
+    def _remove(self, id: str):
+        text, _ = self.documents.pop(id)
+        self.total_length -= self.doc_lengths.pop(id)
+        for term in set(tokenize(text)):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def _get_idf(self) -> dict[str, float]:
+        if self._idf is None:
+            corpus_size = len(self.documents)
+            idf = {}
+            idf_sum = 0.0
+            negative_idfs = []
+            for term, postings in self.postings.items():
+                freq = len(postings)
+                value = math.log(corpus_size - freq + 0.5) - math.log(freq + 0.5)
+                idf[term] = value
+                idf_sum += value
+                if value < 0:
+                    negative_idfs.append(term)
+
+            eps = self.epsilon * idf_sum / len(idf) if idf else 0.0
+            for term in negative_idfs:
+                idf[term] = eps
+            self._idf = idf
+        return self._idf
+
+    def search(self, query: str, k: int) -> list[tuple[str, str, dict, float]]:
+        """Return the top k (id, text, metadata, score) matches for the query."""
+        with self._lock:
+            if not self.documents:
+                return []
+
+            idf = self._get_idf()
+            avgdl = self.total_length / len(self.documents) or 1.0
+
+            scores: dict[str, float] = {}
+            for term in tokenize(query):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                term_idf = idf[term]
+                for id, tf in postings.items():
+                    norm = self.k1 * (
+                        1 - self.b + self.b * self.doc_lengths[id] / avgdl
+                    )
+                    scores[id] = scores.get(id, 0.0) + term_idf * (
+                        tf * (self.k1 + 1) / (tf + norm)
+                    )
+
+            top = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+            return [
+                (id, self.documents[id][0], self.documents[id][1], score)
+                for id, score in top
+            ]
+
+
+class BM25IndexStore:
+    """
+    Keeps one BM25 index per vector collection, shared between workers.
+
+    Every collection carries a version counter, in Redis when available and
+    otherwise in a version file next to the index on disk, so workers of the
+    same host see each other's changes. Each mutation bumps the version and
+    writes the updated index to disk, so other workers reload it instead of
+    fetching the whole collection again. Indexes whose version does not match
+    are rebuilt from the vector DB.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 64,
+        enabled: bool = True,
+        redis=None,
+        redis_key_prefix: str = "open-webui",
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.enabled = enabled
+
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._indexes: OrderedDict[tuple[str, bool], BM25Index] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _version_key(self, collection_name: str) -> str:
+        return f"{self._redis_key_prefix}:bm25:{collection_name}:version"
+
+    def _version_path(self, collection_name: str) -> str:
+        digest = hashlib.sha256(collection_name.encode()).hexdigest()
+        return os.path.join(self.path, f"{digest}.version")
+
+    def _get_version(self, collection_name: str) -> int:
+        if self._redis:
+            version = self._redis.get(self._version_key(collection_name))
+            return int(version) if version else 0
+
+        try:
+            with open(self._version_path(collection_name), "rb") as f:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_SH)
+                return int(f.read().strip() or 0)
+        except FileNotFoundError:
+            return 0
+
+    def _bump_version(self, collection_name: str) -> int:
+        if self._redis:
+            return int(self._redis.incr(self._version_key(collection_name)))
+
+        os.makedirs(self.path, exist_ok=True)
+        return self._bump_version_file(self._version_path(collection_name))
+
+    def _bump_version_file(self, path: str) -> int:
+        with self._lock:
+            fd = os.open(path, os.O_RDWR | os.O_CREAT)
+            try:
+                # The lock is held across the read and the write, so workers
+                # of the same host never hand out the same version
+                if fcntl:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                version = int(os.read(fd, 32).strip() or 0) + 1
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, str(version).encode())
+                return version
+            finally:
+                os.close(fd)
+
+    def _file_path(self, collection_name: str, enriched: bool) -> str:
+        digest = hashlib.sha256(collection_name.encode()).hexdigest()
+        suffix = "-enriched" if enriched else ""
+        return os.path.join(self.path, f"{digest}{suffix}.pkl")
+
+    def _load(self, collection_name: str, enriched: bool) -> Optional[BM25Index]:
+        file_path = self._file_path(collection_name, enriched)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            log.warning(f"Failed to load BM25 index for {collection_name}: {e}")
+            return None
+
+    def _save(self, collection_name: str, index: BM25Index):
+        file_path = self._file_path(collection_name, index.enriched)
+        tmp_path = f"{file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            log.warning(f"Failed to save BM25 index for {collection_name}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _cache(self, collection_name: str, index: BM25Index):
+        with self._lock:
+            key = (collection_name, index.enriched)
+            self._indexes[key] = index
+            self._indexes.move_to_end(key)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+
+    def _lookup(
+        self, collection_name: str, enriched: bool, version: int
+    ) -> Optional[BM25Index]:
+        key = (collection_name, enriched)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and index.version == version:
+                self._indexes.move_to_end(key)
+                return index
+
+        index = self._load(collection_name, enriched)
+        if index is not None and index.version == version:
+            self._cache(collection_name, index)
+            return index
+        return None
+
+    def get(self, collection_name: str, enriched: bool = False) -> BM25Index:
+        """
+        Return the BM25 index of a collection, building it from the vector DB
+        when it is missing or stale.
+        """
+        if not self.enabled:
+            return BM25Index.from_result(
+                VECTOR_DB_CLIENT.get(collection_name=collection_name), enriched
+            )
+
+        try:
+            version = self._get_version(collection_name)
+            index = self._lookup(collection_name, enriched, version)
+            if index is not None:
+                return index
+        except Exception as e:
+            log.warning(f"BM25 index lookup failed for {collection_name}: {e}")
+            return BM25Index.from_result(
+                VECTOR_DB_CLIENT.get(collection_name=collection_name), enriched
+            )
+
+        log.debug(f"Building BM25 index for collection {collection_name}")
+        index = BM25Index.from_result(
+            VECTOR_DB_CLIENT.get(collection_name=collection_name), enriched
+        )
+        index.version = version
+
+        self._cache(collection_name, index)
+        self._save(collection_name, index)
+        return index
+
+    def _update(self, collection_name: str, apply):
+        if not self.enabled:
+            return
+
+        try:
+            version = self._get_version(collection_name)
+            indexes = [
+                index
+                for enriched in (False, True)
+                if (index := self._lookup(collection_name, enriched, version))
+                is not None
+            ]
+            new_version = self._bump_version(collection_name)
+
+            if new_version != version + 1:
+                # Another worker changed the collection concurrently, rebuild on next read
+                with self._lock:
+                    for index in indexes:
+                        self._indexes.pop((collection_name, index.enriched), None)
+                return
+
+            for index in indexes:
+                with index._lock:
+                    apply(index)
+                    index.version = new_version
+                self._save(collection_name, index)
+        except Exception as e:
+            log.exception(f"Failed to update BM25 index for {collection_name}: {e}")
+            self.invalidate(collection_name)
+
+    def add(self, collection_name: str, items: list[VectorItem]):
+        """Add inserted vector items to the index of a collection."""
+        self._update(
+            collection_name,
+            lambda index: index.add(
+                [item["id"] for item in items],
+                [item["text"] for item in items],
+                [item["metadata"] for item in items],
+            ),
+        )
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[list[str]] = None,
+        filter: Optional[dict] = None,
+    ):
+        """Remove deleted items, by ID or metadata filter, from the index of a collection."""
+        self._update(
+            collection_name, lambda index: index.remove(ids=ids, filter=filter)
+        )
+
+    def invalidate(self, collection_name: str):
+        """Drop the index of a collection, e.g. after the collection is deleted."""
+        if not self.enabled:
+            return
+
+        try:
+            self._bump_version(collection_name)
+        except Exception as e:
+            log.warning(f"Failed to bump BM25 index version for {collection_name}: {e}")
+
+        with self._lock:
+            for enriched in (False, True):
+                self._indexes.pop((collection_name, enriched), None)
+
+        for enriched in (False, True):
+            try:
+                os.remove(self._file_path(collection_name, enriched))
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.warning(f"Failed to remove BM25 index for {collection_name}: {e}")
+
+    def reset(self):
+        """Drop every index, used when the whole vector DB is reset."""
+        with self._lock:
+            self._indexes.clear()
+
+        if self._redis:
+            try:
+                for key in self._redis.scan_iter(
+                    match=f"{self._redis_key_prefix}:bm25:*"
+                ):
+                    self._redis.delete(key)
+            except Exception as e:
+                log.warning(f"Failed to reset BM25 index versions: {e}")
+
+        if os.path.isdir(self.path):
+            digests = set()
+            for filename in os.listdir(self.path):
+                digests.add(filename.split(".")[0].removesuffix("-enriched"))
+                if filename.endswith(".version"):
+                    continue
+                try:
+                    os.remove(os.path.join(self.path, filename))
+                except Exception as e:
+                    log.warning(f"Failed to remove BM25 index file {filename}: {e}")
+
+            # Version files are bumped rather than removed, so the copies other
+            # workers hold no longer match
+            for digest in digests:
+                try:
+                    self._bump_version_file(
+                        os.path.join(self.path, f"{digest}.version")
+                    )
+                except Exception as e:
+                    log.warning(f"Failed to bump BM25 index version {digest}: {e}")
+
+
+BM25_INDEXES = BM25IndexStore(
+    path=RAG_BM25_INDEX_DIR,
+    max_size=RAG_BM25_INDEX_CACHE_SIZE,
+    enabled=ENABLE_RAG_BM25_INDEX_CACHE,
+    redis=get_redis_client(),
+    redis_key_prefix=REDIS_KEY_PREFIX,
+)
@@ -0,0 +1,455 @@
+import asyncio
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from open_webui.utils.redis import get_redis_connection, get_sentinels_from_env
+
+from open_webui.config import (
+    ENABLE_RAG_EMBEDDING_CACHE,
+    ENABLE_RAG_EMBEDDING_CACHE_REDIS,
+    RAG_EMBEDDING_CACHE_DIR,
+    RAG_EMBEDDING_CACHE_MAX_SIZE,
+    RAG_EMBEDDING_CACHE_REDIS_TTL,
+    RAG_QUERY_EMBEDDING_CACHE_SIZE,
+    RAG_QUERY_EMBEDDING_CACHE_TTL,
+)
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    REDIS_CLUSTER,
+    REDIS_KEY_PREFIX,
+    REDIS_SENTINEL_HOSTS,
+    REDIS_SENTINEL_PORT,
+    REDIS_URL,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_embedding_cache_key(
+    engine: str, model: str, prefix: Optional[str], text: str
+) -> str:
+    content = "\x00".join([engine or "", model or "", prefix or "", text])
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def encode_vector(vector: list[float]) -> bytes:
+    return np.asarray(vector, dtype=np.float16).tobytes()
+
+
+def decode_vector(data: bytes) -> list[float]:
+    return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed store of chunk embeddings.
+
+    Vectors are kept as float16 in a local SQLite file, keyed by the sha256 of
+    (engine, model, prefix, text), so re-ingesting unchanged text never goes
+    back to the embedding backend. The least recently used entries are evicted
+    once the stored vectors exceed max_size bytes. When a Redis client is given
+    it is used as a shared layer in front of the local file, so workers on
+    other hosts can reuse each other's embeddings.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 1024 * 1024 * 1024,
+        enabled: bool = True,
+        redis=None,
+        redis_key_prefix: str = "open-webui",
+        redis_ttl: int = 7 * 24 * 60 * 60,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.enabled = enabled
+
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._redis_ttl = redis_ttl
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self._redis_key_prefix}:embedding:{key}"
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(self.path, "embeddings.db"),
+                timeout=30,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            # Several processes share the file, the schema and the size row
+            # are set up by whichever gets here first
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding (
+                    key TEXT PRIMARY KEY,
+                    vector BLOB NOT NULL,
+                    accessed_at INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS embedding_accessed_at_idx "
+                "ON embedding (accessed_at)"
+            )
+            # Total size of the stored vectors, kept by triggers so every
+            # process sees the rows the others stored
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_size (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    size INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS embedding_size_insert "
+                "AFTER INSERT ON embedding BEGIN "
+                "UPDATE embedding_size SET size = size + LENGTH(new.vector); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS embedding_size_delete "
+                "AFTER DELETE ON embedding BEGIN "
+                "UPDATE embedding_size SET size = size - LENGTH(old.vector); END"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO embedding_size (id, size) "
+                "SELECT 1, COALESCE(SUM(LENGTH(vector)), 0) FROM embedding"
+            )
+            conn.commit()
+
+            self._conn = conn
+        return self._conn
+
+    def _get_size(self, conn: sqlite3.Connection) -> int:
+        return conn.execute("SELECT size FROM embedding_size").fetchone()[0]
+
+    def _get_local(self, keys: list[str]) -> dict[str, bytes]:
+        found = {}
+        with self._lock:
+            conn = self._get_conn()
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embedding "
+                    f"WHERE key IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                found.update(rows)
+
+            if found:
+                now = int(time.time())
+                conn.executemany(
+                    "UPDATE embedding SET accessed_at = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+                conn.commit()
+        return found
+
+    def _set_local(self, entries: dict[str, bytes]):
+        now = int(time.time())
+        with self._lock:
+            conn = self._get_conn()
+            # Holds the write lock from the inserts to the eviction, so the
+            # size checked is the one of the whole file, not of this process
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO embedding (key, vector, accessed_at) "
+                    "VALUES (?, ?, ?)",
+                    [(key, data, now) for key, data in entries.items()],
+                )
+
+                size = self._get_size(conn)
+                if size > self.max_size:
+                    self._evict(conn, size)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def _evict(self, conn: sqlite3.Connection, size: int):
+        # Drop the least recently used vectors down to 90% of the budget so
+        # eviction doesn't run again on the very next insert
+        target = int(self.max_size * 0.9)
+        while size > target:
+            rows = conn.execute(
+                "SELECT key, LENGTH(vector) FROM embedding "
+                "ORDER BY accessed_at LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+
+            keys = []
+            for key, length in rows:
+                if size <= target:
+                    break
+                keys.append((key,))
+                size -= length
+            conn.executemany("DELETE FROM embedding WHERE key = ?", keys)
+            size = self._get_size(conn)
+        log.debug(f"Evicted embedding cache entries, size is now {size}")
+
+    def _get_redis(self, keys: list[str]) -> dict[str, bytes]:
+        if not self._redis or not keys:
+            return {}
+
+        try:
+            values = self._redis.mget([self._redis_key(key) for key in keys])
+        except Exception as e:
+            log.warning(f"Failed to read embeddings from Redis: {e}")
+            return {}
+
+        return {key: value for key, value in zip(keys, values) if value}
+
+    def _set_redis(self, entries: dict[str, bytes]):
+        if not self._redis or not entries:
+            return
+
+        try:
+            pipe = self._redis.pipeline()
+            for key, data in entries.items():
+                pipe.set(self._redis_key(key), data, ex=self._redis_ttl or None)
+            pipe.execute()
+        except Exception as e:
+            log.warning(f"Failed to write embeddings to Redis: {e}")
+
+    def get(self, keys: list[str]) -> dict[str, list[float]]:
+        """Return the cached vectors for the given keys, skipping misses."""
+        if not self.enabled or not keys:
+            return {}
+
+        keys = list(dict.fromkeys(keys))
+        try:
+            found = self._get_local(keys)
+        except Exception as e:
+            log.warning(f"Failed to read embedding cache: {e}")
+            found = {}
+
+        missing = [key for key in keys if key not in found]
+        remote = self._get_redis(missing)
+        if remote:
+            found.update(remote)
+            try:
+                self._set_local(remote)
+            except Exception as e:
+                log.warning(f"Failed to write embedding cache: {e}")
+
+        return {key: decode_vector(data) for key, data in found.items()}
+
+    def set(self, vectors: dict[str, list[float]]):
+        if not self.enabled or not vectors:
+            return
+
+        entries = {
+            key: encode_vector(vector)
+            for key, vector in vectors.items()
+            if vector is not None
+        }
+        try:
+            self._set_local(entries)
+        except Exception as e:
+            log.warning(f"Failed to write embedding cache: {e}")
+        self._set_redis(entries)
+
+    def wrap(self, embedding_function, engine: str, model: str):
+        """
+        Wrap an embedding function from get_embedding_function so that only
+        texts without a cached vector are sent to the embedding backend.
+        """
+        if not self.enabled:
+            return embedding_function
+
+        async def cached_embedding_function(query, prefix=None, user=None):
+            if not isinstance(query, list):
+                return await embedding_function(query, prefix=prefix, user=user)
+
+            keys = [get_embedding_cache_key(engine, model, prefix, q) for q in query]
+            # SQLite and Redis are synchronous, kept off the event loop
+            cached = await asyncio.to_thread(self.get, keys)
+
+            misses = {}
+            for key, text in zip(keys, query):
+                if key not in cached:
+                    misses.setdefault(key, text)
+
+            log.debug(
+                f"embedding cache: {len(query) - len(misses)} hits, {len(misses)} misses"
+            )
+
+            if misses:
+                embeddings = await embedding_function(
+                    list(misses.values()), prefix=prefix, user=user
+                )
+                if embeddings is None or len(embeddings) != len(misses):
+                    return embeddings
+
+                computed = dict(zip(misses.keys(), embeddings))
+                await asyncio.to_thread(self.set, computed)
+                cached.update(computed)
+
+            return [cached[key] for key in keys]
+
+        return cached_embedding_function
+
+
+class QueryEmbeddingCache:
+    """
+    In-memory LRU of recently embedded queries with a TTL.
+
+    A RAG turn embeds the same query several times (collection search,
+    reranking, memories) and follow-up or generated queries repeat across
+    users, so these are served from memory instead of the embedding backend.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: int = 60 * 60):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (expires_at, float32 vector)
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get(self, key: str) -> Optional[list[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1].tolist()
+
+    def set(self, key: str, vector: list[float]):
+        with self._lock:
+            self._entries[key] = (
+                time.monotonic() + self.ttl,
+                np.asarray(vector, dtype=np.float32),
+            )
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def wrap(self, embedding_function, engine: str, model: str):
+        """
+        Wrap an embedding function from get_embedding_function so that only
+        texts missing from the cache are sent to the embedding backend.
+        """
+        if not self.enabled:
+            return embedding_function
+
+        async def cached_embedding_function(query, prefix=None, user=None):
+            texts = query if isinstance(query, list) else [query]
+            keys = [get_embedding_cache_key(engine, model, prefix, t) for t in texts]
+
+            vectors = {}
+            misses = {}
+            for key, text in zip(keys, texts):
+                if key in vectors or key in misses:
+                    continue
+                vector = self.get(key)
+                if vector is None:
+                    misses[key] = text
+                else:
+                    vectors[key] = vector
+
+            if misses:
+                if isinstance(query, list):
+                    embeddings = await embedding_function(
+                        list(misses.values()), prefix=prefix, user=user
+                    )
+                else:
+                    embedding = await embedding_function(
+                        query, prefix=prefix, user=user
+                    )
+                    embeddings = [embedding] if embedding is not None else None
+
+                if embeddings is None or len(embeddings) != len(misses):
+                    return embeddings if isinstance(query, list) else None
+
+                for key, vector in zip(misses.keys(), embeddings):
+                    if vector is not None:
+                        self.set(key, vector)
+                    vectors[key] = vector
+
+            if isinstance(query, list):
+                return [vectors[key] for key in keys]
+            return vectors[keys[0]]
+
+        return cached_embedding_function
+
+
+def _get_redis():
+    if not (ENABLE_RAG_EMBEDDING_CACHE_REDIS and REDIS_URL):
+        return None
+
+    try:
+        # Vectors are stored as raw float16 bytes
+        return get_redis_connection(
+            redis_url=REDIS_URL,
+            redis_sentinels=get_sentinels_from_env(
+                REDIS_SENTINEL_HOSTS, REDIS_SENTINEL_PORT
+            ),
+            redis_cluster=REDIS_CLUSTER,
+            decode_responses=False,
+        )
+    except Exception as e:
+        log.warning(f"Failed to connect to Redis for the embedding cache: {e}")
+        return None
+
+
+EMBEDDING_CACHE = EmbeddingCache(
+    path=RAG_EMBEDDING_CACHE_DIR,
+    max_size=RAG_EMBEDDING_CACHE_MAX_SIZE,
+    enabled=ENABLE_RAG_EMBEDDING_CACHE,
+    redis=_get_redis(),
+    redis_key_prefix=REDIS_KEY_PREFIX,
+    redis_ttl=RAG_EMBEDDING_CACHE_REDIS_TTL,
+)
+
+QUERY_EMBEDDING_CACHE = QueryEmbeddingCache(
+    max_size=RAG_QUERY_EMBEDDING_CACHE_SIZE,
+    ttl=RAG_QUERY_EMBEDDING_CACHE_TTL,
+)
@@ -0,0 +1,190 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from open_webui.config import (
+    RAG_EMBEDDING_CONCURRENCY,
+    RAG_EMBEDDING_MAX_RETRIES,
+)
+from open_webui.env import SRC_LOG_LEVELS, AIOHTTP_CLIENT_TIMEOUT
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_retry_after(headers) -> Optional[float]:
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        # HTTP-date form
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except Exception:
+        return None
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit: grows by one request per window of successful
+    requests and halves when the endpoint throttles (429) or fails (5xx). A
+    Retry-After from the endpoint pauses every request until it has passed.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease: float = 0.5):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.decrease = decrease
+
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self.paused_until = 0.0
+
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            while True:
+                delay = self.paused_until - time.monotonic()
+                if delay > 0:
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+
+                await self._condition.wait()
+
+    async def release(
+        self, throttled: bool = False, retry_after: Optional[float] = None
+    ):
+        async with self._condition:
+            self.in_flight -= 1
+
+            if throttled:
+                self.limit = max(self.limit * self.decrease, float(self.min_limit))
+                if retry_after:
+                    self.paused_until = max(
+                        self.paused_until, time.monotonic() + retry_after
+                    )
+                log.debug(f"Embedding endpoint throttled, limit is now {self.limit}")
+            else:
+                self.limit = min(self.limit + 1 / self.limit, float(self.max_limit))
+
+            self._condition.notify_all()
+
+
+class EmbeddingEndpoint:
+    def __init__(self, max_concurrency: int):
+        self.session = aiohttp.ClientSession(
+            trust_env=True,
+            connector=aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=AIOHTTP_CLIENT_TIMEOUT),
+        )
+        self.limiter = AdaptiveConcurrencyLimiter(max_concurrency)
+
+
+class EmbeddingClient:
+    """
+    Pooled HTTP client for the embedding engines.
+
+    Requests run on a dedicated event loop thread that owns one keep-alive
+    session and concurrency limiter per endpoint, so they are shared by
+    callers on any event loop, including the short-lived ones from
+    asyncio.run(). Throttled (429) and failed (5xx, connection error)
+    requests are retried with backoff, honouring Retry-After.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_retries: int = 5):
+        self.max_concurrency = max(max_concurrency, 1)
+        self.max_retries = max(max_retries, 0)
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._endpoints: dict[str, EmbeddingEndpoint] = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="embedding-client", daemon=True
+                ).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_endpoint(self, url: str) -> EmbeddingEndpoint:
+        # Only called on the client loop
+        parsed = urlparse(url)
+        key = f"{parsed.scheme}://{parsed.netloc}"
+        if key not in self._endpoints:
+            self._endpoints[key] = EmbeddingEndpoint(self.max_concurrency)
+        return self._endpoints[key]
+
+    async def _post(self, url: str, headers: dict, json: dict) -> dict:
+        endpoint = self._get_endpoint(url)
+
+        for attempt in range(self.max_retries + 1):
+            await endpoint.limiter.acquire()
+
+            retry_after = None
+            try:
+                async with endpoint.session.post(url, headers=headers, json=json) as r:
+                    if r.status == 429 or r.status >= 500:
+                        retry_after = get_retry_after(r.headers)
+                        error = aiohttp.ClientResponseError(
+                            r.request_info,
+                            r.history,
+                            status=r.status,
+                            message=r.reason or "",
+                            headers=r.headers,
+                        )
+                    else:
+                        r.raise_for_status()
+                        data = await r.json()
+                        await endpoint.limiter.release()
+                        return data
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+            except BaseException:
+                await endpoint.limiter.release()
+                raise
+
+            await endpoint.limiter.release(throttled=True, retry_after=retry_after)
+            if attempt == self.max_retries:
+                raise error
+
+            delay = retry_after or min(2**attempt, 30) * (0.5 + random.random())
+            log.warning(
+                f"Embedding request to {url} failed ({error}), retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def post(self, url: str, headers: dict, json: dict) -> dict:
+        """POST a JSON payload to an embedding endpoint and return the JSON reply."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._post(url, headers, json), self._get_loop()
+        )
+        return await asyncio.wrap_future(future)
+
+
+EMBEDDING_CLIENT = EmbeddingClient(
+    max_concurrency=RAG_EMBEDDING_CONCURRENCY,
+    max_retries=RAG_EMBEDDING_MAX_RETRIES,
+)
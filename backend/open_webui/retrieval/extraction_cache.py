@@ -0,0 +1,197 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from open_webui.config import (
+    ENABLE_RAG_EXTRACTION_CACHE,
+    RAG_EXTRACTION_CACHE_DIR,
+    RAG_EXTRACTION_CACHE_MAX_AGE,
+    RAG_EXTRACTION_CACHE_MAX_SIZE,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+def get_file_sha256(file_path: str) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+def get_extraction_cache_key(file_hash: str, fingerprint: dict) -> str:
+    content = "\x00".join(
+        [file_hash, json.dumps(fingerprint, sort_keys=True, default=str)]
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def encode_documents(docs: list[Document]) -> bytes:
+    data = [
+        {"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs
+    ]
+    return zlib.compress(json.dumps(data, default=str).encode("utf-8"))
+
+
+def decode_documents(data: bytes) -> list[Document]:
+    return [
+        Document(page_content=doc["page_content"], metadata=doc["metadata"])
+        for doc in json.loads(zlib.decompress(data).decode("utf-8"))
+    ]
+
+
+class ExtractionCache:
+    """
+    Store of extracted documents, keyed by the sha256 of the file and a
+    fingerprint of the loader and its settings, so re-uploads of the same
+    file and reindexing skip OCR and the remote extraction engines.
+
+    Documents are kept zlib-compressed in a local SQLite file. The least
+    recently used entries are evicted once they exceed max_size bytes, and
+    entries unused for max_age seconds are dropped.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_size: int = 1024 * 1024 * 1024,
+        max_age: int = 90 * 24 * 60 * 60,
+        enabled: bool = True,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self.enabled = enabled
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.path, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(self.path, "extraction.db"),
+                timeout=30,
+                check_same_thread=False,
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS extraction (
+                    key TEXT PRIMARY KEY,
+                    documents BLOB NOT NULL,
+                    accessed_at INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS extraction_accessed_at_idx "
+                "ON extraction (accessed_at)"
+            )
+            conn.commit()
+
+            self._conn = conn
+            self._size = conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(documents)), 0) FROM extraction"
+            ).fetchone()[0]
+        return self._conn
+
+    def _evict(self, conn: sqlite3.Connection):
+        if self.max_age:
+            expired_at = int(time.time()) - self.max_age
+            self._size -= conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(documents)), 0) FROM extraction "
+                "WHERE accessed_at < ?",
+                (expired_at,),
+            ).fetchone()[0]
+            conn.execute("DELETE FROM extraction WHERE accessed_at < ?", (expired_at,))
+
+        # Drop the least recently used entries down to 90% of the budget so
+        # eviction doesn't run again on the very next insert
+        target = int(self.max_size * 0.9)
+        while self._size > target:
+            rows = conn.execute(
+                "SELECT key, LENGTH(documents) FROM extraction "
+                "ORDER BY accessed_at LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._size = 0
+                break
+
+            conn.executemany(
+                "DELETE FROM extraction WHERE key = ?", [(key,) for key, _ in rows]
+            )
+            self._size -= sum(size for _, size in rows)
+        conn.commit()
+
+    def get(self, key: str) -> Optional[list[Document]]:
+        if not self.enabled:
+            return None
+
+        try:
+            with self._lock:
+                conn = self._get_conn()
+                row = conn.execute(
+                    "SELECT documents, accessed_at FROM extraction WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                data, accessed_at = row
+                now = int(time.time())
+                if self.max_age and accessed_at < now - self.max_age:
+                    return None
+
+                conn.execute(
+                    "UPDATE extraction SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                conn.commit()
+            return decode_documents(data)
+        except Exception as e:
+            log.warning(f"Failed to read extraction cache: {e}")
+            return None
+
+    def set(self, key: str, docs: list[Document]):
+        if not self.enabled:
+            return
+
+        try:
+            data = encode_documents(docs)
+            with self._lock:
+                conn = self._get_conn()
+                previous = conn.execute(
+                    "SELECT LENGTH(documents) FROM extraction WHERE key = ?", (key,)
+                ).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO extraction (key, documents, accessed_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, data, int(time.time())),
+                )
+                self._size += len(data) - (previous[0] if previous else 0)
+                conn.commit()
+
+                self._evict(conn)
+        except Exception as e:
+            log.warning(f"Failed to write extraction cache: {e}")
+
+
+EXTRACTION_CACHE = ExtractionCache(
+    RAG_EXTRACTION_CACHE_DIR,
+    max_size=RAG_EXTRACTION_CACHE_MAX_SIZE,
+    max_age=RAG_EXTRACTION_CACHE_MAX_AGE,
+    enabled=ENABLE_RAG_EXTRACTION_CACHE,
+)
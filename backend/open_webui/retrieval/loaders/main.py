@@ -3,6 +3,7 @@ import logging
 import ftfy
 import sys
 import json
+from typing import Iterator
 
 from azure.identity import DefaultAzureCredential
 from langchain_community.document_loaders import (
@@ -28,8 +29,15 @@ from open_webui.retrieval.loaders.external_document import ExternalDocumentLoade
 from open_webui.retrieval.loaders.mistral import MistralLoader
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
 from open_webui.retrieval.loaders.mineru import MinerULoader
+from open_webui.retrieval.loaders.pdf import ParallelPDFLoader
+from open_webui.retrieval.extraction_cache import (
+    EXTRACTION_CACHE,
+    get_extraction_cache_key,
+    get_file_sha256,
+)
 
 
+from open_webui.config import PDF_EXTRACT_WORKERS
 from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
@@ -184,6 +192,18 @@ class DoclingLoader:
             raise Exception(f"Error calling Docling: {error_msg}")
 
 
+# Loader settings of each content extraction engine
+ENGINE_CONFIG_PREFIXES = {
+    "external": "EXTERNAL_DOCUMENT_LOADER_",
+    "tika": "TIKA_",
+    "datalab_marker": "DATALAB_MARKER_",
+    "docling": "DOCLING_",
+    "document_intelligence": "DOCUMENT_INTELLIGENCE_",
+    "mineru": "MINERU_",
+    "mistral_ocr": "MISTRAL_OCR_",
+}
+
+
 class Loader:
     def __init__(self, engine: str = "", **kwargs):
         self.engine = engine
@@ -193,15 +213,55 @@ class Loader:
     def load(
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
+        return list(self.lazy_load(filename, file_content_type, file_path))
+
+    def lazy_load(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> Iterator[Document]:
+        """Like load, but yields the documents as the loader produces them."""
         loader = self._get_loader(filename, file_content_type, file_path)
-        docs = loader.load()
 
-        return [
-            Document(
-                page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
+        # Plain text is read back as fast as from the cache
+        cache_key = None
+        if EXTRACTION_CACHE.enabled and not isinstance(loader, TextLoader):
+            cache_key = get_extraction_cache_key(
+                get_file_sha256(file_path), self._get_fingerprint(loader)
             )
-            for doc in docs
-        ]
+            docs = EXTRACTION_CACHE.get(cache_key)
+            if docs is not None:
+                log.info(f"Using cached extraction for {filename}")
+                yield from docs
+                return
+
+        fixes_text = getattr(loader, "fixes_text", False)
+        docs = []
+        for doc in (
+            loader.lazy_load() if hasattr(loader, "lazy_load") else loader.load()
+        ):
+            if not fixes_text:
+                doc = Document(
+                    page_content=ftfy.fix_text(doc.page_content),
+                    metadata=doc.metadata,
+                )
+            docs.append(doc)
+            yield doc
+
+        if cache_key:
+            EXTRACTION_CACHE.set(cache_key, docs)
+
+    def _get_fingerprint(self, loader) -> dict:
+        # The loader used and the settings that change its output, API keys are
+        # left out as rotating one doesn't change what gets extracted
+        prefix = ENGINE_CONFIG_PREFIXES.get(self.engine)
+        return {
+            "loader": type(loader).__name__,
+            "config": {
+                key: value
+                for key, value in self.kwargs.items()
+                if (key == "PDF_EXTRACT_IMAGES" or (prefix and key.startswith(prefix)))
+                and not key.endswith("_KEY")
+            },
+        }
 
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
@@ -353,7 +413,13 @@ class Loader:
                 file_path=file_path,
             )
         else:
-            if file_ext == "pdf":
+            if file_ext == "pdf" and PDF_EXTRACT_WORKERS > 0:
+                loader = ParallelPDFLoader(
+                    file_path,
+                    extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES", False),
+                    max_workers=PDF_EXTRACT_WORKERS,
+                )
+            elif file_ext == "pdf":
                 loader = PyPDFLoader(
                     file_path, extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES")
                 )
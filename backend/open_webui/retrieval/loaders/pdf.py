@@ -0,0 +1,140 @@
+import logging
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+import ftfy
+from langchain_core.documents import Document
+from pypdf import PdfReader
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+# Totals of the parallel extractions run by this process, exported as metrics
+PDF_EXTRACTION_STATS = {"files": 0, "pages": 0, "seconds": 0.0}
+_stats_lock = threading.Lock()
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_executor(max_workers: int) -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned rather than forked, the server process runs threads
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def extract_pages(
+    file_path: str, start: int, end: int, extract_images: bool = False
+) -> list[tuple[str, dict]]:
+    """Extract the text of pages [start, end) of a PDF, runs in the pool."""
+    reader = PdfReader(file_path)
+    labels = reader.page_labels
+
+    ocr = None
+    pages = []
+    for idx in range(start, end):
+        page = reader.pages[idx]
+        text = page.extract_text() or ""
+
+        if extract_images:
+            try:
+                images = page.images
+            except Exception as e:
+                log.warning(f"Failed to read the images of page {idx}: {e}")
+                images = []
+
+            for image in images:
+                if ocr is None:
+                    from rapidocr_onnxruntime import RapidOCR
+
+                    ocr = RapidOCR()
+
+                result, _ = ocr(image.data)
+                if result:
+                    text += "\n" + "\n".join(line[1] for line in result)
+
+        pages.append(
+            (
+                ftfy.fix_text(text),
+                {
+                    "page": idx,
+                    "page_label": labels[idx] if idx < len(labels) else str(idx + 1),
+                },
+            )
+        )
+    return pages
+
+
+class ParallelPDFLoader:
+    """
+    PDF loader that splits the page range across a shared process pool, for
+    text extraction and the optional OCR of page images. Pages are yielded in
+    order as soon as they are extracted, so they can be split and embedded
+    while the rest of the document is still being read.
+    """
+
+    # Pages come out of the pool already passed through ftfy
+    fixes_text = True
+
+    def __init__(
+        self, file_path: str, extract_images: bool = False, max_workers: int = 4
+    ):
+        self.file_path = file_path
+        self.extract_images = extract_images
+        self.max_workers = max(max_workers, 1)
+
+    def lazy_load(self) -> Iterator[Document]:
+        start_time = time.monotonic()
+
+        total_pages = len(PdfReader(self.file_path).pages)
+        metadata = {"source": self.file_path, "total_pages": total_pages}
+
+        # Small ranges keep every worker busy and bring the first pages back early
+        size = max(1, min(16, math.ceil(total_pages / (self.max_workers * 4))))
+        executor = get_pdf_executor(self.max_workers)
+        futures = [
+            executor.submit(
+                extract_pages,
+                self.file_path,
+                start,
+                min(start + size, total_pages),
+                self.extract_images,
+            )
+            for start in range(0, total_pages, size)
+        ]
+
+        try:
+            for future in futures:
+                for text, page_metadata in future.result():
+                    yield Document(
+                        page_content=text, metadata={**metadata, **page_metadata}
+                    )
+        finally:
+            for future in futures:
+                future.cancel()
+
+        elapsed = time.monotonic() - start_time
+        with _stats_lock:
+            PDF_EXTRACTION_STATS["files"] += 1
+            PDF_EXTRACTION_STATS["pages"] += total_pages
+            PDF_EXTRACTION_STATS["seconds"] += elapsed
+        log.info(
+            f"Extracted {total_pages} pages from {self.file_path} in {elapsed:.1f}s "
+            f"({total_pages / max(elapsed, 1e-6):.1f} pages/s)"
+        )
+
+    def load(self) -> list[Document]:
+        return list(self.lazy_load())
@@ -3,6 +3,9 @@ from typing import Optional, List, Tuple
 
 
 class BaseReranker(ABC):
+    # True when scores are relative to the documents passed in together
+    listwise: bool = False
+
     @abstractmethod
     def predict(self, sentences: List[Tuple[str, str]]) -> Optional[List[float]]:
         pass
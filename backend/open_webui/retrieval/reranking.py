@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional
+
+from open_webui.config import RAG_RERANKING_SCORE_CACHE_SIZE
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class RerankScoreCache:
+    """LRU of reranker scores keyed by (reranker model, query, chunk text)."""
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self._scores: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(model: str, query: str, text: str) -> str:
+        query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{query_hash}:{text_hash}"
+
+    def get(self, key: str) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def set(self, key: str, score: float):
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.max_size:
+                self._scores.popitem(last=False)
+
+
+RERANK_SCORE_CACHE = RerankScoreCache(max_size=RAG_RERANKING_SCORE_CACHE_SIZE)
+
+
+class _PendingBatch:
+    def __init__(self):
+        # (query, texts, user, future)
+        self.requests: list[tuple[str, list[str], object, asyncio.Future]] = []
+        self.task: Optional[asyncio.Task] = None
+
+
+class BatchedReranker:
+    """
+    Reranking function returned by get_reranking_function.
+
+    Scores are cached per (model, query, chunk), so a chunk is only scored once
+    for a query across collections, turns and regenerations. The pairs that
+    still need scoring are queued, and every request that arrives while the
+    model is busy is merged into the next model call, so the concurrent
+    collection searches of a turn share one padded batch instead of running
+    the model once per collection.
+
+    Rerankers flagged as listwise (ColBERT normalizes its scores over the
+    documents passed together) are neither cached nor merged.
+    """
+
+    def __init__(
+        self,
+        engine: str,
+        model: str,
+        reranker,
+        cache: Optional[RerankScoreCache] = None,
+    ):
+        self.engine = engine
+        self.model = model
+        self.reranker = reranker
+        self.cache = cache if cache is not None else RERANK_SCORE_CACHE
+
+        self.listwise = getattr(reranker, "listwise", False)
+        self._pending: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _predict(self, query: str, texts: list[str], user=None):
+        pairs = [(query, text) for text in texts]
+        if self.engine == "external":
+            scores = self.reranker.predict(pairs, user=user)
+        else:
+            scores = self.reranker.predict(pairs)
+
+        if scores is None:
+            return None
+        return scores.tolist() if not isinstance(scores, list) else scores
+
+    def _predict_batch(self, requests: list[tuple[str, list[str], object]]):
+        if self.engine == "external":
+            # The rerank API takes a single query, send one call per query
+            groups: dict[tuple, list[int]] = {}
+            for idx, (query, _, user) in enumerate(requests):
+                groups.setdefault((query, id(user)), []).append(idx)
+
+            results = [None] * len(requests)
+            for indexes in groups.values():
+                query, _, user = requests[indexes[0]]
+                texts = list(
+                    dict.fromkeys(text for idx in indexes for text in requests[idx][1])
+                )
+                scores = self._predict(query, texts, user=user)
+                scores = dict(zip(texts, scores)) if scores is not None else None
+                for idx in indexes:
+                    results[idx] = scores
+            return results
+
+        # Local cross-encoders score (query, text) pairs independently, so all
+        # the pairs go through the model as a single batch
+        pairs = list(
+            dict.fromkeys(
+                (query, text) for query, texts, _ in requests for text in texts
+            )
+        )
+        scores = self.reranker.predict(pairs)
+        if scores is None:
+            return [None] * len(requests)
+        scores = scores.tolist() if not isinstance(scores, list) else scores
+        scores = dict(zip(pairs, scores))
+
+        return [
+            {text: scores[(query, text)] for text in texts}
+            for query, texts, _ in requests
+        ]
+
+    async def _drain(self, pending: _PendingBatch):
+        # Let the other tasks of the turn queue their pairs first
+        await asyncio.sleep(0)
+
+        while pending.requests:
+            requests, pending.requests = pending.requests, []
+            log.debug(
+                f"BatchedReranker: scoring {sum(len(r[1]) for r in requests)} pairs "
+                f"for {len(requests)} requests"
+            )
+
+            try:
+                results = await asyncio.to_thread(
+                    self._predict_batch,
+                    [(query, texts, user) for query, texts, user, _ in requests],
+                )
+                for (_, _, _, future), result in zip(requests, results):
+                    if not future.done():
+                        future.set_result(result)
+            except Exception as e:
+                for _, _, _, future in requests:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _enqueue(self, query: str, texts: list[str], user=None) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(loop)
+        if pending is None:
+            pending = self._pending[loop] = _PendingBatch()
+
+        future = loop.create_future()
+        pending.requests.append((query, texts, user, future))
+        if pending.task is None or pending.task.done():
+            pending.task = loop.create_task(self._drain(pending))
+        return future
+
+    async def __call__(self, query: str, documents, user=None) -> Optional[list[float]]:
+        texts = [doc.page_content for doc in documents]
+
+        if self.listwise:
+            return await asyncio.to_thread(self._predict, query, texts, user)
+
+        keys = [RerankScoreCache.get_key(self.model, query, text) for text in texts]
+        scores = [self.cache.get(key) for key in keys]
+
+        missing = list(
+            dict.fromkeys(text for text, score in zip(texts, scores) if score is None)
+        )
+        if missing:
+            result = await self._enqueue(query, missing, user=user)
+            if result is None:
+                return None
+
+            for idx, (key, text) in enumerate(zip(keys, texts)):
+                if scores[idx] is None:
+                    scores[idx] = float(result[text])
+                    self.cache.set(key, scores[idx])
+
+        return scores
@@ -3,17 +3,17 @@ import os
 from typing import Awaitable, Optional, Union
 
 import requests
-import aiohttp
 import asyncio
+import numpy as np
 import hashlib
+import inspect
 from concurrent.futures import ThreadPoolExecutor
 import time
 import re
 
 from urllib.parse import quote
 from huggingface_hub import snapshot_download
-from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
+from langchain.retrievers import EnsembleRetriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
@@ -27,7 +27,11 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.chats import Chats
 from open_webui.models.notes import Notes
 
-from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.vector.main import GetResult, SearchResult
+from open_webui.retrieval.bm25 import BM25_INDEXES, BM25Index, get_enriched_text
+from open_webui.retrieval.embedding_cache import QUERY_EMBEDDING_CACHE
+from open_webui.retrieval.embedding_client import EMBEDDING_CLIENT
+from open_webui.retrieval.reranking import BatchedReranker
 from open_webui.utils.access_control import has_access
 from open_webui.utils.headers import include_user_info_headers
 from open_webui.utils.misc import get_message_list
@@ -45,11 +49,19 @@ from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_PREFIX_FIELD_NAME,
+    RAG_QUERY_CONCURRENCY,
+    RAG_ITEM_CONCURRENCY,
+    ENABLE_RAG_HYBRID_SEARCH_NATIVE,
 )
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
+# Shared by all requests so concurrent RAG turns can't pile up threads
+QUERY_EXECUTOR = ThreadPoolExecutor(
+    max_workers=max(RAG_QUERY_CONCURRENCY, 1), thread_name_prefix="rag-query"
+)
+
 
 from typing import Any
 
@@ -125,6 +137,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=ids[idx],
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -132,6 +145,20 @@ class VectorSearchRetriever(BaseRetriever):
         return results
 
 
+class BM25IndexRetriever(BaseRetriever):
+    index: Any
+    k: int
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> list[Document]:
+        return [
+            # Copy the metadata, the compressor writes scores into it
+            Document(id=id, page_content=text, metadata={**metadata})
+            for id, text, metadata, _ in self.index.search(query, self.k)
+        ]
+
+
 def query_doc(
     collection_name: str, query_embedding: list[float], k: int, user: UserModel = None
 ):
@@ -152,6 +179,43 @@ def query_doc(
         raise e
 
 
+def query_docs(
+    collection_name: str,
+    query_embeddings: list[list[float]],
+    k: int,
+    user: UserModel = None,
+):
+    try:
+        log.debug(f"query_docs:doc {collection_name} ({len(query_embeddings)} queries)")
+        result = VECTOR_DB_CLIENT.search(
+            collection_name=collection_name,
+            vectors=query_embeddings,
+            limit=k,
+        )
+
+        if result:
+            log.info(f"query_docs:result {result.ids} {result.metadatas}")
+
+        return result
+    except Exception as e:
+        log.exception(f"Error querying doc {collection_name} with limit {k}: {e}")
+        raise e
+
+
+def split_search_result(result: SearchResult) -> list[dict]:
+    # One result dict per query vector, as merge_and_sort_query_results expects
+    result = result.model_dump()
+    return [
+        {
+            "ids": [result["ids"][idx]],
+            "distances": [result["distances"][idx]],
+            "documents": [result["documents"][idx]],
+            "metadatas": [result["metadatas"][idx]],
+        }
+        for idx in range(len(result.get("distances") or []))
+    ]
+
+
 def get_doc(collection_name: str, user: UserModel = None):
     try:
         log.debug(f"get_doc:doc {collection_name}")
@@ -167,46 +231,58 @@ def get_doc(collection_name: str, user: UserModel = None):
 
 
 def get_enriched_texts(collection_result: GetResult) -> list[str]:
-    enriched_texts = []
-    for idx, text in enumerate(collection_result.documents[0]):
-        metadata = collection_result.metadatas[0][idx]
-        metadata_parts = [text]
-
-        # Add filename (repeat twice for extra weight in BM25 scoring)
-        if metadata.get("name"):
-            filename = metadata["name"]
-            filename_tokens = (
-                filename.replace("_", " ").replace("-", " ").replace(".", " ")
-            )
-            metadata_parts.append(
-                f"Filename: {filename} {filename_tokens} {filename_tokens}"
-            )
-
-        # Add title if available
-        if metadata.get("title"):
-            metadata_parts.append(f"Title: {metadata['title']}")
+    return [
+        get_enriched_text(text, collection_result.metadatas[0][idx])
+        for idx, text in enumerate(collection_result.documents[0])
+    ]
 
-        # Add document section headings if available (from markdown splitter)
-        if metadata.get("headings") and isinstance(metadata["headings"], list):
-            headings = " > ".join(str(h) for h in metadata["headings"])
-            metadata_parts.append(f"Section: {headings}")
 
-        # Add source URL/path if available
-        if metadata.get("source"):
-            metadata_parts.append(f"Source: {metadata['source']}")
+async def native_hybrid_search(
+    collection_name: str,
+    query: str,
+    embedding_function,
+    k: int,
+    hybrid_bm25_weight: float,
+) -> Optional[list[Document]]:
+    """
+    Hybrid search run by the vector database itself, so the collection never
+    has to be loaded for BM25. Returns None when the backend can't serve it
+    and the in-process BM25 index has to be used instead.
+    """
+    embedding = await embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+    alpha = min(max(1.0 - hybrid_bm25_weight, 0.0), 1.0)
 
-        # Add snippet for web search results
-        if metadata.get("snippet"):
-            metadata_parts.append(f"Snippet: {metadata['snippet']}")
+    try:
+        result = await asyncio.get_running_loop().run_in_executor(
+            QUERY_EXECUTOR,
+            lambda: VECTOR_DB_CLIENT.hybrid_search(
+                collection_name=collection_name,
+                query_text=query,
+                vectors=[embedding],
+                limit=k,
+                alpha=alpha,
+            ),
+        )
+    except Exception as e:
+        log.warning(f"Native hybrid search failed for {collection_name}: {e}")
+        return None
 
-        enriched_texts.append(" ".join(metadata_parts))
+    if result is None:
+        return None
 
-    return enriched_texts
+    log.debug(f"native_hybrid_search:doc {collection_name}")
+    return [
+        # Copy the metadata, the compressor writes scores into it
+        Document(id=id, page_content=text, metadata={**(metadata or {})})
+        for id, text, metadata in zip(
+            result.ids[0], result.documents[0], result.metadatas[0]
+        )
+    ]
 
 
 async def query_doc_with_hybrid_search(
     collection_name: str,
-    collection_result: GetResult,
+    collection_result: Optional[GetResult],
     query: str,
     embedding_function,
     k: int,
@@ -215,73 +291,96 @@ async def query_doc_with_hybrid_search(
     r: float,
     hybrid_bm25_weight: float,
     enable_enriched_texts: bool = False,
+    bm25_index: Optional[BM25Index] = None,
 ) -> dict:
     try:
-        # First check if collection_result has the required attributes
+        documents = None
         if (
-            not collection_result
-            or not hasattr(collection_result, "documents")
-            or not hasattr(collection_result, "metadatas")
+            ENABLE_RAG_HYBRID_SEARCH_NATIVE
+            and VECTOR_DB_CLIENT.supports_hybrid_search
+            and not enable_enriched_texts
         ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+            documents = await native_hybrid_search(
+                collection_name, query, embedding_function, k, hybrid_bm25_weight
+            )
 
-        # Now safely check the documents content after confirming attributes exist
-        if (
-            not collection_result.documents
-            or len(collection_result.documents) == 0
-            or not collection_result.documents[0]
-        ):
-            log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
-            return {"documents": [], "metadatas": [], "distances": []}
+        if documents is None:
+            if bm25_index is None and collection_result is None:
+                bm25_index = BM25_INDEXES.get(
+                    collection_name, enriched=enable_enriched_texts
+                )
 
-        log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+            if bm25_index is None:
+                # First check if collection_result has the required attributes
+                if (
+                    not collection_result
+                    or not hasattr(collection_result, "documents")
+                    or not hasattr(collection_result, "metadatas")
+                ):
+                    log.warning(
+                        f"query_doc_with_hybrid_search:no_docs {collection_name}"
+                    )
+                    return {"documents": [], "metadatas": [], "distances": []}
 
-        bm25_texts = (
-            get_enriched_texts(collection_result)
-            if enable_enriched_texts
-            else collection_result.documents[0]
-        )
+                # Now safely check the documents content after confirming attributes exist
+                if (
+                    not collection_result.documents
+                    or len(collection_result.documents) == 0
+                    or not collection_result.documents[0]
+                ):
+                    log.warning(
+                        f"query_doc_with_hybrid_search:no_docs {collection_name}"
+                    )
+                    return {"documents": [], "metadatas": [], "distances": []}
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=bm25_texts,
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+                bm25_index = BM25Index.from_result(
+                    collection_result, enable_enriched_texts
+                )
 
-        vector_search_retriever = VectorSearchRetriever(
-            collection_name=collection_name,
-            embedding_function=embedding_function,
-            top_k=k,
-        )
+            if len(bm25_index) == 0:
+                log.warning(f"query_doc_with_hybrid_search:no_docs {collection_name}")
+                return {"documents": [], "metadatas": [], "distances": []}
 
-        if hybrid_bm25_weight <= 0:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[vector_search_retriever], weights=[1.0]
-            )
-        elif hybrid_bm25_weight >= 1:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever], weights=[1.0]
-            )
-        else:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever, vector_search_retriever],
-                weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
+            log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
+
+            bm25_retriever = BM25IndexRetriever(index=bm25_index, k=k)
+
+            vector_search_retriever = VectorSearchRetriever(
+                collection_name=collection_name,
+                embedding_function=embedding_function,
+                top_k=k,
             )
 
+            if hybrid_bm25_weight <= 0:
+                ensemble_retriever = EnsembleRetriever(
+                    retrievers=[vector_search_retriever], weights=[1.0]
+                )
+            elif hybrid_bm25_weight >= 1:
+                ensemble_retriever = EnsembleRetriever(
+                    retrievers=[bm25_retriever], weights=[1.0]
+                )
+            else:
+                ensemble_retriever = EnsembleRetriever(
+                    retrievers=[bm25_retriever, vector_search_retriever],
+                    weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
+                )
+
+            documents = await ensemble_retriever.ainvoke(query)
+
         compressor = RerankCompressor(
             embedding_function=embedding_function,
             top_n=k_reranker,
             reranking_function=reranking_function,
             r_score=r,
+            collection_name=collection_name,
         )
 
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor, base_retriever=ensemble_retriever
+        result = (
+            list(await compressor.acompress_documents(documents, query))
+            if documents
+            else []
         )
 
-        result = await compression_retriever.ainvoke(query)
-
         distances = [d.metadata.get("score") for d in result]
         documents = [d.page_content for d in result]
         metadatas = [d.metadata for d in result]
@@ -408,20 +507,21 @@ async def query_collection(
     results = []
     error = False
 
-    def process_query_collection(collection_name, query_embedding):
+    def process_query_collection(collection_name, query_embeddings):
         try:
             if collection_name:
-                result = query_doc(
+                # A single search carries every query for the collection
+                result = query_docs(
                     collection_name=collection_name,
                     k=k,
-                    query_embedding=query_embedding,
+                    query_embeddings=query_embeddings,
                 )
                 if result is not None:
-                    return result.model_dump(), None
-            return None, None
+                    return split_search_result(result), None
+            return [], None
         except Exception as e:
             log.exception(f"Error when querying the collection: {e}")
-            return None, e
+            return [], e
 
     # Generate all query embeddings (in one call)
     query_embeddings = await embedding_function(
@@ -431,21 +531,24 @@ async def query_collection(
         f"query_collection: processing {len(queries)} queries across {len(collection_names)} collections"
     )
 
-    with ThreadPoolExecutor() as executor:
-        future_results = []
-        for query_embedding in query_embeddings:
-            for collection_name in collection_names:
-                result = executor.submit(
-                    process_query_collection, collection_name, query_embedding
-                )
-                future_results.append(result)
-        task_results = [future.result() for future in future_results]
+    loop = asyncio.get_running_loop()
+    task_results = await asyncio.gather(
+        *[
+            loop.run_in_executor(
+                QUERY_EXECUTOR,
+                process_query_collection,
+                collection_name,
+                query_embeddings,
+            )
+            for collection_name in collection_names
+        ]
+    )
 
     for result, err in task_results:
         if err is not None:
             error = True
-        elif result is not None:
-            results.append(result)
+        else:
+            results.extend(result)
 
     if error and not results:
         log.warning("All collection queries failed. No results returned.")
@@ -466,20 +569,27 @@ async def query_collection_with_hybrid_search(
 ) -> dict:
     results = []
     error = False
-    # Fetch collection data once per collection sequentially
-    # Avoid fetching the same data multiple times later
-    collection_results = {}
-    for collection_name in collection_names:
+    # Load the persistent BM25 index once per collection, it is only rebuilt
+    # from the full collection when missing or stale. Backends with native
+    # hybrid search don't need it, query_doc_with_hybrid_search loads it
+    # lazily if the native search fails.
+    native = (
+        ENABLE_RAG_HYBRID_SEARCH_NATIVE
+        and VECTOR_DB_CLIENT.supports_hybrid_search
+        and not enable_enriched_texts
+    )
+    bm25_indexes = {}
+    for collection_name in collection_names if not native else []:
         try:
             log.debug(
-                f"query_collection_with_hybrid_search:VECTOR_DB_CLIENT.get:collection {collection_name}"
+                f"query_collection_with_hybrid_search:BM25_INDEXES.get:collection {collection_name}"
             )
-            collection_results[collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=collection_name
+            bm25_indexes[collection_name] = BM25_INDEXES.get(
+                collection_name, enriched=enable_enriched_texts
             )
         except Exception as e:
             log.exception(f"Failed to fetch collection {collection_name}: {e}")
-            collection_results[collection_name] = None
+            bm25_indexes[collection_name] = None
 
     log.info(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
@@ -489,7 +599,7 @@ async def query_collection_with_hybrid_search(
         try:
             result = await query_doc_with_hybrid_search(
                 collection_name=collection_name,
-                collection_result=collection_results[collection_name],
+                collection_result=None,
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
@@ -498,6 +608,7 @@ async def query_collection_with_hybrid_search(
                 r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
                 enable_enriched_texts=enable_enriched_texts,
+                bm25_index=bm25_indexes.get(collection_name),
             )
             return result, None
         except Exception as e:
@@ -509,7 +620,7 @@ async def query_collection_with_hybrid_search(
     tasks = [
         (collection_name, query)
         for collection_name in collection_names
-        if collection_results[collection_name] is not None
+        if native or bm25_indexes[collection_name] is not None
         for query in queries
     ]
 
@@ -578,12 +689,15 @@ async def agenerate_openai_batch_embeddings(
     key: str = "",
     prefix: str = None,
     user: UserModel = None,
+    dimensions: Optional[int] = None,
 ) -> Optional[list[list[float]]]:
     try:
         log.debug(
             f"agenerate_openai_batch_embeddings:model {model} batch size: {len(texts)}"
         )
         form_data = {"input": texts, "model": model}
+        if dimensions:
+            form_data["dimensions"] = dimensions
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             form_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
@@ -594,16 +708,13 @@ async def agenerate_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/embeddings", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(
+            f"{url}/embeddings", headers=headers, json=form_data
+        )
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating openai batch embeddings: {e}")
         return None
@@ -665,12 +776,15 @@ async def agenerate_azure_openai_batch_embeddings(
     version: str = "",
     prefix: str = None,
     user: UserModel = None,
+    dimensions: Optional[int] = None,
 ) -> Optional[list[list[float]]]:
     try:
         log.debug(
             f"agenerate_azure_openai_batch_embeddings:deployment {model} batch size: {len(texts)}"
         )
         form_data = {"input": texts}
+        if dimensions:
+            form_data["dimensions"] = dimensions
         if isinstance(RAG_EMBEDDING_PREFIX_FIELD_NAME, str) and isinstance(prefix, str):
             form_data[RAG_EMBEDDING_PREFIX_FIELD_NAME] = prefix
 
@@ -683,14 +797,11 @@ async def agenerate_azure_openai_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(full_url, headers=headers, json=form_data) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "data" in data:
-                    return [item["embedding"] for item in data["data"]]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(full_url, headers=headers, json=form_data)
+        if "data" in data:
+            return [item["embedding"] for item in data["data"]]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating azure openai batch embeddings: {e}")
         return None
@@ -759,21 +870,36 @@ async def agenerate_ollama_batch_embeddings(
         if ENABLE_FORWARD_USER_INFO_HEADERS and user:
             headers = include_user_info_headers(headers, user)
 
-        async with aiohttp.ClientSession(trust_env=True) as session:
-            async with session.post(
-                f"{url}/api/embed", headers=headers, json=form_data
-            ) as r:
-                r.raise_for_status()
-                data = await r.json()
-                if "embeddings" in data:
-                    return data["embeddings"]
-                else:
-                    raise Exception("Something went wrong :/")
+        data = await EMBEDDING_CLIENT.post(
+            f"{url}/api/embed", headers=headers, json=form_data
+        )
+        if "embeddings" in data:
+            return data["embeddings"]
+        else:
+            raise Exception("Something went wrong :/")
     except Exception as e:
         log.exception(f"Error generating ollama batch embeddings: {e}")
         return None
 
 
+def reduce_embedding_dimensions(
+    embedding: list[float], dimensions: Optional[int]
+) -> list[float]:
+    # Matryoshka embeddings keep their meaning in the leading components,
+    # truncated vectors only need to be re-normalized
+    if not dimensions or len(embedding) <= dimensions:
+        return embedding
+
+    vector = np.asarray(embedding[:dimensions], dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return (vector / norm if norm > 0 else vector).tolist()
+
+
+def get_embedding_model_id(embedding_model: str, dimensions: Optional[int]) -> str:
+    # Identifies the vectors in caches, reduced ones differ from the full ones
+    return f"{embedding_model}:{dimensions}" if dimensions else embedding_model
+
+
 def get_embedding_function(
     embedding_engine,
     embedding_model,
@@ -783,6 +909,55 @@ def get_embedding_function(
     embedding_batch_size,
     azure_api_version=None,
     enable_async=True,
+    query_cache=True,
+    embedding_dimensions=None,
+) -> Awaitable:
+    async_embedding_function = _get_embedding_function(
+        embedding_engine,
+        embedding_model,
+        embedding_function,
+        url,
+        key,
+        embedding_batch_size,
+        azure_api_version=azure_api_version,
+        enable_async=enable_async,
+        embedding_dimensions=embedding_dimensions,
+    )
+
+    if embedding_dimensions:
+        # Providers that can't reduce the dimensions themselves return full
+        # vectors, truncate those locally
+        full_embedding_function = async_embedding_function
+
+        async def async_embedding_function(query, prefix=None, user=None):
+            embeddings = await full_embedding_function(query, prefix=prefix, user=user)
+            if isinstance(query, list):
+                return [
+                    reduce_embedding_dimensions(embedding, embedding_dimensions)
+                    for embedding in embeddings
+                ]
+            return reduce_embedding_dimensions(embeddings, embedding_dimensions)
+
+    if query_cache:
+        # Repeated queries are answered from memory, see QueryEmbeddingCache
+        return QUERY_EMBEDDING_CACHE.wrap(
+            async_embedding_function,
+            embedding_engine,
+            get_embedding_model_id(embedding_model, embedding_dimensions),
+        )
+    return async_embedding_function
+
+
+def _get_embedding_function(
+    embedding_engine,
+    embedding_model,
+    embedding_function,
+    url,
+    key,
+    embedding_batch_size,
+    azure_api_version=None,
+    enable_async=True,
+    embedding_dimensions=None,
 ) -> Awaitable:
     if embedding_engine == "":
         # Sentence transformers: CPU-bound sync operation
@@ -808,6 +983,7 @@ def get_embedding_function(
             key=key,
             user=user,
             azure_api_version=azure_api_version,
+            dimensions=embedding_dimensions,
         )
 
         async def async_embedding_function(query, prefix=None, user=None):
@@ -818,31 +994,65 @@ def get_embedding_function(
                     for i in range(0, len(query), embedding_batch_size)
                 ]
 
-                if enable_async:
-                    log.debug(
-                        f"generate_multiple_async: Processing {len(batches)} batches in parallel"
-                    )
-                    # Execute all batches in parallel
-                    tasks = [
-                        embedding_function(batch, prefix=prefix, user=user)
-                        for batch in batches
+                batch_results = [None] * len(batches)
+
+                # Batches that failed are retried on their own, the rest are kept
+                for attempt in range(2):
+                    pending = [
+                        idx
+                        for idx, batch in enumerate(batches)
+                        if not isinstance(batch_results[idx], list)
+                        or len(batch_results[idx]) != len(batch)
                     ]
-                    batch_results = await asyncio.gather(*tasks)
+                    if not pending:
+                        break
+
+                    if attempt > 0:
+                        log.warning(
+                            f"generate_multiple_async: Retrying {len(pending)} failed batches"
+                        )
+
+                    if enable_async:
+                        log.debug(
+                            f"generate_multiple_async: Processing {len(pending)} batches in parallel"
+                        )
+                        # Execute the batches in parallel, the embedding client
+                        # limits how many requests reach the endpoint at once
+                        tasks = [
+                            embedding_function(batches[idx], prefix=prefix, user=user)
+                            for idx in pending
+                        ]
+                        results = await asyncio.gather(*tasks)
+                    else:
+                        log.debug(
+                            f"generate_multiple_async: Processing {len(pending)} batches sequentially"
+                        )
+                        results = []
+                        for idx in pending:
+                            results.append(
+                                await embedding_function(
+                                    batches[idx], prefix=prefix, user=user
+                                )
+                            )
+
+                    for idx, result in zip(pending, results):
+                        batch_results[idx] = result
                 else:
-                    log.debug(
-                        f"generate_multiple_async: Processing {len(batches)} batches sequentially"
+                    failed = sum(
+                        1
+                        for idx, batch in enumerate(batches)
+                        if not isinstance(batch_results[idx], list)
+                        or len(batch_results[idx]) != len(batch)
                     )
-                    batch_results = []
-                    for batch in batches:
-                        batch_results.append(
-                            await embedding_function(batch, prefix=prefix, user=user)
+                    if failed:
+                        raise Exception(
+                            f"Failed to generate embeddings for {failed} of {len(batches)} batches"
                         )
 
                 # Flatten results
                 embeddings = []
                 for batch_embeddings in batch_results:
-                    if isinstance(batch_embeddings, list):
-                        embeddings.extend(batch_embeddings)
+                    embeddings.extend(batch_embeddings)
 
                 log.debug(
                     f"generate_multiple_async: Generated {len(embeddings)} embeddings from {len(batches)} parallel batches"
@@ -866,6 +1076,7 @@ async def generate_embeddings(
     url = kwargs.get("url", "")
     key = kwargs.get("key", "")
     user = kwargs.get("user")
+    dimensions = kwargs.get("dimensions")
 
     if prefix is not None and RAG_EMBEDDING_PREFIX_FIELD_NAME is None:
         if isinstance(text, list):
@@ -887,7 +1098,13 @@ async def generate_embeddings(
         return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "openai":
         embeddings = await agenerate_openai_batch_embeddings(
-            model, text if isinstance(text, list) else [text], url, key, prefix, user
+            model,
+            text if isinstance(text, list) else [text],
+            url,
+            key,
+            prefix,
+            user,
+            dimensions=dimensions,
         )
         return embeddings[0] if isinstance(text, str) else embeddings
     elif engine == "azure_openai":
@@ -900,6 +1117,7 @@ async def generate_embeddings(
             azure_api_version,
             prefix,
             user,
+            dimensions=dimensions,
         )
         return embeddings[0] if isinstance(text, str) else embeddings
 
@@ -907,14 +1125,7 @@ async def generate_embeddings(
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
-    if reranking_engine == "external":
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents], user=user
-        )
-    else:
-        return lambda query, documents, user=None: reranking_function.predict(
-            [(query, doc.page_content) for doc in documents]
-        )
+    return BatchedReranker(reranking_engine, reranking_model, reranking_function)
 
 
 async def get_sources_from_items(
@@ -935,10 +1146,10 @@ async def get_sources_from_items(
         f"items: {items} {queries} {embedding_function} {reranking_function} {full_context}"
     )
 
-    extracted_collections = []
-    query_results = []
+    semaphore = asyncio.Semaphore(max(RAG_ITEM_CONCURRENCY, 1))
 
-    for item in items:
+    def resolve_item(item):
+        # Runs in a worker thread: DB lookups and URL fetches block
         query_result = None
         collection_names = []
 
@@ -1126,49 +1337,84 @@ async def get_sources_from_items(
             # Collection Names List
             collection_names.extend(item["collection_names"])
 
-        # If query_result is None
-        # Fallback to collection names and vector search the collections
-        if query_result is None and collection_names:
-            collection_names = set(collection_names).difference(extracted_collections)
-            if not collection_names:
-                log.debug(f"skipping {item} as it has already been extracted")
-                continue
+        return query_result, collection_names
+
+    async def resolve(item):
+        async with semaphore:
+            return await asyncio.to_thread(resolve_item, item)
 
+    async def retrieve(collection_names):
+        async with semaphore:
             try:
                 if full_context:
-                    query_result = get_all_items_from_collections(collection_names)
-                else:
-                    query_result = None  # Initialize to None
-                    if hybrid_search:
-                        try:
-                            query_result = await query_collection_with_hybrid_search(
-                                collection_names=collection_names,
-                                queries=queries,
-                                embedding_function=embedding_function,
-                                k=k,
-                                reranking_function=reranking_function,
-                                k_reranker=k_reranker,
-                                r=r,
-                                hybrid_bm25_weight=hybrid_bm25_weight,
-                                enable_enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
-                            )
-                        except Exception as e:
-                            log.debug(
-                                "Error when using hybrid search, using non hybrid search as fallback."
-                            )
+                    return await asyncio.to_thread(
+                        get_all_items_from_collections, collection_names
+                    )
 
-                    # fallback to non-hybrid search
-                    if not hybrid_search and query_result is None:
-                        query_result = await query_collection(
+                query_result = None  # Initialize to None
+                if hybrid_search:
+                    try:
+                        query_result = await query_collection_with_hybrid_search(
                             collection_names=collection_names,
                             queries=queries,
                             embedding_function=embedding_function,
                             k=k,
+                            reranking_function=reranking_function,
+                            k_reranker=k_reranker,
+                            r=r,
+                            hybrid_bm25_weight=hybrid_bm25_weight,
+                            enable_enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
+                        )
+                    except Exception as e:
+                        log.debug(
+                            "Error when using hybrid search, using non hybrid search as fallback."
                         )
+
+                # fallback to non-hybrid search
+                if not hybrid_search and query_result is None:
+                    query_result = await query_collection(
+                        collection_names=collection_names,
+                        queries=queries,
+                        embedding_function=embedding_function,
+                        k=k,
+                    )
+                return query_result
             except Exception as e:
                 log.exception(e)
+                return None
+
+    resolved = await asyncio.gather(*[resolve(item) for item in items])
+
+    # Claim collections in item order so each is only extracted once, by the
+    # same item as before, whatever order the lookups above finished in
+    extracted_collections = []
+    retrievals = []
+    for item, (query_result, collection_names) in zip(items, resolved):
+        if query_result is None and collection_names:
+            collection_names = set(collection_names).difference(extracted_collections)
+            if not collection_names:
+                log.debug(f"skipping {item} as it has already been extracted")
+                continue
 
             extracted_collections.extend(collection_names)
+            retrievals.append((item, None, collection_names))
+        else:
+            retrievals.append((item, query_result, None))
+
+    # Vector searches for all items run concurrently, results keep item order
+    retrieved = await asyncio.gather(
+        *[
+            retrieve(collection_names)
+            for _, query_result, collection_names in retrievals
+            if collection_names
+        ]
+    )
+    retrieved = iter(retrieved)
+
+    query_results = []
+    for item, query_result, collection_names in retrievals:
+        if collection_names:
+            query_result = next(retrieved)
 
         if query_result:
             if "data" in item:
@@ -1247,6 +1493,8 @@ class RerankCompressor(BaseDocumentCompressor):
     top_n: int
     reranking_function: Any
     r_score: float
+    # Collection the documents come from, used to read back their vectors
+    collection_name: Optional[str] = None
 
     class Config:
         extra = "forbid"
@@ -1282,16 +1530,16 @@ class RerankCompressor(BaseDocumentCompressor):
         scores = None
         if reranking:
             scores = self.reranking_function(query, documents)
+            if inspect.isawaitable(scores):
+                scores = await scores
         else:
-            from sentence_transformers import util
-
             query_embedding = await self.embedding_function(
                 query, RAG_EMBEDDING_QUERY_PREFIX
             )
-            document_embedding = await self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
+            document_embeddings = await self.get_document_embeddings(
+                documents, len(query_embedding)
             )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
+            scores = cosine_similarity(query_embedding, document_embeddings)
 
         if scores is not None:
             docs_with_scores = list(
@@ -1321,3 +1569,52 @@ class RerankCompressor(BaseDocumentCompressor):
                 "No valid scores found, check your reranking function. Returning original documents."
             )
             return documents
+
+    async def get_document_embeddings(
+        self, documents: Sequence[Document], dimension: int
+    ) -> list[list[float]]:
+        # The candidates are already embedded in the collection, read their
+        # vectors back and only embed those that can't be found
+        vectors = {}
+        ids = [doc.id for doc in documents if doc.id]
+        if self.collection_name and ids:
+            try:
+                items = await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.get_with_vectors, self.collection_name, ids=ids
+                )
+                for item in items or []:
+                    # Some backends pad stored vectors to a fixed length
+                    if item["vector"] is not None and len(item["vector"]) >= dimension:
+                        vectors[str(item["id"])] = item["vector"][:dimension]
+            except Exception as e:
+                log.debug(f"Could not read vectors from {self.collection_name}: {e}")
+
+        embeddings = [vectors.get(str(doc.id)) for doc in documents]
+
+        missing = [idx for idx, embedding in enumerate(embeddings) if embedding is None]
+        if missing:
+            log.debug(f"RerankCompressor: embedding {len(missing)} documents")
+            missing_embeddings = await self.embedding_function(
+                [documents[idx].page_content for idx in missing],
+                RAG_EMBEDDING_CONTENT_PREFIX,
+            )
+            for idx, embedding in zip(missing, missing_embeddings):
+                embeddings[idx] = embedding
+
+        return embeddings
+
+
+def cosine_similarity(
+    query_embedding: list[float], document_embeddings: list[list[float]]
+) -> list[float]:
+    if not document_embeddings:
+        return []
+
+    query = np.asarray(query_embedding, dtype=np.float32)
+    documents = np.asarray(document_embeddings, dtype=np.float32)
+
+    query_norm = np.linalg.norm(query) or 1.0
+    document_norms = np.linalg.norm(documents, axis=1)
+    document_norms[document_norms == 0] = 1.0
+
+    return ((documents @ query) / (document_norms * query_norm)).tolist()
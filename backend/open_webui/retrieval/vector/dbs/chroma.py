@@ -84,9 +84,10 @@ class ChromaClient(VectorDBBase):
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
                 # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
+                distances = [
+                    [(2 - dist) / 2 for dist in query_distances]
+                    for query_distances in result["distances"]
+                ]
 
                 return SearchResult(
                     **{
@@ -137,6 +138,36 @@ class ChromaClient(VectorDBBase):
             )
         return None
 
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        ids: Optional[list[str]] = None,
+    ) -> Optional[list[VectorItem]]:
+        # Get the items along with their stored embeddings.
+        try:
+            collection = self.client.get_collection(name=collection_name)
+            if collection:
+                result = collection.get(
+                    ids=ids,
+                    where=filter or None,
+                    include=["documents", "metadatas", "embeddings"],
+                )
+
+                return [
+                    {
+                        "id": id,
+                        "text": result["documents"][idx],
+                        "vector": list(result["embeddings"][idx]),
+                        "metadata": result["metadatas"][idx],
+                    }
+                    for idx, id in enumerate(result["ids"])
+                ]
+            return None
+        except Exception as e:
+            log.exception(f"Error getting vectors from {collection_name}: {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         collection = self.client.get_or_create_collection(
@@ -1,5 +1,6 @@
 from elasticsearch import Elasticsearch, BadRequestError
 from typing import Optional
+import logging
 import ssl
 from elasticsearch.helpers import bulk, scan
 
@@ -9,6 +10,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    fuse_search_results,
 )
 from open_webui.config import (
     ELASTICSEARCH_URL,
@@ -20,6 +22,10 @@ from open_webui.config import (
     ELASTICSEARCH_INDEX_PREFIX,
     SSL_ASSERT_FINGERPRINT,
 )
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
 class ElasticsearchClient(VectorDBBase):
@@ -30,6 +36,8 @@ class ElasticsearchClient(VectorDBBase):
     baesd on the embedding length.
     """
 
+    supports_hybrid_search = True
+
     def __init__(self):
         self.index_prefix = ELASTICSEARCH_INDEX_PREFIX
         self.client = Elasticsearch(
@@ -133,6 +141,23 @@ class ElasticsearchClient(VectorDBBase):
         for i in range(0, len(items), batch_size):
             yield items[i : min(i + batch_size, len(items))]
 
+    def _get_vector_search(self, collection_name: str, vector, limit: int) -> dict:
+        return {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "script_score": {
+                    "query": {
+                        "bool": {"filter": [{"term": {"collection": collection_name}}]}
+                    },
+                    "script": {
+                        "source": "cosineSimilarity(params.vector, 'vector') + 1.0",
+                        "params": {"vector": vector},
+                    },
+                }
+            },
+        }
+
     # Status: works
     def has_collection(self, collection_name) -> bool:
         query_body = {"query": {"bool": {"filter": []}}}
@@ -155,29 +180,86 @@ class ElasticsearchClient(VectorDBBase):
     def search(
         self, collection_name: str, vectors: list[list[float]], limit: int
     ) -> Optional[SearchResult]:
-        query = {
-            "size": limit,
-            "_source": ["text", "metadata"],
-            "query": {
-                "script_score": {
-                    "query": {
-                        "bool": {"filter": [{"term": {"collection": collection_name}}]}
-                    },
-                    "script": {
-                        "source": "cosineSimilarity(params.vector, 'vector') + 1.0",
-                        "params": {
-                            "vector": vectors[0]
-                        },  # Assuming single query vector
-                    },
-                }
-            },
-        }
+        index_name = self._get_index_name(len(vectors[0]))
+
+        # One multi-search request carrying every query vector
+        searches = []
+        for vector in vectors:
+            searches.append({"index": index_name})
+            searches.append(self._get_vector_search(collection_name, vector, limit))
+
+        result = self.client.msearch(searches=searches)
 
-        result = self.client.search(
-            index=self._get_index_name(len(vectors[0])), body=query
+        ids, distances, documents, metadatas = [], [], [], []
+        for response in result["responses"]:
+            search_result = self._result_to_search_result(response)
+            ids.extend(search_result.ids)
+            distances.extend(search_result.distances)
+            documents.extend(search_result.documents)
+            metadatas.extend(search_result.metadatas)
+
+        return SearchResult(
+            ids=ids,
+            distances=distances,
+            documents=documents,
+            metadatas=metadatas,
         )
 
-        return self._result_to_search_result(result)
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        vectors: list[list[float]],
+        limit: int,
+        alpha: float = 0.5,
+    ) -> Optional[SearchResult]:
+        index_name = self._get_index_name(len(vectors[0]))
+
+        # BM25 match on the text field and the vector searches, in one request
+        searches = [
+            {"index": index_name},
+            {
+                "size": limit,
+                "_source": ["text", "metadata"],
+                "query": {
+                    "bool": {
+                        "filter": [{"term": {"collection": collection_name}}],
+                        "must": [{"match": {"text": query_text}}],
+                    }
+                },
+            },
+        ]
+        for vector in vectors:
+            searches.append({"index": index_name})
+            searches.append(self._get_vector_search(collection_name, vector, limit))
+
+        try:
+            result = self.client.msearch(searches=searches)
+        except Exception as e:
+            log.exception(f"Error during hybrid search: {e}")
+            return None
+
+        responses = [
+            self._result_to_search_result(response) if "hits" in response else None
+            for response in result["responses"]
+        ]
+
+        ids, distances, documents, metadatas = [], [], [], []
+        for vector_result in responses[1:]:
+            fused = fuse_search_results(
+                [responses[0], vector_result], [1.0 - alpha, alpha], limit
+            )
+            ids.extend(fused.ids)
+            distances.extend(fused.distances)
+            documents.extend(fused.documents)
+            metadatas.extend(fused.metadatas)
+
+        return SearchResult(
+            ids=ids,
+            distances=distances,
+            documents=documents,
+            metadatas=metadatas,
+        )
 
     # Status: only tested halfwat
     def query(
@@ -251,6 +251,59 @@ class MilvusClient(VectorDBBase):
             )
             return None
 
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        ids: Optional[list[str]] = None,
+    ) -> Optional[list[VectorItem]]:
+        # Get the items along with their stored vectors.
+        connections.connect(uri=MILVUS_URI, token=MILVUS_TOKEN, db_name=MILVUS_DB)
+
+        collection_name = collection_name.replace("-", "_")
+        if not self.has_collection(collection_name):
+            return None
+
+        filter_expressions = []
+        for key, value in (filter or {}).items():
+            if isinstance(value, str):
+                filter_expressions.append(f'metadata["{key}"] == "{value}"')
+            else:
+                filter_expressions.append(f'metadata["{key}"] == {value}')
+        if ids is not None:
+            filter_expressions.append(f"id in {json.dumps(list(ids))}")
+
+        collection = Collection(f"{self.collection_prefix}_{collection_name}")
+        collection.load()
+
+        try:
+            iterator = collection.query_iterator(
+                expr=" && ".join(filter_expressions),
+                output_fields=["id", "vector", "data", "metadata"],
+            )
+
+            items = []
+            while True:
+                batch = iterator.next()
+                if not batch:
+                    iterator.close()
+                    break
+                items.extend(
+                    {
+                        "id": item.get("id"),
+                        "text": item.get("data", {}).get("text"),
+                        "vector": [float(x) for x in item.get("vector")],
+                        "metadata": item.get("metadata"),
+                    }
+                    for item in batch
+                )
+            return items
+        except Exception as e:
+            log.exception(
+                f"Error getting vectors from {self.collection_prefix}_{collection_name}: {e}"
+            )
+            return None
+
     def get(self, collection_name: str) -> Optional[GetResult]:
         # Get all the items in the collection. This can be very resource-intensive for large collections.
         collection_name = collection_name.replace("-", "_")
@@ -0,0 +1,707 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from open_webui.retrieval.vector.utils import process_metadata
+from open_webui.retrieval.vector.main import (
+    VectorDBBase,
+    VectorItem,
+    SearchResult,
+    GetResult,
+)
+from open_webui.config import (
+    MMAP_VECTOR_DATA_PATH,
+    MMAP_VECTOR_DTYPE,
+    MMAP_VECTOR_HNSW_THRESHOLD,
+    VECTOR_QUANTIZATION,
+    VECTOR_QUANTIZATION_RESCORE_MULTIPLIER,
+)
+from open_webui.env import SRC_LOG_LEVELS
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Rows scored per matrix product by the brute-force search
+SEARCH_BLOCK_SIZE = 65536
+
+# Keeps the number of SQL variables under SQLite's limit
+SQL_BATCH_SIZE = 900
+
+# Set bits per byte value, for Hamming distances between packed binary codes
+POPCOUNT = (
+    np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1)
+    .sum(axis=1)
+    .astype(np.int32)
+)
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS collection (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL UNIQUE,
+        dimension INTEGER NOT NULL,
+        rows INTEGER NOT NULL DEFAULT 0,
+        generation INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS item (
+        collection_id INTEGER NOT NULL,
+        id TEXT NOT NULL,
+        row INTEGER NOT NULL,
+        text TEXT,
+        metadata TEXT,
+        PRIMARY KEY (collection_id, id)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS item_row_idx ON item (collection_id, row)",
+]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def _quantize(
+    vectors: np.ndarray, quantization: str
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Returns the codes and, for int8, the per-row scale that turns a dot
+    product with the codes back into an approximate cosine similarity.
+    """
+    if quantization == "binary":
+        return np.packbits(vectors > 0, axis=1), None
+
+    max_abs = np.abs(vectors).max(axis=1)
+    max_abs[max_abs == 0] = 1.0
+    codes = np.round(vectors / max_abs[:, None] * 127).astype(np.int8)
+    return codes, (max_abs / 127).astype(np.float32)
+
+
+class MmapClient(VectorDBBase):
+    """
+    Embedded vector store for single-node deployments.
+
+    Each collection is an append-only matrix of normalized vectors in a flat
+    file that is memory-mapped read-only, so nothing is loaded into the heap
+    at startup and every worker process shares the same OS page cache. Ids,
+    text and metadata live in SQLite next to it, which also serializes
+    writers across processes.
+
+    Deleted and replaced rows stay in the matrix until they outnumber the
+    live ones, then the collection is compacted into a new generation of the
+    file. Search is a vectorized brute-force scan, or an HNSW graph once a
+    collection reaches MMAP_VECTOR_HNSW_THRESHOLD items. hnswlib is not in
+    the default requirements, it comes with the "mmap" extra.
+
+    With VECTOR_QUANTIZATION the scan runs over int8 (4x smaller than
+    float32) or binary (32x) codes kept in their own memory-mapped file, and
+    only the best candidates are rescored against the stored vectors. The
+    codes are derived from the stored vectors the first time a collection is
+    searched after it grew, so the setting can be switched at any time.
+    """
+
+    def __init__(self):
+        self.path = MMAP_VECTOR_DATA_PATH
+        self.dtype = np.dtype(MMAP_VECTOR_DTYPE)
+        self.hnsw_threshold = MMAP_VECTOR_HNSW_THRESHOLD if hnswlib else 0
+        self.quantization = VECTOR_QUANTIZATION
+        self.rescore_multiplier = max(VECTOR_QUANTIZATION_RESCORE_MULTIPLIER, 1)
+
+        os.makedirs(self.path, exist_ok=True)
+
+        self._local = threading.local()
+        self._lock = threading.RLock()
+        # collection id -> (generation, rows, memmap)
+        self._matrices: dict[int, tuple[int, int, np.memmap]] = {}
+        # collection id -> (generation, saved rows, hnswlib.Index)
+        self._indexes: dict[int, tuple[int, int, Any]] = {}
+        # collection id -> (generation, rows, codes, scales)
+        self._codes: dict[int, tuple] = {}
+
+        conn = self._connect()
+        for statement in SCHEMA:
+            conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                os.path.join(self.path, "index.db"),
+                timeout=60,
+                isolation_level=None,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get_collection(
+        self, conn: sqlite3.Connection, collection_name: str
+    ) -> Optional[sqlite3.Row]:
+        return conn.execute(
+            "SELECT id, dimension, rows, generation FROM collection WHERE name = ?",
+            (collection_name,),
+        ).fetchone()
+
+    def _get_vector_path(self, collection_id: int, generation: int) -> str:
+        return os.path.join(self.path, str(collection_id), f"vectors.{generation}.bin")
+
+    def _get_index_path(self, collection_id: int, generation: int) -> str:
+        return os.path.join(self.path, str(collection_id), f"hnsw.{generation}.bin")
+
+    def _get_matrix(self, collection: sqlite3.Row) -> Optional[np.memmap]:
+        if collection["rows"] == 0:
+            return None
+
+        cached = self._matrices.get(collection["id"])
+        if cached and cached[:2] == (collection["generation"], collection["rows"]):
+            return cached[2]
+
+        matrix = np.memmap(
+            self._get_vector_path(collection["id"], collection["generation"]),
+            dtype=self.dtype,
+            mode="r",
+            shape=(collection["rows"], collection["dimension"]),
+        )
+        self._matrices[collection["id"]] = (
+            collection["generation"],
+            collection["rows"],
+            matrix,
+        )
+        return matrix
+
+    def _get_codes(
+        self, collection: sqlite3.Row, matrix: np.memmap
+    ) -> tuple[np.memmap, Optional[np.memmap]]:
+        collection_id, generation = collection["id"], collection["generation"]
+        rows = collection["rows"]
+
+        cached = self._codes.get(collection_id)
+        if cached and cached[:2] == (generation, rows):
+            return cached[2], cached[3]
+
+        directory = os.path.join(self.path, str(collection_id))
+        codes_path = os.path.join(directory, f"{self.quantization}.{generation}.bin")
+        scales_path = os.path.join(directory, f"scales.{generation}.bin")
+
+        if self.quantization == "binary":
+            width, code_dtype = (collection["dimension"] + 7) // 8, np.uint8
+        else:
+            width, code_dtype = collection["dimension"], np.int8
+
+        # Encode the rows added since the codes were last written. Codes are
+        # deterministic, so processes racing here write the same bytes.
+        existing = (
+            os.path.getsize(codes_path) // width if os.path.exists(codes_path) else 0
+        )
+        if existing < rows:
+            codes_fd = os.open(codes_path, os.O_RDWR | os.O_CREAT, 0o644)
+            scales_fd = (
+                os.open(scales_path, os.O_RDWR | os.O_CREAT, 0o644)
+                if self.quantization == "int8"
+                else None
+            )
+            try:
+                for start in range(existing, rows, SEARCH_BLOCK_SIZE):
+                    block = np.asarray(
+                        matrix[start : start + SEARCH_BLOCK_SIZE], np.float32
+                    )
+                    codes, scales = _quantize(block, self.quantization)
+                    # Scales first, a row only counts as encoded once its code is written
+                    if scales_fd is not None:
+                        os.pwrite(scales_fd, scales.tobytes(), start * 4)
+                    os.pwrite(codes_fd, codes.tobytes(), start * width)
+            finally:
+                os.close(codes_fd)
+                if scales_fd is not None:
+                    os.close(scales_fd)
+
+        codes = np.memmap(codes_path, dtype=code_dtype, mode="r", shape=(rows, width))
+        scales = (
+            np.memmap(scales_path, dtype=np.float32, mode="r", shape=(rows,))
+            if self.quantization == "int8"
+            else None
+        )
+        self._codes[collection_id] = (generation, rows, codes, scales)
+        return codes, scales
+
+    def _search_quantized(
+        self,
+        collection: sqlite3.Row,
+        matrix: np.memmap,
+        queries: np.ndarray,
+        candidates: int,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        codes, scales = self._get_codes(collection, matrix)
+        first_pass = min(len(matrix), candidates * self.rescore_multiplier)
+
+        approx = np.empty((len(queries), len(matrix)), dtype=np.float32)
+        if self.quantization == "binary":
+            query_codes, _ = _quantize(queries, "binary")
+            for start in range(0, len(codes), SEARCH_BLOCK_SIZE):
+                block = np.asarray(codes[start : start + SEARCH_BLOCK_SIZE])
+                for idx, query_code in enumerate(query_codes):
+                    # Negated Hamming distance, higher is closer
+                    approx[idx, start : start + len(block)] = -POPCOUNT[
+                        np.bitwise_xor(block, query_code)
+                    ].sum(axis=1)
+        else:
+            for start in range(0, len(codes), SEARCH_BLOCK_SIZE):
+                block = np.asarray(codes[start : start + SEARCH_BLOCK_SIZE], np.float32)
+                approx[:, start : start + len(block)] = (queries @ block.T) * scales[
+                    start : start + len(block)
+                ]
+
+        top = np.argpartition(-approx, first_pass - 1, axis=1)[:, :first_pass]
+
+        # Rescore the candidates against the stored vectors
+        result_rows, result_scores = [], []
+        for query, rows in zip(queries, top):
+            rows = np.sort(rows)
+            scores = np.asarray(matrix[rows], np.float32) @ query
+            order = np.argsort(-scores)[:candidates]
+            result_rows.append(rows[order])
+            result_scores.append(scores[order])
+
+        return np.stack(result_rows), np.stack(result_scores)
+
+    def _get_index(self, collection: sqlite3.Row, matrix: np.memmap):
+        # Only called with self._lock held
+        collection_id, generation = collection["id"], collection["generation"]
+        rows = collection["rows"]
+        path = self._get_index_path(collection_id, generation)
+
+        cached = self._indexes.get(collection_id)
+        if cached and cached[0] == generation:
+            _, saved, index = cached
+        else:
+            index = hnswlib.Index(space="ip", dim=collection["dimension"])
+            if os.path.exists(path):
+                index.load_index(path, max_elements=rows)
+            else:
+                index.init_index(max_elements=rows, ef_construction=200, M=16)
+            saved = index.get_current_count()
+
+        count = index.get_current_count()
+        if count < rows:
+            if index.get_max_elements() < rows:
+                index.resize_index(rows)
+            for start in range(count, rows, SEARCH_BLOCK_SIZE):
+                end = min(start + SEARCH_BLOCK_SIZE, rows)
+                index.add_items(
+                    np.asarray(matrix[start:end], dtype=np.float32),
+                    np.arange(start, end),
+                )
+
+            # Persist once the graph has grown noticeably, so other processes
+            # and restarts load it instead of rebuilding
+            if rows - saved > rows // 10:
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                index.save_index(tmp_path)
+                os.replace(tmp_path, path)
+                saved = rows
+
+        self._indexes[collection_id] = (generation, saved, index)
+        return index
+
+    def _search_matrix(
+        self, collection: sqlite3.Row, queries: np.ndarray, candidates: int
+    ) -> tuple[np.ndarray, np.ndarray]:
+        matrix = self._get_matrix(collection)
+        live = collection["live"]
+
+        if self.hnsw_threshold and live >= self.hnsw_threshold:
+            with self._lock:
+                index = self._get_index(collection, matrix)
+                index.set_ef(max(candidates * 2, 64))
+                rows, distances = index.knn_query(queries, k=candidates)
+            return rows, 1.0 - distances
+
+        if self.quantization:
+            return self._search_quantized(collection, matrix, queries, candidates)
+
+        scores = np.empty((len(queries), len(matrix)), dtype=np.float32)
+        for start in range(0, len(matrix), SEARCH_BLOCK_SIZE):
+            block = np.asarray(matrix[start : start + SEARCH_BLOCK_SIZE], np.float32)
+            scores[:, start : start + len(block)] = queries @ block.T
+
+        rows = np.argpartition(-scores, candidates - 1, axis=1)[:, :candidates]
+        row_scores = np.take_along_axis(scores, rows, axis=1)
+        order = np.argsort(-row_scores, axis=1)
+        return (
+            np.take_along_axis(rows, order, axis=1),
+            np.take_along_axis(row_scores, order, axis=1),
+        )
+
+    def _get_items_by_rows(
+        self, conn: sqlite3.Connection, collection_id: int, rows: list[int]
+    ) -> dict[int, sqlite3.Row]:
+        items = {}
+        for start in range(0, len(rows), SQL_BATCH_SIZE):
+            batch = rows[start : start + SQL_BATCH_SIZE]
+            for item in conn.execute(
+                f"""
+                SELECT row, id, text, metadata FROM item
+                WHERE collection_id = ? AND row IN ({",".join("?" * len(batch))})
+                """,
+                [collection_id, *batch],
+            ):
+                items[item["row"]] = item
+        return items
+
+    def _filter_clause(self, filter: Optional[Dict]) -> tuple[str, list]:
+        clause, params = "", []
+        for key, value in (filter or {}).items():
+            clause += " AND json_extract(metadata, ?) = ?"
+            params.extend([f'$."{key}"', value])
+        return clause, params
+
+    def _write(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
+
+        vectors = _normalize(np.asarray([item["vector"] for item in items], np.float32))
+        dimension = vectors.shape[1]
+
+        conn = self._connect()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                collection = self._get_collection(conn, collection_name)
+                if collection is None:
+                    conn.execute(
+                        "INSERT INTO collection (name, dimension) VALUES (?, ?)",
+                        (collection_name, dimension),
+                    )
+                    collection = self._get_collection(conn, collection_name)
+                elif collection["dimension"] != dimension:
+                    raise ValueError(
+                        f"Vector dimension {dimension} does not match the dimension "
+                        f"{collection['dimension']} of collection '{collection_name}'"
+                    )
+
+                path = self._get_vector_path(collection["id"], collection["generation"])
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+
+                # Rows are only handed out under the write lock, so appending
+                # at the committed row count never overlaps another writer
+                row = collection["rows"]
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                try:
+                    os.pwrite(
+                        fd,
+                        vectors.astype(self.dtype).tobytes(),
+                        row * dimension * self.dtype.itemsize,
+                    )
+                finally:
+                    os.close(fd)
+
+                # Replaced items leave their old row behind, reclaimed by compaction
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO item (collection_id, id, row, text, metadata)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (
+                            collection["id"],
+                            str(item["id"]),
+                            row + idx,
+                            item["text"],
+                            json.dumps(process_metadata({**(item["metadata"] or {})})),
+                        )
+                        for idx, item in enumerate(items)
+                    ],
+                )
+                conn.execute(
+                    "UPDATE collection SET rows = ? WHERE id = ?",
+                    (row + len(items), collection["id"]),
+                )
+                self._compact_if_needed(conn, collection_name)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _compact_if_needed(self, conn: sqlite3.Connection, collection_name: str):
+        # Runs inside the write transaction
+        collection = self._get_collection(conn, collection_name)
+        items = conn.execute(
+            "SELECT id, row FROM item WHERE collection_id = ? ORDER BY row",
+            (collection["id"],),
+        ).fetchall()
+        if (collection["rows"] - len(items)) * 2 <= collection["rows"]:
+            return
+
+        collection_id, generation = collection["id"], collection["generation"]
+        log.info(
+            f"Compacting collection '{collection_name}': "
+            f"{len(items)} of {collection['rows']} rows are live"
+        )
+
+        matrix = self._get_matrix(collection)
+        path = self._get_vector_path(collection_id, generation + 1)
+        with open(path, "wb") as f:
+            for start in range(0, len(items), SEARCH_BLOCK_SIZE):
+                rows = [
+                    item["row"] for item in items[start : start + SEARCH_BLOCK_SIZE]
+                ]
+                f.write(np.ascontiguousarray(matrix[rows]).tobytes())
+
+        # Rows only move down, in order, so the unique row index holds
+        conn.executemany(
+            "UPDATE item SET row = ? WHERE collection_id = ? AND id = ?",
+            [(idx, collection_id, item["id"]) for idx, item in enumerate(items)],
+        )
+        conn.execute(
+            "UPDATE collection SET rows = ?, generation = ? WHERE id = ?",
+            (len(items), generation + 1, collection_id),
+        )
+
+        # Other processes may still be reading the previous generation
+        for name in os.listdir(os.path.dirname(path)):
+            try:
+                file_generation = int(name.split(".")[1])
+            except (IndexError, ValueError):
+                continue
+            if file_generation < generation:
+                try:
+                    os.remove(os.path.join(os.path.dirname(path), name))
+                except OSError:
+                    pass
+
+    def has_collection(self, collection_name: str) -> bool:
+        return self._get_collection(self._connect(), collection_name) is not None
+
+    def delete_collection(self, collection_name: str) -> None:
+        conn = self._connect()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                collection = self._get_collection(conn, collection_name)
+                if collection is None:
+                    conn.execute("ROLLBACK")
+                    return
+
+                conn.execute(
+                    "DELETE FROM item WHERE collection_id = ?", (collection["id"],)
+                )
+                conn.execute("DELETE FROM collection WHERE id = ?", (collection["id"],))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._matrices.pop(collection["id"], None)
+            self._indexes.pop(collection["id"], None)
+            self._codes.pop(collection["id"], None)
+            shutil.rmtree(
+                os.path.join(self.path, str(collection["id"])), ignore_errors=True
+            )
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(collection_name, items)
+
+    def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        self._write(collection_name, items)
+
+    def search(
+        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+    ) -> Optional[SearchResult]:
+        conn = self._connect()
+        collection = self._get_collection(conn, collection_name)
+        if collection is None or collection["rows"] == 0 or not vectors:
+            return None
+
+        queries = _normalize(np.asarray(vectors, dtype=np.float32))
+        if queries.shape[1] != collection["dimension"]:
+            log.warning(
+                f"Query dimension {queries.shape[1]} does not match the dimension "
+                f"{collection['dimension']} of collection '{collection_name}'"
+            )
+            return None
+
+        live = conn.execute(
+            "SELECT COUNT(*) FROM item WHERE collection_id = ?", (collection["id"],)
+        ).fetchone()[0]
+        if live == 0:
+            return None
+        collection = {**dict(collection), "live": live}
+
+        # Over-fetch by the number of dead rows so `limit` live ones remain
+        candidates = min(collection["rows"], limit + collection["rows"] - live)
+        rows, scores = self._search_matrix(collection, queries, candidates)
+
+        items = self._get_items_by_rows(
+            conn, collection["id"], sorted({int(row) for row in rows.flatten()})
+        )
+
+        ids, distances, documents, metadatas = [], [], [], []
+        for query_rows, query_scores in zip(rows, scores):
+            result = [
+                (items[int(row)], float(score))
+                for row, score in zip(query_rows, query_scores)
+                if int(row) in items
+            ][:limit]
+
+            ids.append([item["id"] for item, _ in result])
+            # Cosine similarity [-1, 1] to a [0, 1] score, like the other backends
+            distances.append([(1.0 + score) / 2.0 for _, score in result])
+            documents.append([item["text"] for item, _ in result])
+            metadatas.append([json.loads(item["metadata"]) for item, _ in result])
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
+    def query(
+        self, collection_name: str, filter: Dict, limit: Optional[int] = None
+    ) -> Optional[GetResult]:
+        conn = self._connect()
+        collection = self._get_collection(conn, collection_name)
+        if collection is None:
+            return None
+
+        clause, params = self._filter_clause(filter)
+        sql = f"SELECT id, text, metadata FROM item WHERE collection_id = ?{clause} ORDER BY row"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        items = conn.execute(sql, [collection["id"], *params]).fetchall()
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[json.loads(item["metadata"]) for item in items]],
+        )
+
+    def get(self, collection_name: str) -> Optional[GetResult]:
+        conn = self._connect()
+        collection = self._get_collection(conn, collection_name)
+        if collection is None:
+            return None
+
+        items = conn.execute(
+            "SELECT id, text, metadata FROM item WHERE collection_id = ? ORDER BY row",
+            (collection["id"],),
+        ).fetchall()
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[json.loads(item["metadata"]) for item in items]],
+        )
+
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[Dict] = None,
+        ids: Optional[List[str]] = None,
+    ) -> Optional[List[VectorItem]]:
+        conn = self._connect()
+        collection = self._get_collection(conn, collection_name)
+        if collection is None:
+            return None
+
+        clause, params = self._filter_clause(filter)
+        sql = (
+            f"SELECT id, row, text, metadata FROM item WHERE collection_id = ?{clause}"
+        )
+
+        if ids is None:
+            items = conn.execute(
+                f"{sql} ORDER BY row", [collection["id"], *params]
+            ).fetchall()
+        else:
+            items = []
+            for start in range(0, len(ids), SQL_BATCH_SIZE):
+                batch = ids[start : start + SQL_BATCH_SIZE]
+                items.extend(
+                    conn.execute(
+                        f"{sql} AND id IN ({','.join('?' * len(batch))})",
+                        [collection["id"], *params, *batch],
+                    ).fetchall()
+                )
+
+        matrix = self._get_matrix(collection)
+        # Vectors are stored normalized, which is all cosine search needs
+        return [
+            {
+                "id": item["id"],
+                "text": item["text"],
+                "vector": matrix[item["row"]].astype(np.float32).tolist(),
+                "metadata": json.loads(item["metadata"]),
+            }
+            for item in items
+        ]
+
+    def delete(
+        self,
+        collection_name: str,
+        ids: Optional[List[str]] = None,
+        filter: Optional[Dict] = None,
+    ) -> None:
+        conn = self._connect()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                collection = self._get_collection(conn, collection_name)
+                if collection is None:
+                    conn.execute("ROLLBACK")
+                    return
+
+                if ids:
+                    for start in range(0, len(ids), SQL_BATCH_SIZE):
+                        batch = ids[start : start + SQL_BATCH_SIZE]
+                        conn.execute(
+                            f"""
+                            DELETE FROM item
+                            WHERE collection_id = ? AND id IN ({",".join("?" * len(batch))})
+                            """,
+                            [collection["id"], *batch],
+                        )
+                elif filter:
+                    clause, params = self._filter_clause(filter)
+                    conn.execute(
+                        f"DELETE FROM item WHERE collection_id = ?{clause}",
+                        [collection["id"], *params],
+                    )
+
+                self._compact_if_needed(conn, collection_name)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def reset(self) -> None:
+        conn = self._connect()
+        with self._lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM item")
+                conn.execute("DELETE FROM collection")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._matrices.clear()
+            self._indexes.clear()
+            self._codes.clear()
+            for name in os.listdir(self.path):
+                path = os.path.join(self.path, name)
+                if os.path.isdir(path):
+                    shutil.rmtree(path, ignore_errors=True)
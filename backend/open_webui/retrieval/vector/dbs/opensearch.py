@@ -8,6 +8,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    fuse_search_results,
 )
 from open_webui.config import (
     OPENSEARCH_URI,
@@ -19,6 +20,8 @@ from open_webui.config import (
 
 
 class OpenSearchClient(VectorDBBase):
+    supports_hybrid_search = True
+
     def __init__(self):
         self.index_prefix = "open_webui"
         self.client = OpenSearch(
@@ -102,6 +105,24 @@ class OpenSearchClient(VectorDBBase):
         for i in range(0, len(items), batch_size):
             yield items[i : i + batch_size]
 
+    def _get_vector_search(self, vector: list[float | int], limit: int) -> dict:
+        return {
+            "size": limit,
+            "_source": ["text", "metadata"],
+            "query": {
+                "script_score": {
+                    "query": {"match_all": {}},
+                    "script": {
+                        "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
+                        "params": {
+                            "field": "vector",
+                            "query_value": vector,
+                        },
+                    },
+                }
+            },
+        }
+
     def has_collection(self, collection_name: str) -> bool:
         # has_collection here means has index.
         # We are simply adapting to the norms of the other DBs.
@@ -119,28 +140,90 @@ class OpenSearchClient(VectorDBBase):
             if not self.has_collection(collection_name):
                 return None
 
-            query = {
-                "size": limit,
-                "_source": ["text", "metadata"],
-                "query": {
-                    "script_score": {
-                        "query": {"match_all": {}},
-                        "script": {
-                            "source": "(cosineSimilarity(params.query_value, doc[params.field]) + 1.0) / 2.0",
-                            "params": {
-                                "field": "vector",
-                                "query_value": vectors[0],
-                            },  # Assuming single query vector
-                        },
-                    }
-                },
-            }
+            index_name = self._get_index_name(collection_name)
+
+            # One multi-search request carrying every query vector
+            body = []
+            for vector in vectors:
+                body.append({"index": index_name})
+                body.append(self._get_vector_search(vector, limit))
+
+            result = self.client.msearch(body=body)
+
+            ids, distances, documents, metadatas = [], [], [], []
+            for response in result["responses"]:
+                search_result = self._result_to_search_result(response)
+                if search_result is None:
+                    search_result = SearchResult(
+                        ids=[[]], distances=[[]], documents=[[]], metadatas=[[]]
+                    )
+                ids.extend(search_result.ids)
+                distances.extend(search_result.distances)
+                documents.extend(search_result.documents)
+                metadatas.extend(search_result.metadatas)
+
+            if not any(ids):
+                return None
 
-            result = self.client.search(
-                index=self._get_index_name(collection_name), body=query
+            return SearchResult(
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
             )
 
-            return self._result_to_search_result(result)
+        except Exception as e:
+            return None
+
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        alpha: float = 0.5,
+    ) -> Optional[SearchResult]:
+        try:
+            if not self.has_collection(collection_name):
+                return None
+
+            index_name = self._get_index_name(collection_name)
+
+            # BM25 match on the text field and the vector searches, in one request
+            body = [
+                {"index": index_name},
+                {
+                    "size": limit,
+                    "_source": ["text", "metadata"],
+                    "query": {"match": {"text": query_text}},
+                },
+            ]
+            for vector in vectors:
+                body.append({"index": index_name})
+                body.append(self._get_vector_search(vector, limit))
+
+            result = self.client.msearch(body=body)
+            responses = [
+                self._result_to_search_result(response) if "hits" in response else None
+                for response in result["responses"]
+            ]
+
+            ids, distances, documents, metadatas = [], [], [], []
+            for vector_result in responses[1:]:
+                fused = fuse_search_results(
+                    [responses[0], vector_result], [1.0 - alpha, alpha], limit
+                )
+                ids.extend(fused.ids)
+                distances.extend(fused.distances)
+                documents.extend(fused.documents)
+                metadatas.extend(fused.metadatas)
+
+            return SearchResult(
+                ids=ids,
+                distances=distances,
+                documents=documents,
+                metadatas=metadatas,
+            )
 
         except Exception as e:
             return None
@@ -1,6 +1,7 @@
 from typing import Optional, List, Dict, Any, Tuple
 import logging
 import json
+import re
 from sqlalchemy import (
     func,
     literal,
@@ -33,6 +34,7 @@ from open_webui.retrieval.vector.main import (
     VectorItem,
     SearchResult,
     GetResult,
+    fuse_search_results,
 )
 from open_webui.config import (
     PGVECTOR_DB_URL,
@@ -49,6 +51,9 @@ from open_webui.config import (
     PGVECTOR_HNSW_EF_CONSTRUCTION,
     PGVECTOR_IVFFLAT_LISTS,
     PGVECTOR_USE_HALFVEC,
+    ENABLE_RAG_HYBRID_SEARCH_NATIVE,
+    VECTOR_QUANTIZATION,
+    VECTOR_QUANTIZATION_RESCORE_MULTIPLIER,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -88,7 +93,16 @@ class DocumentChunk(Base):
 
 
 class PgvectorClient(VectorDBBase):
+    # Full-text search needs the plaintext column
+    supports_hybrid_search = ENABLE_RAG_HYBRID_SEARCH_NATIVE and not PGVECTOR_PGCRYPTO
+
     def __init__(self) -> None:
+        # pgvector has no int8 type, int8 is served by a halfvec index
+        self.quantization = VECTOR_QUANTIZATION
+        if self.quantization == "int8" and USE_HALFVEC:
+            # The column is halfvec already, there is nothing smaller to index
+            self.quantization = None
+        self.rescore_multiplier = max(VECTOR_QUANTIZATION_RESCORE_MULTIPLIER, 1)
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -175,6 +189,24 @@ class PgvectorClient(VectorDBBase):
                     "ON document_chunk (collection_name);"
                 )
             )
+
+            if self.supports_hybrid_search:
+                self.session.execute(
+                    text(
+                        "CREATE INDEX IF NOT EXISTS idx_document_chunk_text_tsv "
+                        "ON document_chunk USING GIN (to_tsvector('simple', text));"
+                    )
+                )
+
+            self.supports_iterative_scan = self._get_pgvector_version() >= (0, 8)
+            if self.quantization and not self._has_quantized_index():
+                log.warning(
+                    "VECTOR_QUANTIZATION=%s is set but the quantized vector index "
+                    "'%s' doesn't exist, quantized searches scan every chunk of the "
+                    "collection. Create it with POST /api/v1/retrieval/index/quantized.",
+                    self.quantization,
+                    self._get_quantized_index()[0],
+                )
             self.session.commit()
             log.info("Initialization complete.")
         except Exception as e:
@@ -254,6 +286,67 @@ class PgvectorClient(VectorDBBase):
                 f" {index_options}" if index_options else "",
             )
 
+    def _get_quantized_expression(self) -> str:
+        if self.quantization == "binary":
+            return f"binary_quantize(vector)::bit({VECTOR_LENGTH})"
+        return f"vector::halfvec({VECTOR_LENGTH})"
+
+    def _get_quantized_index(self) -> Tuple[str, str]:
+        if self.quantization == "binary":
+            return "idx_document_chunk_vector_binary", "bit_hamming_ops"
+        return "idx_document_chunk_vector_halfvec", "halfvec_cosine_ops"
+
+    def _has_quantized_index(self) -> bool:
+        index_name, _ = self._get_quantized_index()
+        return (
+            self.session.execute(
+                text(
+                    """
+                SELECT 1
+                FROM pg_indexes
+                WHERE schemaname = current_schema()
+                  AND tablename = 'document_chunk'
+                  AND indexname = :index_name
+                """
+                ),
+                {"index_name": index_name},
+            ).scalar()
+            is not None
+        )
+
+    def _get_pgvector_version(self) -> Tuple[int, ...]:
+        version = self.session.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        ).scalar()
+        try:
+            return tuple(int(part) for part in version.split("."))
+        except (AttributeError, ValueError):
+            return ()
+
+    def create_quantized_index(self) -> bool:
+        if not self.quantization:
+            return False
+
+        index_name, opclass = self._get_quantized_index()
+        try:
+            self.session.execute(
+                text(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON document_chunk "
+                    f"USING hnsw (({self._get_quantized_expression()}) {opclass})"
+                )
+            )
+            self.session.commit()
+            log.info(
+                "Created %s quantized vector index '%s'.",
+                self.quantization,
+                index_name,
+            )
+            return True
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error creating quantized vector index: {e}")
+            raise
+
     def check_vector_length(self) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
@@ -435,6 +528,9 @@ class PgvectorClient(VectorDBBase):
             if not vectors:
                 return None
 
+            if self.quantization and limit is not None:
+                return self._search_quantized(collection_name, vectors, limit)
+
             # Adjust query vectors to VECTOR_LENGTH
             vectors = [self.adjust_vector_length(vector) for vector in vectors]
             num_queries = len(vectors)
@@ -536,6 +632,168 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during search: {e}")
             return None
 
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        vectors: List[List[float]],
+        limit: int,
+        alpha: float = 0.5,
+    ) -> Optional[SearchResult]:
+        if not self.supports_hybrid_search:
+            return None
+
+        try:
+            # Match any of the query terms, like BM25 does
+            terms = dict.fromkeys(re.findall(r"\w+", query_text.lower()))
+            keyword_result = None
+            if terms:
+                rows = self.session.execute(
+                    text(
+                        """
+                    SELECT id, text, vmetadata, ts_rank(to_tsvector('simple', text), q) AS rank
+                    FROM document_chunk, to_tsquery('simple', :query) q
+                    WHERE collection_name = :collection_name
+                      AND to_tsvector('simple', text) @@ q
+                    ORDER BY rank DESC
+                    LIMIT :limit
+                """
+                    ),
+                    {
+                        "query": " | ".join(f"'{term}'" for term in terms),
+                        "collection_name": collection_name,
+                        "limit": limit,
+                    },
+                ).all()
+                self.session.rollback()  # read-only transaction
+
+                keyword_result = SearchResult(
+                    ids=[[row.id for row in rows]],
+                    distances=[[row.rank for row in rows]],
+                    documents=[[row.text for row in rows]],
+                    metadatas=[[row.vmetadata for row in rows]],
+                )
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during hybrid search: {e}")
+            return None
+
+        vector_result = self.search(collection_name, vectors, limit)
+        if vector_result is None:
+            return None
+
+        ids, distances, documents, metadatas = [], [], [], []
+        for idx in range(len(vectors)):
+            fused = fuse_search_results(
+                [
+                    keyword_result,
+                    SearchResult(
+                        ids=[vector_result.ids[idx]],
+                        distances=[vector_result.distances[idx]],
+                        documents=[vector_result.documents[idx]],
+                        metadatas=[vector_result.metadatas[idx]],
+                    ),
+                ],
+                [1.0 - alpha, alpha],
+                limit,
+            )
+            ids.extend(fused.ids)
+            distances.extend(fused.distances)
+            documents.extend(fused.documents)
+            metadatas.extend(fused.metadatas)
+
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
+    def _search_quantized(
+        self, collection_name: str, vectors: List[List[float]], limit: int
+    ) -> SearchResult:
+        # Nearest candidates by the quantized index, reordered by the full vectors
+        vector_type = f"{'halfvec' if USE_HALFVEC else 'vector'}({VECTOR_LENGTH})"
+        if self.quantization == "binary":
+            first_pass = f"binary_quantize(CAST(:vector AS {vector_type}))"
+            operator = "<~>"
+        else:
+            first_pass = f"CAST(:vector AS halfvec({VECTOR_LENGTH}))"
+            operator = "<=>"
+
+        if PGVECTOR_PGCRYPTO:
+            text_column = "CAST(pgp_sym_decrypt(text, :key) AS text)"
+            metadata_column = "CAST(pgp_sym_decrypt(vmetadata, :key) AS jsonb)"
+        else:
+            text_column, metadata_column = "text", "vmetadata"
+
+        candidates = limit * self.rescore_multiplier
+        statement = text(
+            f"""
+            SELECT id, {text_column} AS text, {metadata_column} AS vmetadata, distance
+            FROM (
+                SELECT id, text, vmetadata,
+                    vector <=> CAST(:vector AS {vector_type}) AS distance
+                FROM document_chunk
+                WHERE collection_name = :collection_name
+                ORDER BY {self._get_quantized_expression()} {operator} {first_pass}
+                LIMIT :candidates
+            ) candidates
+            ORDER BY distance
+            LIMIT :limit
+        """
+        )
+
+        # Exact search over the rows of the collection, materialized so the
+        # filter runs before any index scan
+        exact_statement = text(
+            f"""
+            WITH chunks AS MATERIALIZED (
+                SELECT id, text, vmetadata, vector
+                FROM document_chunk
+                WHERE collection_name = :collection_name
+            )
+            SELECT id, {text_column} AS text, {metadata_column} AS vmetadata,
+                vector <=> CAST(:vector AS {vector_type}) AS distance
+            FROM chunks
+            ORDER BY distance
+            LIMIT :limit
+        """
+        )
+
+        # HNSW scans return at most ef_search rows
+        self.session.execute(text(f"SET LOCAL hnsw.ef_search = {max(candidates, 40)}"))
+        # The index spans every collection and the collection filter is applied
+        # to what the scan returns. Iterative scans (pgvector >= 0.8) keep
+        # scanning until enough rows pass it, the rescoring reorders them anyway
+        if self.supports_iterative_scan:
+            self.session.execute(text("SET LOCAL hnsw.iterative_scan = relaxed_order"))
+
+        ids, distances, documents, metadatas = [], [], [], []
+        for vector in vectors:
+            vector = self.adjust_vector_length(vector)
+            params = {
+                "vector": f"[{','.join(str(float(x)) for x in vector)}]",
+                "collection_name": collection_name,
+                "candidates": candidates,
+                "limit": limit,
+            }
+            if PGVECTOR_PGCRYPTO:
+                params["key"] = PGVECTOR_PGCRYPTO_KEY
+
+            rows = self.session.execute(statement, params).all()
+            if len(rows) < limit:
+                # The scan ran out before enough rows of the collection turned
+                # up, or the collection is smaller than limit
+                rows = self.session.execute(exact_statement, params).all()
+            ids.append([row.id for row in rows])
+            # normalize and re-orders pgvec distance from [2, 0] to [0, 1] score range
+            distances.append([(2.0 - row.distance) / 2.0 for row in rows])
+            documents.append([row.text for row in rows])
+            metadatas.append([row.vmetadata for row in rows])
+
+        self.session.rollback()  # read-only transaction
+        return SearchResult(
+            ids=ids, distances=distances, documents=documents, metadatas=metadatas
+        )
+
     def query(
         self, collection_name: str, filter: Dict[str, Any], limit: Optional[int] = None
     ) -> Optional[GetResult]:
@@ -640,6 +898,119 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during get: {e}")
             return None
 
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[Dict[str, Any]] = None,
+        ids: Optional[List[str]] = None,
+    ) -> Optional[List[VectorItem]]:
+        try:
+            if PGVECTOR_PGCRYPTO:
+                metadata_column = pgcrypto_decrypt(
+                    DocumentChunk.vmetadata, PGVECTOR_PGCRYPTO_KEY, JSONB
+                )
+                text_column = pgcrypto_decrypt(
+                    DocumentChunk.text, PGVECTOR_PGCRYPTO_KEY, Text
+                )
+            else:
+                metadata_column = DocumentChunk.vmetadata
+                text_column = DocumentChunk.text
+
+            stmt = select(
+                DocumentChunk.id,
+                DocumentChunk.vector,
+                text_column.label("text"),
+                metadata_column.label("vmetadata"),
+            ).where(DocumentChunk.collection_name == collection_name)
+            for key, value in (filter or {}).items():
+                stmt = stmt.where(metadata_column[key].astext == str(value))
+            if ids is not None:
+                stmt = stmt.where(DocumentChunk.id.in_(ids))
+
+            results = self.session.execute(stmt).all()
+            self.session.rollback()  # read-only transaction
+
+            return [
+                {
+                    "id": row.id,
+                    "text": row.text,
+                    "vector": [float(x) for x in row.vector],
+                    "metadata": row.vmetadata,
+                }
+                for row in results
+            ]
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during get_with_vectors: {e}")
+            return None
+
+    def copy_items(
+        self,
+        source_collection_name: str,
+        target_collection_name: str,
+        filter: Optional[Dict] = None,
+        metadata: Optional[Dict] = None,
+    ) -> Optional[List[VectorItem]]:
+        if PGVECTOR_PGCRYPTO:
+            # Metadata has to be decrypted to be merged, copy through Python
+            return super().copy_items(
+                source_collection_name,
+                target_collection_name,
+                filter=filter,
+                metadata=metadata,
+            )
+
+        try:
+            # Copy the rows server-side so the vectors never leave the database
+            conditions = []
+            params = {
+                "source": source_collection_name,
+                "target": target_collection_name,
+                "metadata": json.dumps(process_metadata(metadata or {})),
+            }
+            for idx, (key, value) in enumerate((filter or {}).items()):
+                conditions.append(f"AND vmetadata->>:key_{idx} = :value_{idx}")
+                params[f"key_{idx}"] = key
+                params[f"value_{idx}"] = str(value)
+
+            results = self.session.execute(
+                text(
+                    f"""
+                    INSERT INTO document_chunk
+                    (id, vector, collection_name, text, vmetadata)
+                    SELECT
+                        gen_random_uuid()::text, vector, :target, text,
+                        COALESCE(vmetadata, '{{}}'::jsonb) || CAST(:metadata AS jsonb)
+                    FROM document_chunk
+                    WHERE collection_name = :source {" ".join(conditions)}
+                    RETURNING id, text, vmetadata
+                """
+                ),
+                params,
+            ).all()
+            self.session.commit()
+
+            if not results:
+                return None
+
+            log.info(
+                f"Copied {len(results)} items from '{source_collection_name}' to '{target_collection_name}'."
+            )
+            # Vectors are left out, callers only need ids, text and metadata
+            return [
+                {
+                    "id": row.id,
+                    "text": row.text,
+                    "vector": [],
+                    "metadata": row.vmetadata,
+                }
+                for row in results
+            ]
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error during copy_items: {e}")
+            return None
+
     def delete(
         self,
         collection_name: str,
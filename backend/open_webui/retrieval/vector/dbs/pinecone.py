@@ -407,43 +407,37 @@ class PineconeClient(VectorDBBase):
         if limit is None or limit <= 0:
             limit = NO_LIMIT
 
-        try:
-            # Search using the first vector (assuming this is the intended behavior)
-            query_vector = vectors[0]
-
-            # Perform the search
+        def query_vector(vector):
             query_response = self.index.query(
-                vector=query_vector,
+                vector=vector,
                 top_k=limit,
                 include_metadata=True,
                 filter={"collection_name": collection_name_with_prefix},
             )
+            return getattr(query_response, "matches", []) or []
 
-            matches = getattr(query_response, "matches", []) or []
-            if not matches:
-                # Return empty result if no matches
-                return SearchResult(
-                    ids=[[]],
-                    documents=[[]],
-                    metadatas=[[]],
-                    distances=[[]],
+        try:
+            # Pinecone takes one vector per query, run them concurrently
+            ids, documents, metadatas, distances = [], [], [], []
+            for matches in self._executor.map(query_vector, vectors):
+                # Convert to GetResult format
+                get_result = self._result_to_get_result(matches)
+                ids.extend(get_result.ids)
+                documents.extend(get_result.documents)
+                metadatas.extend(get_result.metadatas)
+
+                # Calculate normalized distances based on metric
+                distances.append(
+                    [
+                        self._normalize_distance(getattr(match, "score", 0.0))
+                        for match in matches
+                    ]
                 )
 
-            # Convert to GetResult format
-            get_result = self._result_to_get_result(matches)
-
-            # Calculate normalized distances based on metric
-            distances = [
-                [
-                    self._normalize_distance(getattr(match, "score", 0.0))
-                    for match in matches
-                ]
-            ]
-
             return SearchResult(
-                ids=get_result.ids,
-                documents=get_result.documents,
-                metadatas=get_result.metadatas,
+                ids=ids,
+                documents=documents,
+                metadatas=metadatas,
                 distances=distances,
             )
         except Exception as e:
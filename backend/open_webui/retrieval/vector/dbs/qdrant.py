@@ -153,18 +153,31 @@ class QdrantClient(VectorDBBase):
         if limit is None:
             limit = NO_LIMIT  # otherwise qdrant would set limit to 10!
 
-        query_response = self.client.query_points(
+        # All query vectors go out in a single request
+        query_responses = self.client.query_batch_points(
             collection_name=f"{self.collection_prefix}_{collection_name}",
-            query=vectors[0],
-            limit=limit,
+            requests=[
+                models.QueryRequest(query=vector, limit=limit, with_payload=True)
+                for vector in vectors
+            ],
         )
-        get_result = self._result_to_get_result(query_response.points)
-        return SearchResult(
-            ids=get_result.ids,
-            documents=get_result.documents,
-            metadatas=get_result.metadatas,
+
+        ids, documents, metadatas, distances = [], [], [], []
+        for query_response in query_responses:
+            get_result = self._result_to_get_result(query_response.points)
+            ids.extend(get_result.ids)
+            documents.extend(get_result.documents)
+            metadatas.extend(get_result.metadatas)
             # qdrant distance is [-1, 1], normalize to [0, 1]
-            distances=[[(point.score + 1.0) / 2.0 for point in query_response.points]],
+            distances.append(
+                [(point.score + 1.0) / 2.0 for point in query_response.points]
+            )
+
+        return SearchResult(
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            distances=distances,
         )
 
     def query(self, collection_name: str, filter: dict, limit: Optional[int] = None):
@@ -201,6 +214,61 @@ class QdrantClient(VectorDBBase):
         )
         return self._result_to_get_result(points[0])
 
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[dict] = None,
+        ids: Optional[list[str]] = None,
+    ) -> Optional[list[VectorItem]]:
+        # Get the points along with their stored vectors.
+        if not self.has_collection(collection_name):
+            return None
+        try:
+            if ids is not None:
+                points = self.client.retrieve(
+                    collection_name=f"{self.collection_prefix}_{collection_name}",
+                    ids=ids,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                return [
+                    {
+                        "id": str(point.id),
+                        "text": point.payload["text"],
+                        "vector": point.vector,
+                        "metadata": point.payload["metadata"],
+                    }
+                    for point in points
+                ]
+
+            field_conditions = [
+                models.FieldCondition(
+                    key=f"metadata.{key}", match=models.MatchValue(value=value)
+                )
+                for key, value in (filter or {}).items()
+            ]
+
+            points = self.client.scroll(
+                collection_name=f"{self.collection_prefix}_{collection_name}",
+                scroll_filter=(
+                    models.Filter(must=field_conditions) if field_conditions else None
+                ),
+                limit=NO_LIMIT,  # otherwise qdrant would set limit to 10!
+                with_vectors=True,
+            )
+            return [
+                {
+                    "id": str(point.id),
+                    "text": point.payload["text"],
+                    "vector": point.vector,
+                    "metadata": point.payload["metadata"],
+                }
+                for point in points[0]
+            ]
+        except Exception as e:
+            log.exception(f"Error getting vectors from '{collection_name}': {e}")
+            return None
+
     def insert(self, collection_name: str, items: list[VectorItem]):
         # Insert the items into the collection, if the collection does not exist, it will be created.
         self._create_collection_if_not_exists(collection_name, len(items[0]["vector"]))
@@ -47,6 +47,8 @@ def _convert_uuids_to_strings(obj: Any) -> Any:
 
 
 class WeaviateClient(VectorDBBase):
+    supports_hybrid_search = True
+
     def __init__(self):
         self.url = WEAVIATE_HTTP_HOST
         try:
@@ -222,6 +224,66 @@ class WeaviateClient(VectorDBBase):
             }
         )
 
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        alpha: float = 0.5,
+    ) -> Optional[SearchResult]:
+        sane_collection_name = self._sanitize_collection_name(collection_name)
+        if not self.client.collections.exists(sane_collection_name):
+            return None
+
+        collection = self.client.collections.get(sane_collection_name)
+
+        result_ids, result_documents, result_metadatas, result_distances = (
+            [],
+            [],
+            [],
+            [],
+        )
+
+        for vector_embedding in vectors:
+            try:
+                # BM25 on the text property fused with the vector search
+                response = collection.query.hybrid(
+                    query=query_text,
+                    vector=vector_embedding,
+                    alpha=alpha,
+                    limit=limit,
+                    return_metadata=weaviate.classes.query.MetadataQuery(score=True),
+                )
+            except Exception:
+                return None
+
+            documents = []
+            metadatas = []
+            for obj in response.objects:
+                properties = dict(obj.properties) if obj.properties else {}
+                documents.append(properties.pop("text", ""))
+                metadatas.append(_convert_uuids_to_strings(properties))
+
+            result_ids.append([str(obj.uuid) for obj in response.objects])
+            result_documents.append(documents)
+            result_metadatas.append(metadatas)
+            result_distances.append(
+                [
+                    obj.metadata.score if obj.metadata and obj.metadata.score else 0.0
+                    for obj in response.objects
+                ]
+            )
+
+        return SearchResult(
+            **{
+                "ids": result_ids,
+                "documents": result_documents,
+                "metadatas": result_metadatas,
+                "distances": result_distances,
+            }
+        )
+
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
     ) -> Optional[GetResult]:
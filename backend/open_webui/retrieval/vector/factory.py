@@ -71,6 +71,10 @@ class Vector:
                 from open_webui.retrieval.vector.dbs.weaviate import WeaviateClient
 
                 return WeaviateClient()
+            case VectorType.MMAP:
+                from open_webui.retrieval.vector.dbs.mmap import MmapClient
+
+                return MmapClient()
             case _:
                 raise ValueError(f"Unsupported vector type: {vector_type}")
 
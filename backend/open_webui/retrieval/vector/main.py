@@ -1,3 +1,5 @@
+import uuid
+
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Union
@@ -20,6 +22,36 @@ class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+def fuse_search_results(
+    results: List[Optional[SearchResult]], weights: List[float], limit: int, c: int = 60
+) -> SearchResult:
+    """
+    Merge the first query of each search result with weighted reciprocal rank
+    fusion, the same scoring the in-process EnsembleRetriever uses. The fused
+    scores are returned as distances.
+    """
+    scores, items = {}, {}
+    for result, weight in zip(results, weights):
+        if not result or not result.ids or weight <= 0:
+            continue
+
+        for rank, id in enumerate(result.ids[0], start=1):
+            scores[id] = scores.get(id, 0.0) + weight / (rank + c)
+            if id not in items:
+                items[id] = (
+                    result.documents[0][rank - 1],
+                    result.metadatas[0][rank - 1],
+                )
+
+    ids = sorted(scores, key=scores.get, reverse=True)[:limit]
+    return SearchResult(
+        ids=[ids],
+        distances=[[scores[id] for id in ids]],
+        documents=[[items[id][0] for id in ids]],
+        metadatas=[[items[id][1] for id in ids]],
+    )
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -31,6 +63,15 @@ class VectorDBBase(ABC):
     implement all abstract methods.
     """
 
+    # Set by backends that run hybrid_search natively
+    supports_hybrid_search: bool = False
+
+    # Quantized first-pass search ("int8" or "binary") on backends that support
+    # it, the top limit * rescore_multiplier candidates are rescored against
+    # the stored vectors. None searches the stored vectors directly.
+    quantization: Optional[str] = None
+    rescore_multiplier: int = 4
+
     @abstractmethod
     def has_collection(self, collection_name: str) -> bool:
         """Check if the collection exists in the vector DB."""
@@ -58,6 +99,31 @@ class VectorDBBase(ABC):
         """Search for similar vectors in a collection."""
         pass
 
+    def hybrid_search(
+        self,
+        collection_name: str,
+        query_text: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        alpha: float = 0.5,
+    ) -> Optional[SearchResult]:
+        """
+        Combined keyword (BM25 / full-text) and vector search run by the
+        database itself. alpha weights the vector side, 1.0 being pure vector
+        and 0.0 pure keyword search. Backends without native hybrid search
+        return None and callers fall back to the in-process BM25 index.
+        """
+        return None
+
+    def create_quantized_index(self) -> bool:
+        """
+        Build the index the quantized first pass searches, on backends that
+        keep one in the database. This can take long on large tables, so it
+        is an admin action rather than part of startup. Returns False when
+        the backend has nothing to build.
+        """
+        return False
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
@@ -70,6 +136,48 @@ class VectorDBBase(ABC):
         """Retrieve all vectors from a collection."""
         pass
 
+    def get_with_vectors(
+        self,
+        collection_name: str,
+        filter: Optional[Dict] = None,
+        ids: Optional[List[str]] = None,
+    ) -> Optional[List[VectorItem]]:
+        """
+        Retrieve items together with their stored vectors, optionally filtered
+        by metadata or restricted to the given ids. Backends that can't read
+        vectors back return None.
+        """
+        return None
+
+    def copy_items(
+        self,
+        source_collection_name: str,
+        target_collection_name: str,
+        filter: Optional[Dict] = None,
+        metadata: Optional[Dict] = None,
+    ) -> Optional[List[VectorItem]]:
+        """
+        Copy items and their stored vectors into another collection under new
+        ids, merging metadata into each item. Returns the copied items (server
+        side copies may leave out the vectors), or None when nothing could be
+        copied and the caller has to embed the documents again.
+        """
+        items = self.get_with_vectors(source_collection_name, filter=filter)
+        if not items:
+            return None
+
+        items = [
+            {
+                "id": str(uuid.uuid4()),
+                "text": item["text"],
+                "vector": item["vector"],
+                "metadata": {**(item["metadata"] or {}), **(metadata or {})},
+            }
+            for item in items
+        ]
+        self.insert(collection_name=target_collection_name, items=items)
+        return items
+
     @abstractmethod
     def delete(
         self,
@@ -27,6 +27,7 @@ from fastapi.responses import FileResponse, StreamingResponse
 from open_webui.constants import ERROR_MESSAGES
 from open_webui.env import SRC_LOG_LEVELS
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEXES
 
 from open_webui.models.users import Users
 from open_webui.models.files import (
@@ -40,8 +41,9 @@ from open_webui.models.groups import Groups
 
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.routers.retrieval import ProcessFileForm, aprocess_file
 from open_webui.routers.audio import transcribe
+from open_webui.ingestion import IngestionJob, get_job_priority
 
 from open_webui.storage.provider import Storage
 
@@ -100,45 +102,53 @@ def has_access_to_file(
 ############################
 
 
-def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
-    try:
-        if file.content_type:
-            stt_supported_content_types = getattr(
-                request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-            )
+async def aprocess_uploaded_file(request, file_item, file_metadata, user):
+    """Extract, or transcribe, and embed an uploaded file. Raises on failure."""
+    content_type = file_item.meta.get("content_type")
+    if content_type:
+        stt_supported_content_types = getattr(
+            request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
+        )
 
-            if any(
-                fnmatch(file.content_type, content_type)
-                for content_type in (
-                    stt_supported_content_types
-                    if stt_supported_content_types
-                    and any(t.strip() for t in stt_supported_content_types)
-                    else ["audio/*", "video/webm"]
-                )
-            ):
-                file_path = Storage.get_file(file_path)
-                result = transcribe(request, file_path, file_metadata, user)
+        if any(
+            fnmatch(content_type, stt_content_type)
+            for stt_content_type in (
+                stt_supported_content_types
+                if stt_supported_content_types
+                and any(t.strip() for t in stt_supported_content_types)
+                else ["audio/*", "video/webm"]
+            )
+        ):
+            file_path = await asyncio.to_thread(Storage.get_file, file_item.path)
+            result = await asyncio.to_thread(
+                transcribe, request, file_path, file_metadata, user
+            )
 
-                process_file(
-                    request,
-                    ProcessFileForm(
-                        file_id=file_item.id, content=result.get("text", "")
-                    ),
-                    user=user,
-                )
-            elif (not file.content_type.startswith(("image/", "video/"))) or (
-                request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-            ):
-                process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
-            else:
-                raise Exception(
-                    f"File type {file.content_type} is not supported for processing"
-                )
+            await aprocess_file(
+                request,
+                ProcessFileForm(file_id=file_item.id, content=result.get("text", "")),
+                user=user,
+            )
+        elif (not content_type.startswith(("image/", "video/"))) or (
+            request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
+        ):
+            await aprocess_file(
+                request, ProcessFileForm(file_id=file_item.id), user=user
+            )
         else:
-            log.info(
-                f"File type {file.content_type} is not provided, but trying to process anyway"
+            raise ValueError(
+                f"File type {content_type} is not supported for processing"
             )
-            process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+    else:
+        log.info(
+            f"File type {content_type} is not provided, but trying to process anyway"
+        )
+        await aprocess_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+
+
+def process_uploaded_file(request, file_item, file_metadata, user):
+    try:
+        asyncio.run(aprocess_uploaded_file(request, file_item, file_metadata, user))
     except Exception as e:
         log.error(f"Error processing file: {file_item.id}")
         Files.update_file_data_by_id(
@@ -265,21 +275,21 @@ def upload_file_handler(
 
         if process:
             if background_tasks and process_in_background:
+                # Queued once the response is sent, large files behind the
+                # small ones
                 background_tasks.add_task(
-                    process_uploaded_file,
-                    request,
-                    file,
-                    file_path,
-                    file_item,
-                    file_metadata,
-                    user,
+                    request.app.state.ingestion_queue.enqueue,
+                    IngestionJob(
+                        file_id=file_item.id,
+                        user_id=user.id,
+                        metadata=file_metadata,
+                        priority=get_job_priority(len(contents)),
+                    ),
                 )
                 return {"status": True, **file_item.model_dump()}
             else:
                 process_uploaded_file(
                     request,
-                    file,
-                    file_path,
                     file_item,
                     file_metadata,
                     user,
@@ -376,6 +386,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            BM25_INDEXES.reset()
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -420,9 +431,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
 
 
 @router.get("/{id}/process/status")
-async def get_file_process_status(
-    id: str, stream: bool = Query(False), user=Depends(get_verified_user)
-):
+async def get_file_process_status(id: str, user=Depends(get_verified_user)):
     file = Files.get_file_by_id(id)
 
     if not file:
@@ -436,39 +445,17 @@ async def get_file_process_status(
         or user.role == "admin"
         or has_access_to_file(id, "read", user)
     ):
-        if stream:
-            MAX_FILE_PROCESSING_DURATION = 3600 * 2
-
-            async def event_stream(file_item):
-                if file_item:
-                    for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
-                        if file_item:
-                            data = file_item.model_dump().get("data", {})
-                            status = data.get("status")
-
-                            if status:
-                                event = {"status": status}
-                                if status == "failed":
-                                    event["error"] = data.get("error")
-
-                                yield f"data: {json.dumps(event)}\n\n"
-                                if status in ("completed", "failed"):
-                                    break
-                            else:
-                                # Legacy
-                                break
-
-                        await asyncio.sleep(0.5)
-                else:
-                    yield f"data: {json.dumps({'status': 'not_found'})}\n\n"
-
-            return StreamingResponse(
-                event_stream(file),
-                media_type="text/event-stream",
-            )
-        else:
-            return {"status": file.data.get("status", "pending")}
+        # Updates while the file is processed are pushed over the socket as
+        # "events:file"; this is the stored status, for clients catching up
+        data = file.data or {}
+        result = {"status": data.get("status", "pending")}
+        if data.get("progress") is not None:
+            # Chunks stored so far
+            result["progress"] = data["progress"]
+        if result["status"] == "failed":
+            result["error"] = data.get("error")
+
+        return result
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -531,7 +518,7 @@ async def update_file_data_content_by_id(
         or has_access_to_file(id, "write", user)
     ):
         try:
-            process_file(
+            await aprocess_file(
                 request,
                 ProcessFileForm(file_id=id, content=form_data.content),
                 user=user,
@@ -756,6 +743,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
             try:
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
+                BM25_INDEXES.invalidate(f"file-{id}")
             except Exception as e:
                 log.exception(e)
                 log.error("Error deleting files")
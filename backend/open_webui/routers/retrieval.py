@@ -9,7 +9,7 @@ import re
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Iterator, List, Optional, Sequence, Union
+from typing import Callable, Iterator, List, Optional, Sequence, Union
 
 from fastapi import (
     Depends,
@@ -38,6 +38,8 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.bm25 import BM25_INDEXES
+from open_webui.retrieval.embedding_cache import EMBEDDING_CACHE
 
 # Document loaders
 from open_webui.retrieval.loaders.main import Loader
@@ -74,6 +76,7 @@ from open_webui.retrieval.web.external import search_external
 from open_webui.retrieval.utils import (
     get_content_from_url,
     get_embedding_function,
+    get_embedding_model_id,
     get_reranking_function,
     get_model_path,
     query_collection,
@@ -97,6 +100,8 @@ from open_webui.config import (
     DEFAULT_LOCALE,
     RAG_EMBEDDING_CONTENT_PREFIX,
     RAG_EMBEDDING_QUERY_PREFIX,
+    RAG_INGESTION_BATCH_SIZE,
+    RAG_INGESTION_QUEUE_SIZE,
 )
 from open_webui.env import (
     SRC_LOG_LEVELS,
@@ -109,6 +114,7 @@ from open_webui.env import (
 )
 
 from open_webui.constants import ERROR_MESSAGES
+from open_webui.ingestion import emit_file_status
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
@@ -259,6 +265,7 @@ async def get_embedding_config(request: Request, user=Depends(get_admin_user)):
         "RAG_EMBEDDING_ENGINE": request.app.state.config.RAG_EMBEDDING_ENGINE,
         "RAG_EMBEDDING_MODEL": request.app.state.config.RAG_EMBEDDING_MODEL,
         "RAG_EMBEDDING_BATCH_SIZE": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+        "RAG_EMBEDDING_DIMENSIONS": request.app.state.config.RAG_EMBEDDING_DIMENSIONS,
         "ENABLE_ASYNC_EMBEDDING": request.app.state.config.ENABLE_ASYNC_EMBEDDING,
         "openai_config": {
             "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
@@ -299,6 +306,7 @@ class EmbeddingModelUpdateForm(BaseModel):
     RAG_EMBEDDING_ENGINE: str
     RAG_EMBEDDING_MODEL: str
     RAG_EMBEDDING_BATCH_SIZE: Optional[int] = 1
+    RAG_EMBEDDING_DIMENSIONS: Optional[int] = None
     ENABLE_ASYNC_EMBEDDING: Optional[bool] = True
 
 
@@ -334,6 +342,10 @@ async def update_embedding_config(
         request.app.state.config.ENABLE_ASYNC_EMBEDDING = (
             form_data.ENABLE_ASYNC_EMBEDDING
         )
+        if form_data.RAG_EMBEDDING_DIMENSIONS is not None:
+            request.app.state.config.RAG_EMBEDDING_DIMENSIONS = (
+                form_data.RAG_EMBEDDING_DIMENSIONS
+            )
 
         if request.app.state.config.RAG_EMBEDDING_ENGINE in [
             "ollama",
@@ -401,6 +413,7 @@ async def update_embedding_config(
                 else None
             ),
             enable_async=request.app.state.config.ENABLE_ASYNC_EMBEDDING,
+            embedding_dimensions=request.app.state.config.RAG_EMBEDDING_DIMENSIONS,
         )
 
         return {
@@ -408,6 +421,7 @@ async def update_embedding_config(
             "RAG_EMBEDDING_ENGINE": request.app.state.config.RAG_EMBEDDING_ENGINE,
             "RAG_EMBEDDING_MODEL": request.app.state.config.RAG_EMBEDDING_MODEL,
             "RAG_EMBEDDING_BATCH_SIZE": request.app.state.config.RAG_EMBEDDING_BATCH_SIZE,
+            "RAG_EMBEDDING_DIMENSIONS": request.app.state.config.RAG_EMBEDDING_DIMENSIONS,
             "ENABLE_ASYNC_EMBEDDING": request.app.state.config.ENABLE_ASYNC_EMBEDDING,
             "openai_config": {
                 "url": request.app.state.config.RAG_OPENAI_API_BASE_URL,
@@ -1230,7 +1244,20 @@ async def update_rag_config(
 ####################################
 
 
-def save_docs_to_vector_db(
+def get_chunk_embedding_config(request: Request) -> dict:
+    # Stored with every chunk, vectors are only comparable under the same config
+    embedding_config = {
+        "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
+        "model": request.app.state.config.RAG_EMBEDDING_MODEL,
+    }
+    if request.app.state.config.RAG_EMBEDDING_DIMENSIONS:
+        embedding_config["dimensions"] = (
+            request.app.state.config.RAG_EMBEDDING_DIMENSIONS
+        )
+    return embedding_config
+
+
+async def asave_docs_to_vector_db(
     request: Request,
     docs,
     collection_name,
@@ -1239,7 +1266,28 @@ def save_docs_to_vector_db(
     split: bool = True,
     add: bool = False,
     user=None,
+    resume_from: Optional[int] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    diff: bool = False,
 ) -> bool:
+    """
+    Split, embed and store documents as a pipeline of bounded batches, so
+    memory use doesn't grow with the document and chunks land in the vector
+    DB while later ones are still being embedded. progress_callback is called
+    with the number of chunks stored so far; after a failure, passing that
+    number back as resume_from skips the chunks already stored. When the
+    chunks have stable ids (metadata["hash"] without diff), a resumed run
+    counts the chunks actually present instead, as the last reported number
+    can trail the writes.
+
+    With diff, the documents replace the chunks the collection holds for
+    metadata["file_id"]: chunks whose text is already stored keep their row
+    and vector, only new chunks are embedded, and the rest are deleted by id.
+
+    Runs on the caller's event loop, only the blocking vector DB calls and the
+    splitting are moved to worker threads.
+    """
+
     def _get_docs_info(docs: list[Document]) -> str:
         docs_info = set()
 
@@ -1256,19 +1304,30 @@ def save_docs_to_vector_db(
 
         return ", ".join(docs_info)
 
-    log.debug(
-        f"save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}"
-    )
+    # Streamed documents are read once, by the pipeline below
+    if isinstance(docs, list):
+        log.debug(
+            f"save_docs_to_vector_db: document {_get_docs_info(docs)} {collection_name}"
+        )
 
-    # Check if entries with the same hash (metadata.hash) already exist
-    if metadata and "hash" in metadata:
-        result = VECTOR_DB_CLIENT.query(
+    # Check if entries with the same hash (metadata.hash) already exist,
+    # a resumed ingestion finds its own chunks
+    if metadata and "hash" in metadata and resume_from is None:
+        result = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.query,
             collection_name=collection_name,
             filter={"hash": metadata["hash"]},
         )
 
         if result is not None:
             existing_doc_ids = result.ids[0]
+            if diff:
+                # The file's own chunks are the ones being replaced
+                existing_doc_ids = [
+                    id
+                    for id, doc_metadata in zip(result.ids[0], result.metadatas[0])
+                    if (doc_metadata or {}).get("file_id") != metadata.get("file_id")
+                ]
             if existing_doc_ids:
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
@@ -1280,7 +1339,6 @@ def save_docs_to_vector_db(
                 chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
                 add_start_index=True,
             )
-            docs = text_splitter.split_documents(docs)
         elif request.app.state.config.TEXT_SPLITTER == "token":
             log.info(
                 f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
@@ -1293,10 +1351,16 @@ def save_docs_to_vector_db(
                 chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
                 add_start_index=True,
             )
-            docs = text_splitter.split_documents(docs)
         elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
             log.info("Using markdown header text splitter")
+        else:
+            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
 
+    def split_docs(docs) -> Iterator[Document]:
+        # Documents are split one at a time, as the pipeline asks for chunks
+        if not split:
+            yield from docs
+        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
             # Define headers to split on - covering most common markdown header levels
             headers_to_split_on = [
                 ("#", "Header 1"),
@@ -1312,7 +1376,6 @@ def save_docs_to_vector_db(
                 strip_headers=False,  # Keep headers in content for context
             )
 
-            md_split_docs = []
             for doc in docs:
                 md_header_splits = markdown_splitter.split_text(doc.page_content)
                 text_splitter = RecursiveCharacterTextSplitter(
@@ -1332,45 +1395,97 @@ def save_docs_to_vector_db(
                                 split_chunk.metadata[header_meta_key_name]
                             )
 
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
+                    yield Document(
+                        page_content=split_chunk.page_content,
+                        metadata={**doc.metadata, "headings": headings_list},
                     )
-
-            docs = md_split_docs
         else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+            for doc in docs:
+                yield from text_splitter.split_documents([doc])
 
-    if len(docs) == 0:
-        raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    embedding_config = get_chunk_embedding_config(request)
 
-    texts = [doc.page_content for doc in docs]
-    metadatas = [
-        {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
-        }
-        for doc in docs
-    ]
+    def get_item_id(idx: int) -> str:
+        # Chunk ids are stable per document, so a resumed ingestion writes
+        # over the same rows instead of duplicating them
+        if metadata and "hash" in metadata and not diff:
+            return str(
+                uuid.uuid5(
+                    uuid.NAMESPACE_OID, f"{collection_name}:{metadata['hash']}:{idx}"
+                )
+            )
+        return str(uuid.uuid4())
+
+    def get_stored_count() -> int:
+        # Batches are written in order, so the stored chunks are the ones
+        # before the first id missing from the collection
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name, filter={"hash": metadata["hash"]}
+        )
+        stored_ids = set(result.ids[0]) if result else set()
+        count = 0
+        while get_item_id(count) in stored_ids:
+            count += 1
+        return count
+
+    # With diff, the file's stored chunks by text, and the ones whose vectors
+    # came from another embedding model
+    stored: dict[str, list[dict]] = {}
+    stale_ids: list[str] = []
+    reused = 0
 
     try:
-        if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
+        if await asyncio.to_thread(
+            VECTOR_DB_CLIENT.has_collection, collection_name=collection_name
+        ):
             log.info(f"collection {collection_name} already exists")
 
             if overwrite:
-                VECTOR_DB_CLIENT.delete_collection(collection_name=collection_name)
+                await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.delete_collection, collection_name=collection_name
+                )
+                BM25_INDEXES.invalidate(collection_name)
                 log.info(f"deleting existing collection {collection_name}")
+                resume_from = None
+            elif diff:
+                items = await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.get_with_vectors,
+                    collection_name=collection_name,
+                    filter={"file_id": metadata["file_id"]},
+                )
+                if items is None:
+                    # The backend can't read vectors back, replace every chunk
+                    await asyncio.to_thread(
+                        VECTOR_DB_CLIENT.delete,
+                        collection_name=collection_name,
+                        filter={"file_id": metadata["file_id"]},
+                    )
+                    BM25_INDEXES.delete(
+                        collection_name, filter={"file_id": metadata["file_id"]}
+                    )
+                    items = []
+
+                for item in items:
+                    if (
+                        item["vector"] is not None
+                        and (item["metadata"] or {}).get("embedding_config")
+                        == embedding_config
+                    ):
+                        stored.setdefault(item["text"], []).append(item)
+                    else:
+                        stale_ids.append(item["id"])
+            elif resume_from is not None:
+                if metadata and "hash" in metadata:
+                    resume_from = await asyncio.to_thread(get_stored_count)
+                log.info(f"resuming {collection_name} after {resume_from} items")
             elif add is False:
                 log.info(
                     f"collection {collection_name} already exists, overwrite is False and add is False"
                 )
                 return True
+        elif resume_from:
+            # Nothing the earlier run stored is left
+            resume_from = 0
 
         log.info(f"generating embeddings for {collection_name}")
         embedding_function = get_embedding_function(
@@ -1401,41 +1516,321 @@ def save_docs_to_vector_db(
                 if request.app.state.config.RAG_EMBEDDING_ENGINE == "azure_openai"
                 else None
             ),
+            query_cache=False,
+            embedding_dimensions=request.app.state.config.RAG_EMBEDDING_DIMENSIONS,
         )
 
-        # Run async embedding in sync context
-        embeddings = asyncio.run(
-            embedding_function(
-                list(map(lambda x: x.replace("\n", " "), texts)),
-                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-                user=user,
-            )
+        # Only chunks without a cached vector go to the embedding backend
+        embedding_function = EMBEDDING_CACHE.wrap(
+            embedding_function,
+            request.app.state.config.RAG_EMBEDDING_ENGINE,
+            get_embedding_model_id(
+                request.app.state.config.RAG_EMBEDDING_MODEL,
+                request.app.state.config.RAG_EMBEDDING_DIMENSIONS,
+            ),
         )
-        log.info(f"embeddings generated {len(embeddings)} for {len(texts)} items")
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+        def get_batches() -> Iterator[list[tuple[int, Document]]]:
+            batch = []
+            for idx, doc in enumerate(split_docs(docs)):
+                if idx < resume_from:
+                    # Stored by an earlier, interrupted run
+                    continue
+                batch.append((idx, doc))
+                if len(batch) >= RAG_INGESTION_BATCH_SIZE:
+                    yield batch
+                    batch = []
+            if batch:
+                yield batch
+
+        # split -> embed -> insert, the embedding of the next batch runs while
+        # the previous one is written, and the bounded queue stops the
+        # embedding from running ahead of the writes
+        queue = asyncio.Queue(maxsize=max(RAG_INGESTION_QUEUE_SIZE, 1))
+        errors = []
+        resume = resume_from is not None
+        resume_from = resume_from or 0
+        count = resume_from
+
+        def write(items: list[dict]):
+            if diff or (count == resume_from and resume):
+                # The interrupted batch may have been partially written
+                VECTOR_DB_CLIENT.upsert(collection_name=collection_name, items=items)
+            else:
+                VECTOR_DB_CLIENT.insert(collection_name=collection_name, items=items)
+            BM25_INDEXES.add(collection_name, items)
+
+        async def writer():
+            nonlocal count
+            while (items := await queue.get()) is not None:
+                if errors:
+                    # Drain the queue so the embedding side never blocks
+                    continue
+                try:
+                    await asyncio.to_thread(write, items)
+                    count += len(items)
+                    if progress_callback:
+                        await asyncio.to_thread(progress_callback, count)
+                except Exception as e:
+                    errors.append(e)
 
-        log.info(f"adding to collection {collection_name}")
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+        batches = get_batches()
+        writer_task = asyncio.create_task(writer())
+        try:
+            # Splitting is CPU bound, keep it off the event loop
+            while batch := await asyncio.to_thread(next, batches, None):
+                if errors:
+                    break
+
+                items = []
+                for idx, doc in batch:
+                    item = {
+                        "id": get_item_id(idx),
+                        "text": doc.page_content,
+                        "vector": None,
+                        "metadata": {
+                            **doc.metadata,
+                            **(metadata if metadata else {}),
+                            "embedding_config": embedding_config,
+                        },
+                    }
+                    if stored.get(item["text"]):
+                        # Unchanged chunk, only rewritten if its metadata moved
+                        previous = stored[item["text"]].pop(0)
+                        item["id"], item["vector"] = previous["id"], previous["vector"]
+                        reused += 1
+                        if previous["metadata"] == item["metadata"]:
+                            continue
+                    items.append(item)
+
+                missing = [item for item in items if item["vector"] is None]
+                if missing:
+                    embeddings = await embedding_function(
+                        [item["text"].replace("\n", " ") for item in missing],
+                        prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                        user=user,
+                    )
+                    for item, embedding in zip(missing, embeddings):
+                        item["vector"] = embedding
+
+                if items:
+                    await queue.put(items)
+        finally:
+            await queue.put(None)
+            await writer_task
+
+        if errors:
+            raise errors[0]
+        if count == 0 and not reused:
+            raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+
+        if diff:
+            removed_ids = stale_ids + [
+                item["id"] for items in stored.values() for item in items
+            ]
+            if removed_ids:
+                await asyncio.to_thread(
+                    VECTOR_DB_CLIENT.delete,
+                    collection_name=collection_name,
+                    ids=removed_ids,
+                )
+                BM25_INDEXES.delete(collection_name, ids=removed_ids)
+            log.info(
+                f"reused {reused} items and removed {len(removed_ids)} items "
+                f"in collection {collection_name}"
+            )
 
-        log.info(f"added {len(items)} items to collection {collection_name}")
+        log.info(f"added {count} items to collection {collection_name}")
         return True
     except Exception as e:
         log.exception(e)
         raise e
 
 
+def save_docs_to_vector_db(
+    request: Request,
+    docs,
+    collection_name,
+    metadata: Optional[dict] = None,
+    overwrite: bool = False,
+    split: bool = True,
+    add: bool = False,
+    user=None,
+    resume_from: Optional[int] = None,
+    progress_callback: Optional[Callable[[int], None]] = None,
+    diff: bool = False,
+) -> bool:
+    """Sync wrapper of asave_docs_to_vector_db for callers without an event loop."""
+    return asyncio.run(
+        asave_docs_to_vector_db(
+            request,
+            docs,
+            collection_name,
+            metadata=metadata,
+            overwrite=overwrite,
+            split=split,
+            add=add,
+            user=user,
+            resume_from=resume_from,
+            progress_callback=progress_callback,
+            diff=diff,
+        )
+    )
+
+
+def copy_docs_to_vector_db(
+    request: Request,
+    source_collection_name: str,
+    collection_name: str,
+    filter: dict,
+    metadata: Optional[dict] = None,
+) -> bool:
+    """
+    Copy already embedded chunks into another collection without embedding
+    them again. Returns False when the stored vectors can't be reused (e.g. the
+    embedding model changed) so the caller can fall back to
+    save_docs_to_vector_db.
+    """
+    # Check if entries with the same hash (metadata.hash) already exist
+    if metadata and "hash" in metadata:
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name,
+            filter={"hash": metadata["hash"]},
+        )
+
+        if result is not None:
+            existing_doc_ids = result.ids[0]
+            if existing_doc_ids:
+                log.info(f"Document with hash {metadata['hash']} already exists")
+                raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
+
+    embedding_config = get_chunk_embedding_config(request)
+
+    # Only vectors from the current embedding model can be reused
+    result = VECTOR_DB_CLIENT.query(
+        collection_name=source_collection_name, filter=filter, limit=1
+    )
+    if result is None or not result.ids or not result.ids[0]:
+        return False
+
+    source_metadata = result.metadatas[0][0] or {}
+    if source_metadata.get("embedding_config") != embedding_config:
+        return False
+
+    items = VECTOR_DB_CLIENT.copy_items(
+        source_collection_name,
+        collection_name,
+        filter=filter,
+        metadata={
+            **(metadata if metadata else {}),
+            "embedding_config": embedding_config,
+        },
+    )
+    if not items:
+        return False
+
+    BM25_INDEXES.add(collection_name, items)
+    log.info(
+        f"copied {len(items)} items from {source_collection_name} to {collection_name}"
+    )
+    return True
+
+
+def collect_page_contents(
+    docs: Iterator[Document], contents: list[str]
+) -> Iterator[Document]:
+    for doc in docs:
+        contents.append(doc.page_content)
+        yield doc
+
+
+async def aget_file_chunks(
+    request: Request, file: FileModel
+) -> tuple[list[Document], bool]:
+    """
+    Return the chunks stored in a processed file's own collection, or its
+    content as a single document, and whether the chunks can be copied along
+    with their vectors.
+    """
+    result = await asyncio.to_thread(
+        VECTOR_DB_CLIENT.query,
+        collection_name=f"file-{file.id}",
+        filter={"file_id": file.id},
+    )
+
+    if result is not None and len(result.ids[0]) > 0:
+        docs = [
+            Document(
+                page_content=result.documents[0][idx],
+                metadata=result.metadatas[0][idx],
+            )
+            for idx, id in enumerate(result.ids[0])
+        ]
+
+        # Chunks that the splitter would leave as they are can be copied along
+        # with their vectors instead of re-embedded
+        reusable = all(
+            len(doc.page_content) <= request.app.state.config.CHUNK_SIZE for doc in docs
+        )
+        return docs, reusable
+
+    docs = [
+        Document(
+            page_content=file.data.get("content", ""),
+            metadata={
+                **file.meta,
+                "name": file.filename,
+                "created_by": file.user_id,
+                "file_id": file.id,
+                "source": file.filename,
+            },
+        )
+    ]
+    return docs, False
+
+
+async def aindex_file(
+    request: Request,
+    file: FileModel,
+    collection_name: str,
+    user=None,
+    replace: bool = False,
+) -> bool:
+    """
+    Add a processed file to a knowledge collection without touching the file
+    itself, e.g. to rebuild the collection. With replace, the chunks the
+    collection already holds for the file are updated in place, so only the
+    ones that changed are embedded again.
+    """
+    docs, reusable = await aget_file_chunks(request, file)
+    metadata = {
+        "file_id": file.id,
+        "name": file.filename,
+        "hash": file.hash or calculate_sha256_string(file.data.get("content", "")),
+    }
+
+    if reusable and not replace:
+        if await asyncio.to_thread(
+            copy_docs_to_vector_db,
+            request,
+            source_collection_name=f"file-{file.id}",
+            collection_name=collection_name,
+            filter={"file_id": file.id},
+            metadata=metadata,
+        ):
+            return True
+
+    return await asave_docs_to_vector_db(
+        request,
+        docs=docs,
+        collection_name=collection_name,
+        metadata=metadata,
+        add=True,
+        user=user,
+        diff=replace,
+    )
+
+
 class ProcessFileForm(BaseModel):
     file_id: str
     content: Optional[str] = None
@@ -1443,7 +1838,7 @@ class ProcessFileForm(BaseModel):
 
 
 @router.post("/process/file")
-def process_file(
+async def aprocess_file(
     request: Request,
     form_data: ProcessFileForm,
     user=Depends(get_verified_user),
@@ -1451,15 +1846,26 @@ def process_file(
     """
     Process a file and save its content to the vector database.
     """
+    # The Files calls below are synchronous DB work, they run in a thread so
+    # files processed concurrently don't block the event loop
     if user.role == "admin":
-        file = Files.get_file_by_id(form_data.file_id)
+        file = await asyncio.to_thread(Files.get_file_by_id, form_data.file_id)
     else:
-        file = Files.get_file_by_id_and_user_id(form_data.file_id, user.id)
+        file = await asyncio.to_thread(
+            Files.get_file_by_id_and_user_id, form_data.file_id, user.id
+        )
 
     if file:
         try:
 
             collection_name = form_data.collection_name
+            # Set when the file's chunks are already embedded and can be copied
+            source_collection_name = None
+            source_filter = {"file_id": file.id}
+            # Set when the extracted pages are streamed to the vector DB
+            streamed_contents = None
+            # Set when only the chunks that changed are embedded again
+            diff = False
 
             if collection_name is None:
                 collection_name = f"file-{file.id}"
@@ -1468,14 +1874,20 @@ def process_file(
                 # Update the content in the file
                 # Usage: /files/{file_id}/data/content/update, /files/ (audio file upload pipeline)
 
-                try:
-                    # /files/{file_id}/data/content/update
-                    VECTOR_DB_CLIENT.delete_collection(
-                        collection_name=f"file-{file.id}"
-                    )
-                except:
-                    # Audio file upload pipeline
-                    pass
+                if form_data.collection_name:
+                    try:
+                        await asyncio.to_thread(
+                            VECTOR_DB_CLIENT.delete_collection,
+                            collection_name=f"file-{file.id}",
+                        )
+                        BM25_INDEXES.invalidate(f"file-{file.id}")
+                    except:
+                        pass
+                else:
+                    # /files/{file_id}/data/content/update replaces the chunks of
+                    # the file's collection in place, the audio file upload
+                    # pipeline starts from an empty one
+                    diff = True
 
                 docs = [
                     Document(
@@ -1495,31 +1907,9 @@ def process_file(
                 # Check if the file has already been processed and save the content
                 # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
-                result = VECTOR_DB_CLIENT.query(
-                    collection_name=f"file-{file.id}", filter={"file_id": file.id}
-                )
-
-                if result is not None and len(result.ids[0]) > 0:
-                    docs = [
-                        Document(
-                            page_content=result.documents[0][idx],
-                            metadata=result.metadatas[0][idx],
-                        )
-                        for idx, id in enumerate(result.ids[0])
-                    ]
-                else:
-                    docs = [
-                        Document(
-                            page_content=file.data.get("content", ""),
-                            metadata={
-                                **file.meta,
-                                "name": file.filename,
-                                "created_by": file.user_id,
-                                "file_id": file.id,
-                                "source": file.filename,
-                            },
-                        )
-                    ]
+                docs, reusable = await aget_file_chunks(request, file)
+                if reusable:
+                    source_collection_name = f"file-{file.id}"
 
                 text_content = file.data.get("content", "")
             else:
@@ -1527,7 +1917,7 @@ def process_file(
                 # Usage: /files/
                 file_path = file.path
                 if file_path:
-                    file_path = Storage.get_file(file_path)
+                    file_path = await asyncio.to_thread(Storage.get_file, file_path)
                     loader = Loader(
                         engine=request.app.state.config.CONTENT_EXTRACTION_ENGINE,
                         user=user,
@@ -1559,11 +1949,7 @@ def process_file(
                         MINERU_API_KEY=request.app.state.config.MINERU_API_KEY,
                         MINERU_PARAMS=request.app.state.config.MINERU_PARAMS,
                     )
-                    docs = loader.load(
-                        file.filename, file.meta.get("content_type"), file_path
-                    )
-
-                    docs = [
+                    docs = (
                         Document(
                             page_content=doc.page_content,
                             metadata={
@@ -1574,8 +1960,42 @@ def process_file(
                                 "source": file.filename,
                             },
                         )
-                        for doc in docs
-                    ]
+                        for doc in loader.lazy_load(
+                            file.filename, file.meta.get("content_type"), file_path
+                        )
+                    )
+
+                    # Byte-identical uploads of any user share the chunks and
+                    # vectors of the first one, the loader only runs if they
+                    # can't be copied
+                    duplicate = (
+                        await asyncio.to_thread(
+                            Files.get_processed_file_by_hash,
+                            file.hash,
+                            exclude_id=file.id,
+                        )
+                        if file.hash
+                        and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                        else None
+                    )
+
+                    if duplicate:
+                        log.info(
+                            f"Reusing the chunks of file {duplicate.id} for {file.id}"
+                        )
+                        source_collection_name = duplicate.meta["collection_name"]
+                        source_filter = {"file_id": duplicate.id}
+                        text_content = duplicate.data.get("content", "")
+                    elif (
+                        file.hash
+                        and not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL
+                    ):
+                        # Pages are embedded while the rest of the file is still
+                        # being extracted, the content is stored once it is done
+                        streamed_contents = []
+                        docs = collect_page_contents(docs, streamed_contents)
+                    else:
+                        docs = await asyncio.to_thread(list, docs)
                 else:
                     docs = [
                         Document(
@@ -1589,21 +2009,26 @@ def process_file(
                             },
                         )
                     ]
-                text_content = " ".join([doc.page_content for doc in docs])
-
-            log.debug(f"text_content: {text_content}")
-            Files.update_file_data_by_id(
-                file.id,
-                {"content": text_content},
-            )
+                if streamed_contents is None and source_collection_name is None:
+                    text_content = " ".join([doc.page_content for doc in docs])
+
+            if streamed_contents is None:
+                log.debug(f"text_content: {text_content}")
+                await asyncio.to_thread(
+                    Files.update_file_data_by_id,
+                    file.id,
+                    {"content": text_content},
+                )
             if not file.hash:
                 hash = calculate_sha256_string(text_content)
-                Files.update_file_hash_by_id(file.id, hash)
+                await asyncio.to_thread(Files.update_file_hash_by_id, file.id, hash)
             else:
                 hash = file.hash
 
             if request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
-                Files.update_file_data_by_id(file.id, {"status": "completed"})
+                await asyncio.to_thread(
+                    Files.update_file_data_by_id, file.id, {"status": "completed"}
+                )
                 return {
                     "status": True,
                     "collection_name": None,
@@ -1612,31 +2037,110 @@ def process_file(
                 }
             else:
                 try:
-                    result = save_docs_to_vector_db(
-                        request,
-                        docs=docs,
-                        collection_name=collection_name,
-                        metadata={
-                            "file_id": file.id,
-                            "name": file.filename,
-                            "hash": hash,
-                        },
-                        add=(True if form_data.collection_name else False),
-                        user=user,
-                    )
-                    log.info(f"added {len(docs)} items to collection {collection_name}")
+                    metadata = {
+                        "file_id": file.id,
+                        "name": file.filename,
+                        "hash": hash,
+                    }
+
+                    result = False
+                    if source_collection_name:
+                        result = await asyncio.to_thread(
+                            copy_docs_to_vector_db,
+                            request,
+                            source_collection_name=source_collection_name,
+                            collection_name=collection_name,
+                            filter=source_filter,
+                            metadata={
+                                **metadata,
+                                "created_by": file.user_id,
+                                "source": file.filename,
+                            },
+                        )
+
+                    if not result:
+                        # Pick up after the chunks an interrupted ingestion of
+                        # the same content already stored
+                        ingest = (file.data or {}).get("ingest") or {}
+                        resume_from = None
+                        if not form_data.content:
+                            if (
+                                ingest.get("collection_name") == collection_name
+                                and ingest.get("hash") == hash
+                            ):
+                                resume_from = ingest.get("count", 0)
+                            else:
+                                # Marked before the first chunk is stored, so
+                                # an ingestion interrupted at any point is
+                                # resumed instead of taken as complete
+                                await asyncio.to_thread(
+                                    Files.update_file_data_by_id,
+                                    file.id,
+                                    {
+                                        "ingest": {
+                                            "collection_name": collection_name,
+                                            "hash": hash,
+                                            "count": 0,
+                                        }
+                                    },
+                                )
+
+                        loop = asyncio.get_running_loop()
+
+                        def update_progress(count: int):
+                            Files.update_file_data_by_id(
+                                file.id,
+                                {
+                                    "progress": count,
+                                    "ingest": {
+                                        "collection_name": collection_name,
+                                        "hash": hash,
+                                        "count": count,
+                                    },
+                                },
+                            )
+                            # Called from a worker thread
+                            asyncio.run_coroutine_threadsafe(
+                                emit_file_status(
+                                    file.id,
+                                    file.user_id,
+                                    {"status": "processing", "progress": count},
+                                ),
+                                loop,
+                            )
+
+                        result = await asave_docs_to_vector_db(
+                            request,
+                            docs=docs,
+                            collection_name=collection_name,
+                            metadata=metadata,
+                            add=(True if form_data.collection_name else False),
+                            user=user,
+                            resume_from=resume_from,
+                            progress_callback=update_progress,
+                            diff=diff,
+                        )
+                    if streamed_contents is not None:
+                        text_content = " ".join(streamed_contents)
+                        await asyncio.to_thread(
+                            Files.update_file_data_by_id,
+                            file.id,
+                            {"content": text_content},
+                        )
 
                     if result:
-                        Files.update_file_metadata_by_id(
+                        await asyncio.to_thread(
+                            Files.update_file_metadata_by_id,
                             file.id,
                             {
                                 "collection_name": collection_name,
                             },
                         )
 
-                        Files.update_file_data_by_id(
+                        await asyncio.to_thread(
+                            Files.update_file_data_by_id,
                             file.id,
-                            {"status": "completed"},
+                            {"status": "completed", "ingest": None},
                         )
 
                         return {
@@ -1652,21 +2156,24 @@ def process_file(
 
         except Exception as e:
             log.exception(e)
-            Files.update_file_data_by_id(
+            await asyncio.to_thread(
+                Files.update_file_data_by_id,
                 file.id,
                 {"status": "failed"},
             )
 
+            # Chained, so the ingestion worker can tell a rejected file from a
+            # failure worth retrying
             if "No pandoc was found" in str(e):
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=ERROR_MESSAGES.PANDOC_NOT_INSTALLED,
-                )
+                ) from e
             else:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=str(e),
-                )
+                ) from e
 
     else:
         raise HTTPException(
@@ -1674,6 +2181,11 @@ def process_file(
         )
 
 
+def process_file(request: Request, form_data: ProcessFileForm, user=None):
+    """Sync wrapper of aprocess_file for callers without an event loop."""
+    return asyncio.run(aprocess_file(request, form_data, user=user))
+
+
 class ProcessTextForm(BaseModel):
     name: str
     content: str
@@ -1699,9 +2211,7 @@ async def process_text(
     text_content = form_data.content
     log.debug(f"text_content: {text_content}")
 
-    result = await run_in_threadpool(
-        save_docs_to_vector_db, request, docs, collection_name, user=user
-    )
+    result = await asave_docs_to_vector_db(request, docs, collection_name, user=user)
     if result:
         return {
             "status": True,
@@ -1731,8 +2241,7 @@ async def process_web(
         log.debug(f"text_content: {content}")
 
         if not request.app.state.config.BYPASS_WEB_SEARCH_EMBEDDING_AND_RETRIEVAL:
-            await run_in_threadpool(
-                save_docs_to_vector_db,
+            await asave_docs_to_vector_db(
                 request,
                 docs,
                 collection_name,
@@ -2165,8 +2674,7 @@ async def process_web_search(
             )
 
             try:
-                await run_in_threadpool(
-                    save_docs_to_vector_db,
+                await asave_docs_to_vector_db(
                     request,
                     docs,
                     collection_name,
@@ -2198,6 +2706,7 @@ class QueryDocForm(BaseModel):
     k_reranker: Optional[int] = None
     r: Optional[float] = None
     hybrid: Optional[bool] = None
+    hybrid_bm25_weight: Optional[float] = None
 
 
 @router.post("/query/doc")
@@ -2210,13 +2719,9 @@ async def query_doc_handler(
         if request.app.state.config.ENABLE_RAG_HYBRID_SEARCH and (
             form_data.hybrid is None or form_data.hybrid
         ):
-            collection_results = {}
-            collection_results[form_data.collection_name] = VECTOR_DB_CLIENT.get(
-                collection_name=form_data.collection_name
-            )
             return await query_doc_with_hybrid_search(
                 collection_name=form_data.collection_name,
-                collection_result=collection_results[form_data.collection_name],
+                collection_result=None,
                 query=form_data.query,
                 embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
                     query, prefix=prefix, user=user
@@ -2243,7 +2748,7 @@ async def query_doc_handler(
                     if form_data.hybrid_bm25_weight
                     else request.app.state.config.HYBRID_BM25_WEIGHT
                 ),
-                user=user,
+                enable_enriched_texts=request.app.state.config.ENABLE_RAG_HYBRID_SEARCH_ENRICHED_TEXTS,
             )
         else:
             query_embedding = await request.app.state.EMBEDDING_FUNCTION(
@@ -2357,8 +2862,9 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 
             VECTOR_DB_CLIENT.delete(
                 collection_name=form_data.collection_name,
-                metadata={"hash": hash},
+                filter={"hash": hash},
             )
+            BM25_INDEXES.delete(form_data.collection_name, filter={"hash": hash})
             return {"status": True}
         else:
             return {"status": False}
@@ -2370,9 +2876,23 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
 @router.post("/reset/db")
 def reset_vector_db(user=Depends(get_admin_user)):
     VECTOR_DB_CLIENT.reset()
+    BM25_INDEXES.reset()
     Knowledges.delete_all_knowledge()
 
 
+@router.post("/index/quantized")
+async def create_quantized_index(user=Depends(get_admin_user)):
+    try:
+        created = await asyncio.to_thread(VECTOR_DB_CLIENT.create_quantized_index)
+        return {"status": created}
+    except Exception as e:
+        log.exception(e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+
 @router.post("/reset/uploads")
 def reset_upload_dir(user=Depends(get_admin_user)) -> bool:
     folder = f"{UPLOAD_DIR}"
@@ -2479,8 +2999,7 @@ async def process_files_batch(
     # Save all documents in one batch
     if all_docs:
         try:
-            await run_in_threadpool(
-                save_docs_to_vector_db,
+            await asave_docs_to_vector_db(
                 request,
                 all_docs,
                 collection_name,
@@ -37,9 +37,16 @@ from open_webui.env import (
     WEBSOCKET_SERVER_PING_INTERVAL,
     WEBSOCKET_SERVER_LOGGING,
     WEBSOCKET_SERVER_ENGINEIO_LOGGING,
+    CHAT_SAVE_FLUSH_INTERVAL,
+    CHAT_SAVE_FLUSH_SIZE,
 )
 from open_webui.utils.auth import decode_token
-from open_webui.socket.utils import RedisDict, RedisLock, YdocManager
+from open_webui.socket.utils import (
+    RedisDict,
+    RedisLock,
+    YdocManager,
+    ChatMessageBuffer,
+)
 from open_webui.tasks import create_task, stop_item_tasks
 from open_webui.utils.redis import get_redis_connection
 from open_webui.utils.access_control import has_access, get_users_with_access
@@ -163,6 +170,13 @@ YDOC_MANAGER = YdocManager(
     redis_key_prefix=f"{REDIS_KEY_PREFIX}:ydoc:documents",
 )
 
+CHAT_MESSAGE_BUFFER = ChatMessageBuffer(
+    flush_interval=CHAT_SAVE_FLUSH_INTERVAL,
+    flush_size=CHAT_SAVE_FLUSH_SIZE,
+    redis=REDIS,
+    redis_key_prefix=f"{REDIS_KEY_PREFIX}:chat_message_buffer",
+)
+
 
 async def periodic_usage_pool_cleanup():
     max_retries = 2
@@ -713,26 +727,27 @@ def get_event_emitter(request_info, update_db=True):
             and not request_info.get("chat_id", "").startswith("local:")
         ):
 
+            # Writes go through the buffer, which coalesces them per message
             if "type" in event_data and event_data["type"] == "status":
-                Chats.add_message_status_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                    event_data.get("data", {}),
-                )
+                message = await CHAT_MESSAGE_BUFFER.get_message(chat_id, message_id)
+                if message:
+                    await CHAT_MESSAGE_BUFFER.append(
+                        chat_id,
+                        message_id,
+                        "statusHistory",
+                        [event_data.get("data", {})],
+                    )
 
             if "type" in event_data and event_data["type"] == "message":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
+                message = await CHAT_MESSAGE_BUFFER.get_message(chat_id, message_id)
 
                 if message:
                     content = message.get("content", "")
                     content += event_data.get("data", {}).get("content", "")
 
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
+                    await CHAT_MESSAGE_BUFFER.update(
+                        chat_id,
+                        message_id,
                         {
                             "content": content,
                         },
@@ -741,43 +756,37 @@ def get_event_emitter(request_info, update_db=True):
             if "type" in event_data and event_data["type"] == "replace":
                 content = event_data.get("data", {}).get("content", "")
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
+                await CHAT_MESSAGE_BUFFER.update(
+                    chat_id,
+                    message_id,
                     {
                         "content": content,
                     },
                 )
 
             if "type" in event_data and event_data["type"] == "embeds":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
+                message = await CHAT_MESSAGE_BUFFER.get_message(chat_id, message_id)
 
                 embeds = event_data.get("data", {}).get("embeds", [])
                 embeds.extend(message.get("embeds", []))
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
+                await CHAT_MESSAGE_BUFFER.update(
+                    chat_id,
+                    message_id,
                     {
                         "embeds": embeds,
                     },
                 )
 
             if "type" in event_data and event_data["type"] == "files":
-                message = Chats.get_message_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
-                )
+                message = await CHAT_MESSAGE_BUFFER.get_message(chat_id, message_id)
 
                 files = event_data.get("data", {}).get("files", [])
                 files.extend(message.get("files", []))
 
-                Chats.upsert_message_to_chat_by_id_and_message_id(
-                    request_info["chat_id"],
-                    request_info["message_id"],
+                await CHAT_MESSAGE_BUFFER.update(
+                    chat_id,
+                    message_id,
                     {
                         "files": files,
                     },
@@ -786,20 +795,8 @@ def get_event_emitter(request_info, update_db=True):
             if event_data.get("type") in ["source", "citation"]:
                 data = event_data.get("data", {})
                 if data.get("type") == None:
-                    message = Chats.get_message_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                    )
-
-                    sources = message.get("sources", [])
-                    sources.append(data)
-
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
-                        request_info["chat_id"],
-                        request_info["message_id"],
-                        {
-                            "sources": sources,
-                        },
+                    await CHAT_MESSAGE_BUFFER.append(
+                        chat_id, message_id, "sources", [data]
                     )
 
     if (
@@ -1,10 +1,17 @@
+import asyncio
 import json
+import logging
+import time
 import uuid
+from open_webui.models.chats import Chats
 from open_webui.utils.redis import get_redis_connection
-from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.env import REDIS_KEY_PREFIX, SRC_LOG_LEVELS
 from typing import Optional, List, Tuple
 import pycrdt as Y
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["SOCKET"])
+
 
 class RedisLock:
     def __init__(
@@ -221,3 +228,258 @@ class YdocManager:
                 del self._updates[document_id]
             if document_id in self._users:
                 del self._users[document_id]
+
+
+class ChatMessageBuffer:
+    """
+    Write-behind buffer for single-message chat writes.
+
+    Updates to a message are coalesced into one pending patch that is written
+    with `Chats.upsert_message_to_chat_by_id_and_message_id` once it is
+    `flush_interval` seconds old or has absorbed `flush_size` updates, and
+    whenever `flush()` is called (e.g. at the end of a stream).
+
+    With Redis, the message state and its pending patch live in Redis instead
+    of process memory. Patches left behind by a replica that died mid-stream
+    are picked up and written by any other replica, so a crash never loses
+    more than what was not yet written to Redis. Without Redis a crash loses
+    at most one flush window.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = 1.0,
+        flush_size: int = 64,
+        redis=None,
+        redis_key_prefix: str = f"{REDIS_KEY_PREFIX}:chat_message_buffer",
+    ):
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        # Entries nobody has touched for this long are considered orphaned
+        self._stale_after = max(flush_interval * 10, 30)
+
+        self._redis = redis
+        self._redis_key_prefix = redis_key_prefix
+        self._redis_pending_key = f"{redis_key_prefix}:pending"
+
+        # (chat_id, message_id) -> {"message", "patch", "count", "since", "updated_at"}
+        self._entries = {}
+        self._locks = {}
+        self._task = None
+
+    def _redis_key(self, chat_id: str, message_id: str) -> str:
+        return f"{self._redis_key_prefix}:{chat_id}:{message_id}"
+
+    def _lock(self, key: tuple) -> asyncio.Lock:
+        if key not in self._locks:
+            self._locks[key] = asyncio.Lock()
+        return self._locks[key]
+
+    async def _get_entry(self, chat_id: str, message_id: str) -> Optional[dict]:
+        key = (chat_id, message_id)
+        if self._redis:
+            values = await self._redis.hgetall(self._redis_key(chat_id, message_id))
+            if values:
+                entry = {
+                    "message": json.loads(values.get("message", "{}")),
+                    "patch": json.loads(values.get("patch", "{}")),
+                    "count": int(values.get("count", 0)),
+                    "since": float(values.get("since", 0)),
+                }
+                self._entries.setdefault(key, {}).update(updated_at=time.time())
+                return entry
+        elif key in self._entries:
+            return self._entries[key]
+
+        # Not buffered yet, start from what is stored in the database
+        message = await asyncio.to_thread(
+            Chats.get_message_by_id_and_message_id, chat_id, message_id
+        )
+        if message is None:
+            return None
+        return {"message": message, "patch": {}, "count": 0, "since": 0}
+
+    async def _set_entry(self, chat_id: str, message_id: str, entry: dict):
+        key = (chat_id, message_id)
+        if self._redis:
+            redis_key = self._redis_key(chat_id, message_id)
+            pipe = self._redis.pipeline()
+            pipe.hset(
+                redis_key,
+                mapping={
+                    "message": json.dumps(entry["message"]),
+                    "patch": json.dumps(entry["patch"]),
+                    "count": entry["count"],
+                    "since": entry["since"],
+                },
+            )
+            pipe.expire(redis_key, int(self._stale_after * 10))
+            if entry["patch"]:
+                pipe.zadd(
+                    self._redis_pending_key,
+                    {json.dumps([chat_id, message_id]): entry["since"]},
+                    nx=True,
+                )
+            await pipe.execute()
+            # Only remember that this replica owns the entry
+            self._entries.setdefault(key, {}).update(updated_at=time.time())
+        else:
+            self._entries[key] = {**entry, "updated_at": time.time()}
+
+    async def get_message(self, chat_id: str, message_id: str) -> Optional[dict]:
+        """
+        Return the current state of a message, including buffered updates.
+        Returns {} if the message does not exist and None if the chat does not.
+        """
+        async with self._lock((chat_id, message_id)):
+            entry = await self._get_entry(chat_id, message_id)
+            if entry is None:
+                return None
+            return json.loads(json.dumps(entry["message"]))
+
+    async def update(self, chat_id: str, message_id: str, patch: dict):
+        """Buffer a partial update of a message, see `Chats.upsert_message_...`."""
+        key = (chat_id, message_id)
+        async with self._lock(key):
+            entry = await self._get_entry(chat_id, message_id)
+            if entry is None:
+                return
+
+            entry["message"] = {**entry["message"], **patch}
+            entry["patch"] = {**entry["patch"], **patch}
+            entry["count"] += 1
+            if not entry["since"]:
+                entry["since"] = time.time()
+
+            await self._set_entry(chat_id, message_id, entry)
+
+            if entry["count"] >= self._flush_size:
+                await self._flush(chat_id, message_id)
+
+        self.start()
+
+    async def append(self, chat_id: str, message_id: str, field: str, items: list):
+        """Append items to a list field of a message, returning the new list."""
+        message = await self.get_message(chat_id, message_id)
+        if message is None:
+            return None
+
+        values = (message.get(field) or []) + items
+        await self.update(chat_id, message_id, {field: values})
+        return values
+
+    async def _flush(self, chat_id: str, message_id: str, discard: bool = False):
+        key = (chat_id, message_id)
+
+        if self._redis:
+            redis_key = self._redis_key(chat_id, message_id)
+            pipe = self._redis.pipeline()
+            pipe.hget(redis_key, "patch")
+            if discard:
+                pipe.delete(redis_key)
+            else:
+                pipe.hset(redis_key, mapping={"patch": "{}", "count": 0, "since": 0})
+            pipe.zrem(self._redis_pending_key, json.dumps([chat_id, message_id]))
+            results = await pipe.execute()
+            patch = json.loads(results[0]) if results[0] else {}
+        else:
+            entry = self._entries.get(key)
+            patch = entry["patch"] if entry else {}
+            if discard:
+                self._entries.pop(key, None)
+            elif entry:
+                entry.update(patch={}, count=0, since=0)
+
+        if discard:
+            self._entries.pop(key, None)
+            self._locks.pop(key, None)
+
+        if not patch:
+            return
+
+        try:
+            await asyncio.to_thread(
+                Chats.upsert_message_to_chat_by_id_and_message_id,
+                chat_id,
+                message_id,
+                patch,
+            )
+        except Exception as e:
+            log.exception(f"Error flushing message {message_id} of chat {chat_id}: {e}")
+            # Put the patch back so that the next flush retries it
+            entry = await self._get_entry(chat_id, message_id)
+            if entry is not None:
+                entry["patch"] = {**patch, **entry["patch"]}
+                entry["since"] = entry["since"] or time.time()
+                await self._set_entry(chat_id, message_id, entry)
+
+    async def flush(self, chat_id: str, message_id: str, discard: bool = True):
+        """
+        Write the pending updates of a message to the database. By default the
+        buffered state is dropped as well, which is what the end of a stream
+        wants.
+        """
+        async with self._lock((chat_id, message_id)):
+            await self._flush(chat_id, message_id, discard=discard)
+
+    async def flush_all(self):
+        for chat_id, message_id in list(self._entries.keys()):
+            await self.flush(chat_id, message_id)
+
+    async def _flush_due(self):
+        now = time.time()
+
+        for (chat_id, message_id), entry in list(self._entries.items()):
+            if self._redis:
+                # Owned entries are flushed below through the pending set
+                if now - entry.get("updated_at", 0) > self._stale_after:
+                    self._entries.pop((chat_id, message_id), None)
+                    self._locks.pop((chat_id, message_id), None)
+                continue
+
+            if entry["patch"] and now - entry["since"] >= self._flush_interval:
+                await self.flush(chat_id, message_id, discard=False)
+            elif not entry["patch"] and now - entry["updated_at"] > self._stale_after:
+                self._entries.pop((chat_id, message_id), None)
+                self._locks.pop((chat_id, message_id), None)
+
+        if self._redis:
+            members = await self._redis.zrangebyscore(
+                self._redis_pending_key, 0, now - self._flush_interval
+            )
+            for member in members:
+                chat_id, message_id = json.loads(member)
+                if (chat_id, message_id) in self._entries:
+                    await self.flush(chat_id, message_id, discard=False)
+                    continue
+
+                # Left behind by another replica; only pick it up once it is
+                # clearly abandoned, and let exactly one replica claim it
+                score = await self._redis.zscore(self._redis_pending_key, member)
+                if score is None or now - score < self._stale_after:
+                    continue
+                if await self._redis.zrem(self._redis_pending_key, member):
+                    log.info(f"Recovering buffered message {message_id} of {chat_id}")
+                    await self.flush(chat_id, message_id)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self._flush_interval / 2)
+            try:
+                await self._flush_due()
+            except Exception as e:
+                log.exception(f"Error flushing chat message buffer: {e}")
+
+    def start(self):
+        """Start the background flusher, if it is not running yet."""
+        if self._task is None or self._task.done():
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._run())
+            except RuntimeError:
+                pass
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush_all()
@@ -0,0 +1,134 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+import sqlalchemy as sa
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+
+MIGRATION_PATH = (
+    Path(__file__).parents[4]
+    / "migrations"
+    / "versions"
+    / "9ec96d09b476_add_chat_message_table.py"
+)
+
+CHAT_WITH_MESSAGES = {
+    "title": "chat with messages",
+    "history": {
+        "currentId": "2",
+        "messages": {
+            "1": {"id": "1", "role": "user", "content": "hello"},
+            "2": {"id": "2", "parentId": "1", "role": "assistant", "content": "hi"},
+        },
+    },
+}
+NEW_CHAT = {"title": "new chat", "history": {"currentId": None, "messages": []}}
+CHAT_WITHOUT_HISTORY = {"title": "no history"}
+
+
+def load_migration():
+    spec = importlib.util.spec_from_file_location(
+        "chat_message_migration", MIGRATION_PATH
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run(connection, step):
+    with Operations.context(MigrationContext.configure(connection)):
+        step()
+
+
+@pytest.fixture
+def connection():
+    engine = sa.create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            sa.text("CREATE TABLE chat (id VARCHAR PRIMARY KEY, chat JSON)")
+        )
+        chat_table = sa.Table(
+            "chat",
+            sa.MetaData(),
+            sa.Column("id", sa.String()),
+            sa.Column("chat", sa.JSON()),
+        )
+        connection.execute(
+            chat_table.insert(),
+            [
+                {"id": "a", "chat": CHAT_WITH_MESSAGES},
+                {"id": "b", "chat": NEW_CHAT},
+                {"id": "c", "chat": CHAT_WITHOUT_HISTORY},
+                # Double encoded by older versions
+                {"id": "d", "chat": json.dumps(CHAT_WITH_MESSAGES)},
+            ],
+        )
+        yield connection
+
+
+def get_chats(connection, migration):
+    chat_table = migration._chat_table()
+    rows = connection.execute(
+        sa.select(chat_table.c.id, chat_table.c.chat, chat_table.c.current_message_id)
+    )
+    return {id: (chat, current_message_id) for id, chat, current_message_id in rows}
+
+
+def get_message_rows(connection, migration):
+    chat_message_table = migration._chat_message_table()
+    rows = connection.execute(
+        sa.select(
+            chat_message_table.c.chat_id,
+            chat_message_table.c.id,
+            chat_message_table.c.data,
+        )
+    )
+    return {(chat_id, id): data for chat_id, id, data in rows}
+
+
+def test_upgrade_moves_messages_to_rows(connection):
+    migration = load_migration()
+    run(connection, migration.upgrade)
+
+    messages = CHAT_WITH_MESSAGES["history"]["messages"]
+    assert get_message_rows(connection, migration) == {
+        ("a", "1"): messages["1"],
+        ("a", "2"): messages["2"],
+        ("d", "1"): messages["1"],
+        ("d", "2"): messages["2"],
+    }
+
+    chats = get_chats(connection, migration)
+    for chat_id in ("a", "d"):
+        chat, current_message_id = chats[chat_id]
+        assert chat["history"] == {"currentId": "2"}
+        assert chat["title"] == CHAT_WITH_MESSAGES["title"]
+        assert current_message_id == "2"
+
+    # Chats without a message map are left as they were
+    assert chats["b"] == (NEW_CHAT, None)
+    assert chats["c"] == (CHAT_WITHOUT_HISTORY, None)
+
+
+def test_downgrade_restores_chats(connection):
+    migration = load_migration()
+    run(connection, migration.upgrade)
+    run(connection, migration.downgrade)
+
+    inspector = sa.inspect(connection)
+    assert "chat_message" not in inspector.get_table_names()
+    assert [column["name"] for column in inspector.get_columns("chat")] == [
+        "id",
+        "chat",
+    ]
+
+    chats = {
+        id: chat
+        for id, chat in connection.execute(sa.text("SELECT id, chat FROM chat"))
+    }
+    assert json.loads(chats["a"]) == CHAT_WITH_MESSAGES
+    assert json.loads(chats["b"]) == NEW_CHAT
+    assert json.loads(chats["c"]) == CHAT_WITHOUT_HISTORY
+    assert json.loads(chats["d"]) == CHAT_WITH_MESSAGES
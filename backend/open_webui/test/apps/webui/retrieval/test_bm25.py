@@ -0,0 +1,155 @@
+import pytest
+
+from open_webui.retrieval import bm25
+from open_webui.retrieval.bm25 import BM25Index, BM25IndexStore, tokenize
+from open_webui.retrieval.vector.main import GetResult
+
+CORPUS = [
+    "the quick brown fox jumps over the lazy dog",
+    "a fast brown fox leaps over a sleeping dog",
+    "insulin dosage protocol for type 2 diabetes",
+    "protocol for the management of hypertension in adults",
+    "the dog barks at the brown cat",
+    "hypertension and diabetes screening protocol in primary care",
+]
+QUERIES = ["brown fox", "protocol diabetes", "dog", "hypertension adults care"]
+
+
+def build_index(texts, enriched=False):
+    index = BM25Index(enriched=enriched)
+    index.add(
+        [str(idx) for idx in range(len(texts))],
+        texts,
+        [{} for _ in texts],
+    )
+    return index
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.collections = {}
+
+    def get(self, collection_name):
+        items = self.collections.get(collection_name, [])
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    client = FakeVectorDB()
+    monkeypatch.setattr(bm25, "VECTOR_DB_CLIENT", client)
+    return client
+
+
+def make_item(id, text, **metadata):
+    return {"id": id, "text": text, "vector": [0.0], "metadata": metadata}
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_scores_match_bm25_okapi(query):
+    rank_bm25 = pytest.importorskip("rank_bm25")
+
+    expected = rank_bm25.BM25Okapi([tokenize(text) for text in CORPUS]).get_scores(
+        tokenize(query)
+    )
+    results = build_index(CORPUS).search(query, k=len(CORPUS))
+
+    scores = {int(id): score for id, _, _, score in results}
+    for idx, score in enumerate(expected):
+        assert scores.get(idx, 0.0) == pytest.approx(score)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_ranking_matches_bm25_retriever(query):
+    retrievers = pytest.importorskip("langchain_community.retrievers")
+
+    retriever = retrievers.BM25Retriever.from_texts(CORPUS, k=3)
+    expected = retriever.vectorizer.get_scores(retriever.preprocess_func(query))
+    results = build_index(CORPUS).search(query, k=3)
+
+    for id, _, _, score in results:
+        assert score == pytest.approx(expected[int(id)])
+
+    # The retriever pads with non matching documents, the index doesn't, and
+    # ties may come back in another order
+    assert [score for _, _, _, score in results] == pytest.approx(
+        sorted(expected, reverse=True)[: len(results)]
+    )
+
+
+def test_incremental_updates_match_rebuild():
+    index = build_index(CORPUS[:3])
+    index.add(["3", "4", "5"], CORPUS[3:], [{}, {}, {}])
+    index.remove(ids=["1"])
+
+    rebuilt = BM25Index()
+    rebuilt.add(
+        [str(idx) for idx in range(len(CORPUS)) if idx != 1],
+        [text for idx, text in enumerate(CORPUS) if idx != 1],
+        [{} for idx in range(len(CORPUS)) if idx != 1],
+    )
+
+    for query in QUERIES:
+        for (id, _, _, score), (expected_id, _, _, expected_score) in zip(
+            index.search(query, k=10), rebuilt.search(query, k=10)
+        ):
+            assert id == expected_id
+            assert score == pytest.approx(expected_score)
+
+
+def test_remove_by_filter():
+    index = BM25Index()
+    index.add(["a", "b"], ["brown fox", "brown dog"], [{"file_id": "1"}, {}])
+    assert index.remove(filter={"file_id": "1"}) == 1
+    assert [id for id, _, _, _ in index.search("brown", k=10)] == ["b"]
+
+
+def test_workers_see_each_others_changes(tmp_path, vector_db):
+    # Two stores on the same directory stand in for two workers of one host
+    vector_db.collections["docs"] = [make_item("1", "brown fox")]
+    worker_a = BM25IndexStore(path=str(tmp_path))
+    worker_b = BM25IndexStore(path=str(tmp_path))
+
+    assert len(worker_a.get("docs")) == 1
+    assert len(worker_b.get("docs")) == 1
+
+    item = make_item("2", "brown dog")
+    vector_db.collections["docs"].append(item)
+    worker_a.add("docs", [item])
+    assert {id for id, *_ in worker_b.get("docs").search("brown", k=10)} == {
+        "1",
+        "2",
+    }
+
+    vector_db.collections["docs"].pop(0)
+    worker_b.delete("docs", ids=["1"])
+    assert {id for id, *_ in worker_a.get("docs").search("brown", k=10)} == {"2"}
+
+
+def test_invalidate_rebuilds_from_vector_db(tmp_path, vector_db):
+    vector_db.collections["docs"] = [make_item("1", "brown fox")]
+    worker_a = BM25IndexStore(path=str(tmp_path))
+    worker_b = BM25IndexStore(path=str(tmp_path))
+    worker_b.get("docs")
+
+    vector_db.collections["docs"] = [make_item("2", "lazy dog")]
+    worker_a.invalidate("docs")
+
+    assert worker_b.get("docs").search("fox", k=10) == []
+    assert [id for id, *_ in worker_b.get("docs").search("dog", k=10)] == ["2"]
+
+
+def test_reset_invalidates_other_workers(tmp_path, vector_db):
+    vector_db.collections["docs"] = [make_item("1", "brown fox")]
+    worker_a = BM25IndexStore(path=str(tmp_path))
+    worker_b = BM25IndexStore(path=str(tmp_path))
+    worker_b.get("docs")
+
+    vector_db.collections["docs"] = []
+    worker_a.reset()
+
+    assert len(worker_b.get("docs")) == 0
@@ -0,0 +1,32 @@
+from open_webui.retrieval.embedding_cache import EmbeddingCache, encode_vector
+
+VECTOR_SIZE = len(encode_vector([0.0] * 8))
+
+
+def vectors(prefix, count):
+    return {f"{prefix}{i}": [float(i)] * 8 for i in range(count)}
+
+
+def stored(cache):
+    return cache._get_conn().execute("SELECT COUNT(*) FROM embedding").fetchone()[0]
+
+
+def test_roundtrip(tmp_path):
+    cache = EmbeddingCache(str(tmp_path))
+    cache.set(vectors("a", 2))
+
+    assert cache.get(["a1", "missing"]) == {"a1": [1.0] * 8}
+
+
+def test_size_budget_is_shared_across_processes(tmp_path):
+    # Two caches on one file, as two worker processes would have
+    first = EmbeddingCache(str(tmp_path), max_size=VECTOR_SIZE * 10)
+    second = EmbeddingCache(str(tmp_path), max_size=VECTOR_SIZE * 10)
+
+    first.set(vectors("a", 8))
+    second.set(vectors("b", 8))
+
+    assert stored(first) <= 10
+    assert first._get_size(first._get_conn()) == stored(first) * VECTOR_SIZE
+    # The most recently stored vectors are kept
+    assert set(second.get(list(vectors("b", 8)))) == set(vectors("b", 8))
@@ -0,0 +1,258 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.routers import retrieval
+
+TEXTS = [f"chunk number {idx}" for idx in range(7)]
+METADATA = {"file_id": "file", "name": "file.txt", "hash": "abc"}
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.collections = {}
+        self.fail_after = None
+        self.written = []
+        self.deleted = []
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def find(self, collection_name, filter):
+        return [
+            item
+            for item in self.collections.get(collection_name, {}).values()
+            if all(item["metadata"].get(k) == v for k, v in filter.items())
+        ]
+
+    def query(self, collection_name, filter, limit=None):
+        items = self.find(collection_name, filter)
+        if not items:
+            return None
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def insert(self, collection_name, items):
+        collection = self.collections.setdefault(collection_name, {})
+        for item in items:
+            assert item["id"] not in collection, "duplicate insert"
+        self.upsert(collection_name, items)
+
+    def upsert(self, collection_name, items):
+        if self.fail_after is not None:
+            if self.fail_after <= 0:
+                raise RuntimeError("worker died")
+            self.fail_after -= 1
+        collection = self.collections.setdefault(collection_name, {})
+        for item in items:
+            collection[item["id"]] = item
+        self.written.extend(item["id"] for item in items)
+
+    def get_with_vectors(self, collection_name, filter=None, ids=None):
+        return [
+            dict(item)
+            for item in self.find(collection_name, filter or {})
+            if ids is None or item["id"] in ids
+        ]
+
+    def delete(self, collection_name, ids=None, filter=None):
+        collection = self.collections.get(collection_name, {})
+        for item in self.find(collection_name, filter or {}):
+            if ids is None or item["id"] in ids:
+                del collection[item["id"]]
+                self.deleted.append(item["id"])
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    client = FakeVectorDB()
+    monkeypatch.setattr(retrieval, "VECTOR_DB_CLIENT", client)
+    monkeypatch.setattr(retrieval, "BM25_INDEXES", MagicMock())
+    monkeypatch.setattr(retrieval, "RAG_INGESTION_BATCH_SIZE", 2)
+    return client
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    texts = []
+
+    async def embedding_function(query, prefix=None, user=None):
+        texts.extend(query)
+        return [[float(len(text))] for text in query]
+
+    monkeypatch.setattr(
+        retrieval, "get_embedding_function", lambda *args, **kwargs: embedding_function
+    )
+    monkeypatch.setattr(
+        retrieval,
+        "EMBEDDING_CACHE",
+        SimpleNamespace(wrap=lambda embedding_function, *args: embedding_function),
+    )
+    return texts
+
+
+def save(resume_from=None, progress=None, docs=None, metadata=METADATA, diff=False):
+    config = MagicMock(
+        RAG_EMBEDDING_ENGINE="",
+        RAG_EMBEDDING_MODEL="model",
+        RAG_EMBEDDING_DIMENSIONS=None,
+    )
+    request = SimpleNamespace(
+        app=SimpleNamespace(state=SimpleNamespace(config=config, ef=None))
+    )
+    return asyncio.run(
+        retrieval.asave_docs_to_vector_db(
+            request,
+            (
+                docs
+                if docs is not None
+                else [Document(page_content=text, metadata={}) for text in TEXTS]
+            ),
+            "file-file",
+            metadata=metadata,
+            split=False,
+            resume_from=resume_from,
+            progress_callback=progress.append if progress is not None else None,
+            diff=diff,
+        )
+    )
+
+
+def stored_texts(vector_db):
+    return sorted(item["text"] for item in vector_db.collections["file-file"].values())
+
+
+def test_resume_counts_stored_chunks(vector_db, embedded):
+    # The worker dies after two batches, before any progress was recorded
+    vector_db.fail_after = 2
+    with pytest.raises(RuntimeError):
+        save()
+    assert len(vector_db.collections["file-file"]) == 4
+
+    vector_db.fail_after = None
+    embedded.clear()
+    progress = []
+    assert save(resume_from=0, progress=progress)
+
+    assert embedded == TEXTS[4:]
+    assert stored_texts(vector_db) == sorted(TEXTS)
+    assert progress == [6, 7]
+
+
+def test_resume_with_lagging_count(vector_db, embedded):
+    vector_db.fail_after = 3
+    with pytest.raises(RuntimeError):
+        save()
+
+    # The last batch was written but its progress never saved
+    vector_db.fail_after = None
+    embedded.clear()
+    assert save(resume_from=4)
+
+    assert embedded == TEXTS[6:]
+    assert stored_texts(vector_db) == sorted(TEXTS)
+
+
+def test_resume_after_collection_was_removed(vector_db, embedded):
+    assert save(resume_from=4)
+    assert embedded == TEXTS
+    assert stored_texts(vector_db) == sorted(TEXTS)
+
+
+def test_existing_collection_without_resume_is_kept(vector_db, embedded):
+    assert save()
+    embedded.clear()
+
+    # Same content again, without a pending ingestion
+    with pytest.raises(ValueError):
+        save()
+    assert embedded == []
+
+
+def test_streamed_documents(vector_db, embedded):
+    # Pages as aprocess_file streams them from the loader
+    contents = []
+    pages = (Document(page_content=text, metadata={}) for text in TEXTS)
+    assert save(docs=retrieval.collect_page_contents(pages, contents))
+
+    assert contents == TEXTS
+    assert embedded == TEXTS
+    assert stored_texts(vector_db) == sorted(TEXTS)
+
+
+def make_docs(texts):
+    return [Document(page_content=text, metadata={}) for text in texts]
+
+
+def stored_items(vector_db):
+    return {
+        item["text"]: (item["id"], item["vector"])
+        for item in vector_db.collections["file-file"].values()
+    }
+
+
+def test_diff_keeps_unchanged_chunks(vector_db, embedded):
+    assert save(diff=True)
+    before = stored_items(vector_db)
+    embedded.clear()
+    vector_db.written.clear()
+
+    # The file was edited: the last two chunks are gone and one is new
+    texts = TEXTS[:5] + ["a new chunk"]
+    assert save(docs=make_docs(texts), metadata={**METADATA, "hash": "def"}, diff=True)
+
+    after = stored_items(vector_db)
+    assert embedded == ["a new chunk"]
+    assert sorted(after) == sorted(texts)
+    for text in TEXTS[:5]:
+        assert after[text] == before[text]
+    # Rewritten only for the new hash in their metadata
+    assert len(vector_db.written) == 6
+
+    removed_ids = [before[text][0] for text in TEXTS[5:]]
+    assert sorted(vector_db.deleted) == sorted(removed_ids)
+    retrieval.BM25_INDEXES.delete.assert_called_with("file-file", ids=removed_ids)
+
+
+def test_diff_without_changes_writes_nothing(vector_db, embedded):
+    assert save(diff=True)
+    embedded.clear()
+    vector_db.written.clear()
+
+    assert save(diff=True)
+    assert embedded == []
+    assert vector_db.written == []
+    assert vector_db.deleted == []
+
+
+def test_diff_replaces_stale_embeddings(vector_db, embedded):
+    assert save(diff=True)
+    before = stored_items(vector_db)
+    # Stored by an earlier embedding model
+    for item in list(vector_db.collections["file-file"].values())[:3]:
+        item["metadata"] = {**item["metadata"], "embedding_config": {"model": "old"}}
+    stale = {
+        item["text"]
+        for item in vector_db.collections["file-file"].values()
+        if item["metadata"]["embedding_config"] == {"model": "old"}
+    }
+    embedded.clear()
+
+    assert save(diff=True)
+
+    after = stored_items(vector_db)
+    assert sorted(embedded) == sorted(stale)
+    assert sorted(after) == sorted(TEXTS)
+    for text in TEXTS:
+        assert (after[text][0] == before[text][0]) == (text not in stale)
+    assert sorted(vector_db.deleted) == sorted(before[text][0] for text in stale)
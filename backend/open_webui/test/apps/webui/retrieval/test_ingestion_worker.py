@@ -0,0 +1,103 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from open_webui import ingestion
+from open_webui.constants import ERROR_MESSAGES
+
+
+def processing_error(cause: Exception) -> HTTPException:
+    # What aprocess_file raises for any failure
+    try:
+        raise HTTPException(status_code=400, detail=str(cause)) from cause
+    except HTTPException as e:
+        return e
+
+
+class FakeQueue:
+    def __init__(self):
+        self.acked = []
+        self.retried = []
+
+    async def extend(self, job):
+        pass
+
+    async def ack(self, job):
+        self.acked.append(job.id)
+
+    async def retry(self, job, delay):
+        self.retried.append((job.id, delay))
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    file_data = {}
+
+    async def emit_file_status(file_id, user_id, data):
+        pass
+
+    def update_file_data_by_id(id, data):
+        file_data.setdefault(id, []).append(data)
+
+    monkeypatch.setattr(ingestion, "emit_file_status", emit_file_status)
+    monkeypatch.setattr(
+        ingestion,
+        "Files",
+        SimpleNamespace(update_file_data_by_id=update_file_data_by_id),
+    )
+
+    worker = ingestion.IngestionWorker(None, FakeQueue())
+    worker.file_data = file_data
+    return worker
+
+
+def run(monkeypatch, worker, error, attempts=1):
+    async def run_ingestion_job(app, job):
+        raise error
+
+    monkeypatch.setattr(ingestion, "run_ingestion_job", run_ingestion_job)
+    job = ingestion.IngestionJob(
+        id="job", file_id="file", user_id="user", attempts=attempts
+    )
+    asyncio.run(worker._run(job))
+
+
+def test_transient_failure_is_retried(monkeypatch, worker):
+    run(monkeypatch, worker, processing_error(RuntimeError("429 Too Many Requests")))
+
+    assert worker.queue.retried == [("job", 5)]
+    assert worker.queue.acked == []
+    assert worker.file_data["file"] == [{"status": "pending"}]
+
+
+def test_rejected_file_is_not_retried(monkeypatch, worker):
+    run(monkeypatch, worker, processing_error(ValueError(ERROR_MESSAGES.EMPTY_CONTENT)))
+
+    assert worker.queue.retried == []
+    assert worker.queue.acked == ["job"]
+    assert worker.file_data["file"] == [
+        {"status": "failed", "error": ERROR_MESSAGES.EMPTY_CONTENT}
+    ]
+
+
+def test_last_attempt_fails_the_file(monkeypatch, worker):
+    run(
+        monkeypatch,
+        worker,
+        processing_error(RuntimeError("connection reset")),
+        attempts=ingestion.INGESTION_JOB_MAX_ATTEMPTS,
+    )
+
+    assert worker.queue.retried == []
+    assert worker.queue.acked == ["job"]
+    assert worker.file_data["file"][-1]["status"] == "failed"
+
+
+def test_is_rejected():
+    assert ingestion.is_rejected(HTTPException(status_code=404))
+    assert ingestion.is_rejected(ValueError("unsupported"))
+    assert ingestion.is_rejected(processing_error(processing_error(ValueError())))
+    assert not ingestion.is_rejected(processing_error(TimeoutError()))
+    assert not ingestion.is_rejected(RuntimeError())
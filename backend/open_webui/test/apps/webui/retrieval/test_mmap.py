@@ -0,0 +1,125 @@
+import os
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.vector.dbs import mmap
+
+DIMENSION = 32
+
+
+@pytest.fixture(params=[None, "int8", "binary"])
+def client(request, monkeypatch, tmp_path):
+    monkeypatch.setattr(mmap, "MMAP_VECTOR_DATA_PATH", str(tmp_path))
+    monkeypatch.setattr(mmap, "MMAP_VECTOR_DTYPE", "float32")
+    monkeypatch.setattr(mmap, "VECTOR_QUANTIZATION", request.param)
+    return mmap.MmapClient()
+
+
+def make_items(ids, seed=0):
+    rng = np.random.default_rng(seed)
+    return [
+        {
+            "id": id,
+            "text": f"text {id}",
+            "vector": rng.normal(size=DIMENSION).tolist(),
+            "metadata": {"file_id": "f1" if i % 2 else "f2"},
+        }
+        for i, id in enumerate(ids)
+    ]
+
+
+def normalized(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def assert_consistent(client, items):
+    stored = client.get_with_vectors("c")
+    assert sorted(item["id"] for item in stored) == sorted(items)
+    for item in stored:
+        assert item["text"] == items[item["id"]]["text"]
+        np.testing.assert_allclose(
+            item["vector"], normalized(items[item["id"]]["vector"]), atol=1e-6
+        )
+
+    # Every live item is its own nearest neighbour
+    for id, item in items.items():
+        result = client.search("c", [item["vector"]], limit=3)
+        assert result.ids[0][0] == id
+        assert result.distances[0][0] == pytest.approx(1.0, abs=1e-5)
+        assert len(result.ids[0]) == 3
+
+
+def test_write_delete_and_compact(client):
+    ids = [f"id{i}" for i in range(10)]
+    items = {item["id"]: item for item in make_items(ids)}
+    client.insert("c", list(items.values()))
+    assert_consistent(client, items)
+
+    # Replaced items leave their old rows behind
+    replaced = make_items(ids[:3], seed=1)
+    client.upsert("c", replaced)
+    items.update({item["id"]: item for item in replaced})
+    assert_consistent(client, items)
+
+    conn = client._connect()
+    collection = client._get_collection(conn, "c")
+    assert (collection["rows"], collection["generation"]) == (13, 0)
+
+    # 7 dead rows of 13 triggers compaction
+    client.delete("c", ids=ids[6:])
+    for id in ids[6:]:
+        del items[id]
+
+    collection = client._get_collection(conn, "c")
+    assert (collection["rows"], collection["generation"]) == (6, 1)
+    directory = os.path.join(client.path, str(collection["id"]))
+    assert (
+        os.path.getsize(os.path.join(directory, "vectors.1.bin")) == 6 * DIMENSION * 4
+    )
+    assert_consistent(client, items)
+
+    client.delete("c", filter={"file_id": "f1"})
+    items = {
+        id: item for id, item in items.items() if item["metadata"]["file_id"] != "f1"
+    }
+    assert_consistent(client, items)
+    assert client.get_with_vectors("c", ids=[ids[0], ids[1]]) == [
+        item for item in client.get_with_vectors("c") if item["id"] == ids[0]
+    ]
+
+
+def test_multi_vector_search(client):
+    items = make_items([f"id{i}" for i in range(20)])
+    client.insert("c", items)
+
+    queries = [items[3], items[11], items[17]]
+    result = client.search("c", [item["vector"] for item in queries], limit=5)
+
+    assert [ids[0] for ids in result.ids] == [item["id"] for item in queries]
+    assert all(len(ids) == 5 for ids in result.ids)
+    assert all(
+        distances == sorted(distances, reverse=True) for distances in result.distances
+    )
+
+
+def test_hnsw_search(monkeypatch, client):
+    pytest.importorskip("hnswlib")
+    client.hnsw_threshold = 1
+
+    items = make_items([f"id{i}" for i in range(50)])
+    client.insert("c", items)
+    client.delete("c", ids=["id0"])
+
+    result = client.search("c", [items[0]["vector"], items[7]["vector"]], limit=3)
+    assert "id0" not in result.ids[0]
+    assert result.ids[1][0] == "id7"
+
+
+def test_dimension_mismatch(client):
+    client.insert("c", make_items(["a"]))
+
+    with pytest.raises(ValueError):
+        client.insert("c", [{**make_items(["b"])[0], "vector": [1.0, 0.0]}])
+    assert client.search("c", [[1.0, 0.0]], limit=1) is None
@@ -0,0 +1,249 @@
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import pytest
+
+from open_webui import reindex
+from open_webui.retrieval.vector.main import GetResult
+
+
+class FakeVectorDB:
+    def __init__(self):
+        self.collections = {}
+        self.fail_copy = False
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        self.collections.pop(collection_name, None)
+
+    def insert(self, collection_name, items):
+        collection = self.collections.setdefault(collection_name, {})
+        for item in items:
+            collection[item["id"]] = item
+
+    def query(self, collection_name, filter, limit=None):
+        items = self.find(collection_name, filter)
+        if not items:
+            return None
+        return GetResult(
+            ids=[[item["id"] for item in items]],
+            documents=[[item["text"] for item in items]],
+            metadatas=[[item["metadata"] for item in items]],
+        )
+
+    def delete(self, collection_name, ids=None, filter=None):
+        collection = self.collections.get(collection_name, {})
+        for item in self.find(collection_name, filter or {}):
+            if ids is None or item["id"] in ids:
+                del collection[item["id"]]
+
+    def copy_items(self, source_collection_name, target_collection_name, filter=None):
+        if self.fail_copy:
+            return None
+        items = [
+            {**item, "id": str(uuid4())}
+            for item in self.find(source_collection_name, filter or {})
+        ]
+        self.insert(target_collection_name, items)
+        return items
+
+    def find(self, collection_name, filter):
+        return [
+            item
+            for item in self.collections.get(collection_name, {}).values()
+            if all(item["metadata"].get(k) == v for k, v in filter.items())
+        ]
+
+    def texts(self, collection_name):
+        return sorted(
+            item["text"] for item in self.collections.get(collection_name, {}).values()
+        )
+
+
+class FakeKnowledges:
+    def __init__(self, knowledge_bases, files):
+        self.knowledge_bases = knowledge_bases
+        self.files = files
+
+    def get_knowledge_bases(self):
+        return list(self.knowledge_bases.values())
+
+    def get_files_by_id(self, id):
+        return self.files[id]
+
+    def update_knowledge_meta_by_id(self, id, meta):
+        knowledge_base = self.knowledge_bases[id]
+        knowledge_base.meta = {**(knowledge_base.meta or {}), **meta}
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    async def eval(self, script, numkeys, key, value):
+        # RELEASE_LOCK_SCRIPT
+        if self.data.get(key) == value:
+            del self.data[key]
+            return 1
+        return 0
+
+
+def make_chunk(file_id, text):
+    return {
+        "id": str(uuid4()),
+        "text": text,
+        "vector": [0.0],
+        "metadata": {"file_id": file_id},
+    }
+
+
+@pytest.fixture
+def vector_db(monkeypatch):
+    client = FakeVectorDB()
+    monkeypatch.setattr(reindex, "VECTOR_DB_CLIENT", client)
+    monkeypatch.setattr(reindex, "BM25_INDEXES", MagicMock())
+    monkeypatch.setattr(reindex, "supports_shadow_collections", lambda: True)
+    for file_id in ["f1", "f2"]:
+        client.insert("kb", [make_chunk(file_id, f"old {file_id}")])
+    return client
+
+
+@pytest.fixture
+def knowledges(monkeypatch):
+    knowledges = FakeKnowledges(
+        {"kb": SimpleNamespace(id="kb", meta=None)},
+        {"kb": [SimpleNamespace(id=id, filename=f"{id}.txt") for id in ["f1", "f2"]]},
+    )
+    monkeypatch.setattr(reindex, "Knowledges", knowledges)
+    return knowledges
+
+
+@pytest.fixture
+def indexed(monkeypatch, vector_db):
+    calls = []
+    failing = set()
+
+    async def aindex_file(request, file, collection_name, user=None, replace=False):
+        calls.append((file.id, collection_name, replace))
+        if file.id in failing:
+            return False
+        if replace:
+            vector_db.delete(collection_name, filter={"file_id": file.id})
+        vector_db.insert(collection_name, [make_chunk(file.id, f"new {file.id}")])
+        return True
+
+    monkeypatch.setattr(reindex, "aindex_file", aindex_file)
+    return SimpleNamespace(calls=calls, failing=failing)
+
+
+def make_request(redis=None):
+    return SimpleNamespace(
+        app=SimpleNamespace(
+            state=SimpleNamespace(redis=redis, knowledge_reindex_job=None)
+        )
+    )
+
+
+def run_job(request=None, id=None):
+    job = reindex.KnowledgeReindexJob(request or make_request(), None, id=id)
+    asyncio.run(job.run())
+    return job
+
+
+def test_swap_replaces_chunks(vector_db, knowledges, indexed):
+    job = run_job()
+
+    assert job.status["status"] == "completed"
+    assert job.status["completed_files"] == 2
+    assert vector_db.texts("kb") == ["new f1", "new f2"]
+    assert not vector_db.has_collection("kb-reindex")
+    assert knowledges.knowledge_bases["kb"].meta["reindex"] is None
+    reindex.BM25_INDEXES.invalidate.assert_any_call("kb")
+    reindex.BM25_INDEXES.invalidate.assert_any_call("kb-reindex")
+
+
+def test_failed_copy_keeps_live_chunks(vector_db, knowledges, indexed):
+    vector_db.fail_copy = True
+    job = run_job()
+
+    assert job.status["status"] == "failed"
+    assert vector_db.texts("kb") == ["old f1", "old f2"]
+    # Kept for the next run to resume
+    assert knowledges.knowledge_bases["kb"].meta["reindex"]["files"] == ["f1", "f2"]
+
+
+def test_failed_files_are_counted_apart(vector_db, knowledges, indexed):
+    indexed.failing.add("f2")
+    job = run_job()
+
+    assert job.status["status"] == "completed"
+    assert job.status["completed_files"] == 1
+    assert [failed["file_id"] for failed in job.status["failed_files"]] == ["f2"]
+    # The file that failed keeps what it had
+    assert vector_db.texts("kb") == ["new f1", "old f2"]
+
+
+def test_resume_skips_checkpointed_files(vector_db, knowledges, indexed):
+    vector_db.insert("kb-reindex", [make_chunk("f1", "new f1")])
+    knowledges.knowledge_bases["kb"].meta = {
+        "reindex": {
+            "job_id": "job",
+            "collection_name": "kb-reindex",
+            "files": ["f1"],
+            "completed": False,
+        }
+    }
+
+    job = reindex.KnowledgeReindexJob.resume_or_create(make_request(), None)
+    assert job.id == "job"
+    asyncio.run(job.run())
+
+    assert indexed.calls == [("f2", "kb-reindex", False)]
+    assert job.status["completed_files"] == 2
+    assert vector_db.texts("kb") == ["new f1", "new f2"]
+
+
+def test_in_place_without_shadow_collections(
+    monkeypatch, vector_db, knowledges, indexed
+):
+    monkeypatch.setattr(reindex, "supports_shadow_collections", lambda: False)
+    job = run_job()
+
+    assert job.status["status"] == "completed"
+    assert sorted(indexed.calls) == [("f1", "kb", True), ("f2", "kb", True)]
+    assert vector_db.texts("kb") == ["new f1", "new f2"]
+    assert not vector_db.has_collection("kb-reindex")
+
+
+def test_redis_lock_and_status(vector_db, knowledges, indexed):
+    redis = FakeRedis()
+    first, second = make_request(redis), make_request(redis)
+
+    async def start():
+        assert await reindex.start_reindex_job(first, None)
+        # Another replica sees the lock and the running job's status
+        assert not await reindex.start_reindex_job(second, None)
+        await first.app.state.knowledge_reindex_task
+        return await reindex.get_reindex_job_status(second)
+
+    status = asyncio.run(start())
+
+    assert status["status"] == "completed"
+    assert status["completed_files"] == 2
+    assert f"{reindex.REDIS_REINDEX_KEY}:lock" not in redis.data
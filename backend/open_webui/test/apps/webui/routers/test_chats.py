@@ -234,3 +234,143 @@ class TestChats(AbstractPostgresTest):
 
         chat = self.chats.get_chat_by_id(chat_id)
         assert chat.share_id is None
+
+    def _insert_chat_with_messages(self):
+        from open_webui.models.chats import ChatForm
+
+        return self.chats.insert_new_chat(
+            "2",
+            ChatForm(
+                **{
+                    "chat": {
+                        "title": "chat with messages",
+                        "history": {
+                            "currentId": "2",
+                            "messages": {
+                                "1": {
+                                    "id": "1",
+                                    "parentId": None,
+                                    "childrenIds": ["2"],
+                                    "role": "user",
+                                    "content": "hello",
+                                },
+                                "2": {
+                                    "id": "2",
+                                    "parentId": "1",
+                                    "childrenIds": [],
+                                    "role": "assistant",
+                                    "content": "hi there",
+                                },
+                            },
+                        },
+                        "messages": [{"id": "1"}, {"id": "2"}],
+                    }
+                }
+            ),
+        )
+
+    def _get_message_rows(self, chat_id):
+        from open_webui.internal.db import Session
+        from open_webui.models.chats import ChatMessage
+
+        Session.commit()
+        return {
+            row.id: row.data
+            for row in Session.query(ChatMessage).filter_by(chat_id=chat_id).all()
+        }
+
+    def test_chat_messages_round_trip(self):
+        chat = self._insert_chat_with_messages()
+
+        # Messages are stored as rows, not in the chat JSON
+        from open_webui.internal.db import Session
+        from open_webui.models.chats import Chat
+
+        Session.commit()
+        chat_item = Session.get(Chat, chat.id)
+        assert "messages" not in chat_item.chat["history"]
+        assert chat_item.current_message_id == "2"
+        assert set(self._get_message_rows(chat.id)) == {"1", "2"}
+
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.get(self.create_url(f"/{chat.id}"))
+        assert response.status_code == 200
+        history = response.json()["chat"]["history"]
+        assert history["currentId"] == "2"
+        assert history["messages"]["1"]["content"] == "hello"
+        assert history["messages"]["2"]["parentId"] == "1"
+        assert response.json()["chat"]["messages"] == [{"id": "1"}, {"id": "2"}]
+
+    def test_update_chat_syncs_message_rows(self):
+        chat = self._insert_chat_with_messages()
+        payload = self.chats.get_chat_by_id(chat.id).chat
+
+        messages = payload["history"]["messages"]
+        messages["1"] = {**messages["1"], "content": "hello again"}
+        del messages["2"]
+        messages["3"] = {"id": "3", "parentId": "1", "content": "new reply"}
+        payload["history"]["currentId"] = "3"
+        self.chats.update_chat_by_id(chat.id, payload)
+
+        rows = self._get_message_rows(chat.id)
+        assert set(rows) == {"1", "3"}
+        assert rows["1"]["content"] == "hello again"
+
+        history = self.chats.get_chat_by_id(chat.id).chat["history"]
+        assert history["currentId"] == "3"
+        assert set(history["messages"]) == {"1", "3"}
+
+    def test_update_chat_message_by_id(self):
+        chat = self._insert_chat_with_messages()
+        with mock_webui_user(id="2"):
+            response = self.fast_api_client.post(
+                self.create_url(f"/{chat.id}/messages/1"),
+                json={"content": "edited"},
+            )
+        assert response.status_code == 200
+        history = response.json()["chat"]["history"]
+        assert history["messages"]["1"]["content"] == "edited"
+        # The rest of the message and the other messages are kept
+        assert history["messages"]["1"]["childrenIds"] == ["2"]
+        assert history["messages"]["2"]["content"] == "hi there"
+        assert history["currentId"] == "1"
+
+        assert self._get_message_rows(chat.id)["1"]["content"] == "edited"
+
+    def test_single_message_helpers(self):
+        chat = self._insert_chat_with_messages()
+
+        message = self.chats.upsert_message_to_chat_by_id_and_message_id(
+            chat.id, "2", {"content": "updated"}
+        )
+        assert message.id == "2"
+        assert message.data["content"] == "updated"
+        assert message.data["role"] == "assistant"
+
+        status = {"action": "web_search", "done": True}
+        message = self.chats.add_message_status_to_chat_by_id_and_message_id(
+            chat.id, "2", status
+        )
+        assert message["statusHistory"] == [status]
+
+        files = self.chats.add_message_files_by_id_and_message_id(
+            chat.id, "2", [{"type": "image", "url": "a.png"}]
+        )
+        assert files == [{"type": "image", "url": "a.png"}]
+
+        message = self.chats.get_message_by_id_and_message_id(chat.id, "2")
+        assert message == self._get_message_rows(chat.id)["2"]
+        assert message["files"] == files
+        assert self.chats.get_message_by_id_and_message_id(chat.id, "9") == {}
+        assert self.chats.get_message_by_id_and_message_id("missing", "2") is None
+        assert (
+            self.chats.upsert_message_to_chat_by_id_and_message_id(
+                "missing", "2", {"content": "x"}
+            )
+            is None
+        )
+
+    def test_delete_chat_removes_message_rows(self):
+        chat = self._insert_chat_with_messages()
+        assert self.chats.delete_chat_by_id(chat.id)
+        assert self._get_message_rows(chat.id) == {}
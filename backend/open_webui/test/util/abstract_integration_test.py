@@ -157,5 +157,6 @@ class AbstractPostgresTest(AbstractIntegrationTest):
             '"user"',
         ]
         for table in tables:
-            Session.execute(text(f"TRUNCATE TABLE {table}"))
+            # CASCADE also clears the tables referencing these (e.g. chat_message)
+            Session.execute(text(f"TRUNCATE TABLE {table} CASCADE"))
         Session.commit()
@@ -30,6 +30,7 @@ from open_webui.models.chats import Chats
 from open_webui.models.folders import Folders
 from open_webui.models.users import Users
 from open_webui.socket.main import (
+    CHAT_MESSAGE_BUFFER,
     get_event_call,
     get_event_emitter,
 )
@@ -1586,6 +1587,7 @@ async def process_chat_response(
         messages = []
 
         if "chat_id" in metadata and not metadata["chat_id"].startswith("local:"):
+            await CHAT_MESSAGE_BUFFER.flush(metadata["chat_id"], metadata["message_id"])
             messages_map = Chats.get_messages_map_by_chat_id(metadata["chat_id"])
             message = messages_map.get(metadata["message_id"]) if messages_map else None
 
@@ -1818,6 +1820,8 @@ async def process_chat_response(
     # Non-streaming response
     if not isinstance(response, StreamingResponse):
         if event_emitter:
+            # Write the updates buffered while processing the request first
+            await CHAT_MESSAGE_BUFFER.flush(metadata["chat_id"], metadata["message_id"])
             try:
                 if isinstance(response, dict) or isinstance(response, JSONResponse):
                     if isinstance(response, list) and len(response) == 1:
@@ -2375,7 +2379,7 @@ async def process_chat_response(
 
                 return content, content_blocks, end_flag
 
-            message = Chats.get_message_by_id_and_message_id(
+            message = await CHAT_MESSAGE_BUFFER.get_message(
                 metadata["chat_id"], metadata["message_id"]
             )
 
@@ -2431,7 +2435,7 @@ async def process_chat_response(
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_MESSAGE_BUFFER.update(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2507,7 +2511,7 @@ async def process_chat_response(
 
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    await CHAT_MESSAGE_BUFFER.update(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -2614,13 +2618,16 @@ async def process_chat_response(
                                         delta.get("images", []), request, metadata, user
                                     )
                                     if image_urls:
-                                        message_files = Chats.add_message_files_by_id_and_message_id(
-                                            metadata["chat_id"],
-                                            metadata["message_id"],
-                                            [
-                                                {"type": "image", "url": url}
-                                                for url in image_urls
-                                            ],
+                                        message_files = (
+                                            await CHAT_MESSAGE_BUFFER.append(
+                                                metadata["chat_id"],
+                                                metadata["message_id"],
+                                                "files",
+                                                [
+                                                    {"type": "image", "url": url}
+                                                    for url in image_urls
+                                                ],
+                                            )
                                         )
 
                                         await event_emitter(
@@ -2740,7 +2747,7 @@ async def process_chat_response(
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            await CHAT_MESSAGE_BUFFER.update(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -3196,13 +3203,16 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_MESSAGE_BUFFER.update(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await CHAT_MESSAGE_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
 
                 # Send a webhook notification if the user is not active
                 if not Users.is_user_active(user.id):
@@ -3234,13 +3244,16 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await CHAT_MESSAGE_BUFFER.update(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
                             "content": serialize_content_blocks(content_blocks),
                         },
                     )
+                await CHAT_MESSAGE_BUFFER.flush(
+                    metadata["chat_id"], metadata["message_id"]
+                )
 
             if response.background is not None:
                 await response.background()
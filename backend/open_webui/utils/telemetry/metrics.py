@@ -8,6 +8,8 @@ Metrics collected:
 
 * http.server.requests (counter)
 * http.server.duration (histogram, milliseconds)
+* webui.rag.query_embedding_cache.hits / .misses (counters)
+* webui.rag.pdf_extraction.files / .pages / .duration (counters)
 
 Attributes used: http.method, http.route, http.status_code
 
@@ -46,6 +48,8 @@ from open_webui.env import (
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
 )
 from open_webui.models.users import Users
+from open_webui.retrieval.embedding_cache import QUERY_EMBEDDING_CACHE
+from open_webui.retrieval.loaders.pdf import PDF_EXTRACTION_STATS
 
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
@@ -101,6 +105,12 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active.today",
         ),
+        View(
+            instrument_name="webui.rag.query_embedding_cache.hits",
+        ),
+        View(
+            instrument_name="webui.rag.query_embedding_cache.misses",
+        ),
     ]
 
     provider = MeterProvider(
@@ -173,6 +183,59 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_users_active_today],
     )
 
+    def observe_query_embedding_cache_hits(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=QUERY_EMBEDDING_CACHE.hits)]
+
+    def observe_query_embedding_cache_misses(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=QUERY_EMBEDDING_CACHE.misses)]
+
+    meter.create_observable_counter(
+        name="webui.rag.query_embedding_cache.hits",
+        description="Query embeddings served from the in-memory cache",
+        unit="1",
+        callbacks=[observe_query_embedding_cache_hits],
+    )
+
+    meter.create_observable_counter(
+        name="webui.rag.query_embedding_cache.misses",
+        description="Query embeddings sent to the embedding backend",
+        unit="1",
+        callbacks=[observe_query_embedding_cache_misses],
+    )
+
+    def observe_pdf_extraction(key: str):
+        def callback(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=PDF_EXTRACTION_STATS[key])]
+
+        return callback
+
+    meter.create_observable_counter(
+        name="webui.rag.pdf_extraction.files",
+        description="PDF files extracted by the parallel PDF loader",
+        unit="1",
+        callbacks=[observe_pdf_extraction("files")],
+    )
+
+    meter.create_observable_counter(
+        name="webui.rag.pdf_extraction.pages",
+        description="PDF pages extracted by the parallel PDF loader",
+        unit="1",
+        callbacks=[observe_pdf_extraction("pages")],
+    )
+
+    meter.create_observable_counter(
+        name="webui.rag.pdf_extraction.duration",
+        description="Time spent extracting PDF files in parallel",
+        unit="s",
+        callbacks=[observe_pdf_extraction("seconds")],
+    )
+
     # FastAPI middleware
     @app.middleware("http")
     async def _metrics_middleware(request: Request, call_next):
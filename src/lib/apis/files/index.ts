@@ -1,5 +1,7 @@
+import { get } from 'svelte/store';
+
 import { WEBUI_API_BASE_URL } from '$lib/constants';
-import { splitStream } from '$lib/utils';
+import { socket } from '$lib/stores';
 
 export const uploadFile = async (token: string, file: File, metadata?: object | null) => {
 	const data = new FormData();
@@ -32,74 +34,79 @@ export const uploadFile = async (token: string, file: File, metadata?: object |
 		throw error;
 	}
 
-	if (res) {
-		const status = await getFileProcessStatus(token, res.id);
-
-		if (status && status.ok) {
-			const reader = status.body
-				.pipeThrough(new TextDecoderStream())
-				.pipeThrough(splitStream('\n'))
-				.getReader();
-
-			while (true) {
-				const { value, done } = await reader.read();
-				if (done) {
-					break;
-				}
-
-				try {
-					let lines = value.split('\n');
-
-					for (const line of lines) {
-						if (line !== '') {
-							console.log(line);
-							if (line === 'data: [DONE]') {
-								console.log(line);
-							} else {
-								let data = JSON.parse(line.replace(/^data: /, ''));
-								console.log(data);
-
-								if (data?.error) {
-									console.error(data.error);
-									res.error = data.error;
-								}
-
-								if (res?.data) {
-									res.data = data;
-								}
-							}
-						}
-					}
-				} catch (error) {
-					console.log(error);
-				}
-			}
+	if (res?.data?.status === 'pending') {
+		const data = await waitForFileProcessing(token, res.id);
+
+		if (data?.error) {
+			console.error(data.error);
+			res.error = data.error;
 		}
-	}
 
-	if (error) {
-		throw error;
+		res.data = { ...res.data, ...data };
 	}
 
 	return res;
 };
 
-export const getFileProcessStatus = async (token: string, id: string) => {
-	const queryParams = new URLSearchParams();
-	queryParams.append('stream', 'true');
+// Resolves with the file's final status, pushed by the server over the
+// socket as "events:file" while the file is processed
+const waitForFileProcessing = (token: string, id: string) =>
+	new Promise<{ status: string; error?: string }>((resolve) => {
+		const _socket = get(socket);
+		let finished = false;
+
+		const finish = (data) => {
+			if (finished || !['completed', 'failed'].includes(data?.status)) {
+				return;
+			}
+
+			finished = true;
+			_socket?.off('events:file', fileEventHandler);
+			_socket?.off('connect', checkStatus);
+			resolve(data);
+		};
+
+		const fileEventHandler = (event) => {
+			if (event?.file_id === id) {
+				finish(event.data);
+			}
+		};
+
+		// Events sent before the listener was set up, or while the socket was
+		// disconnected, are missed; the stored status covers them
+		const checkStatus = () => {
+			getFileProcessStatus(token, id)
+				.then(finish)
+				.catch((error) => {
+					console.error(error);
+					finish({ status: 'failed', error: `${error}` });
+				});
+		};
+
+		_socket?.on('events:file', fileEventHandler);
+		_socket?.on('connect', checkStatus);
+		checkStatus();
+	});
 
+export const getFileProcessStatus = async (token: string, id: string) => {
 	let error = null;
-	const res = await fetch(`${WEBUI_API_BASE_URL}/files/${id}/process/status?${queryParams}`, {
+
+	const res = await fetch(`${WEBUI_API_BASE_URL}/files/${id}/process/status`, {
 		method: 'GET',
 		headers: {
 			Accept: 'application/json',
 			authorization: `Bearer ${token}`
 		}
-	}).catch((err) => {
-		error = err.detail;
-		console.error(err);
-		return null;
-	});
+	})
+		.then(async (res) => {
+			if (!res.ok) throw await res.json();
+			return res.json();
+		})
+		.catch((err) => {
+			error = err.detail;
+			console.error(err);
+			return null;
+		});
 
 	if (error) {
 		throw error;